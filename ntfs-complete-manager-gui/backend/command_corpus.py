@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Command Corpus Module
+Records external tool outputs with their timings and replays them through the command runner
+"""
+
+import errno
+import json
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from command_runner import (CORPUS_RECORD, CORPUS_REPLAY, TIMEOUT_RETURNCODE,
+                            get_command_runner, tool_name)
+
+CORPUS_VERSION = 1
+
+
+class CorpusMiss(FileNotFoundError):
+    """
+    Raised when a replayed command is not in the corpus
+
+    It is a FileNotFoundError so call sites treat it like a missing tool,
+    the same way they would on a machine without it.
+    """
+
+
+@dataclass
+class RecordedCommand:
+    """One recorded run of a command"""
+    args: List[str]
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float  # seconds the command took when recorded
+    timed_out: bool = False
+    input: Optional[str] = None
+
+    @property
+    def tool(self) -> str:
+        return tool_name(self.args)
+
+
+class CommandCorpus:
+    """
+    Recorded command outputs, keyed by command line
+
+    A command recorded several times is replayed in recording order; once
+    the recordings run out the last one is repeated.
+    """
+
+    def __init__(self, entries: Optional[List[RecordedCommand]] = None):
+        self.entries = []
+        self.misses = []  # commands replay could not answer, in call order
+        self._by_key = {}  # {(args, input): [RecordedCommand]}
+        self._cursors = {}  # {(args, input): next index}
+        self._lock = threading.Lock()
+        for entry in entries or []:
+            self.add(entry)
+
+    @staticmethod
+    def _key(args: Sequence[str], input: Optional[str]) -> Tuple:
+        return (tuple(args), input)
+
+    def add(self, entry: RecordedCommand):
+        with self._lock:
+            self.entries.append(entry)
+            self._by_key.setdefault(self._key(entry.args, entry.input), []).append(entry)
+
+    def record(self, args: Sequence[str], input: Optional[str], result: subprocess.CompletedProcess,
+               duration: float, timed_out: bool):
+        """Add a command the runner has just run"""
+        self.add(RecordedCommand(list(args), result.returncode, result.stdout or "",
+                                 result.stderr or "", duration, timed_out, input))
+
+    def lookup(self, args: Sequence[str], input: Optional[str] = None) -> Optional[RecordedCommand]:
+        """Next recording of a command, None if it was never recorded"""
+        key = self._key(args, input)
+        with self._lock:
+            recordings = self._by_key.get(key)
+            if not recordings:
+                self.misses.append(list(args))
+                return None
+            index = self._cursors.get(key, 0)
+            self._cursors[key] = index + 1
+            return recordings[min(index, len(recordings) - 1)]
+
+    def rewind(self):
+        """Replay every command from its first recording again"""
+        with self._lock:
+            self._cursors.clear()
+            self.misses = []
+
+    def replay(self, args: Sequence[str], input: Optional[str], timeout: Optional[float],
+               speed: float = 1.0) -> Tuple[subprocess.CompletedProcess, bool]:
+        """
+        Answer a command from the corpus, taking as long as it took when recorded
+
+        Args:
+            args: Command and arguments
+            input: Text the command was given on stdin
+            timeout: The caller's timeout; a recording slower than it times out
+            speed: Multiplier for recorded durations (0 answers immediately)
+
+        Returns:
+            Tuple of (CompletedProcess, timed out)
+
+        Raises:
+            CorpusMiss: If the command was never recorded
+        """
+        entry = self.lookup(args, input)
+        if entry is None:
+            raise CorpusMiss(errno.ENOENT, "Command not in corpus", args[0] if args else "")
+
+        if timeout is not None and entry.duration > timeout:
+            time.sleep(timeout * speed)
+            return subprocess.CompletedProcess(list(args), TIMEOUT_RETURNCODE, "",
+                                               f"{args[0]} timed out after {timeout:g}s"), True
+        if speed > 0:
+            time.sleep(entry.duration * speed)
+        returncode = TIMEOUT_RETURNCODE if entry.timed_out else entry.returncode
+        return subprocess.CompletedProcess(list(args), returncode, entry.stdout, entry.stderr), entry.timed_out
+
+    def for_tool(self, tool: str) -> List[RecordedCommand]:
+        """Recordings of one tool ('smartctl'), in recording order"""
+        with self._lock:
+            return [entry for entry in self.entries if entry.tool == tool]
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {"version": CORPUS_VERSION, "commands": [asdict(entry) for entry in self.entries]}
+
+    def save(self, path: str) -> bool:
+        """
+        Write the corpus as JSON
+
+        Returns:
+            bool: True if the file was written
+        """
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.to_dict(), f, indent=1)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            print(f"[CORPUS] Could not write {path}: {e}")
+            return False
+
+    @classmethod
+    def load(cls, path: str) -> "CommandCorpus":
+        """
+        Read a corpus written by save()
+
+        Raises:
+            OSError: If the file can't be read
+            ValueError: If it is not a corpus this version understands
+        """
+        with open(path) as f:
+            data = json.load(f)
+        version = data.get("version") if isinstance(data, dict) else None
+        if version != CORPUS_VERSION:
+            raise ValueError(f"{path}: unsupported corpus version {version}")
+        return cls([RecordedCommand(**entry) for entry in data.get("commands", [])])
+
+
+def start_recording(corpus: Optional[CommandCorpus] = None) -> CommandCorpus:
+    """Record every command the process-wide runner runs from now on"""
+    corpus = corpus if corpus is not None else CommandCorpus()
+    get_command_runner().use_corpus(corpus, CORPUS_RECORD)
+    return corpus
+
+
+def start_replay(corpus: CommandCorpus, speed: float = 1.0) -> CommandCorpus:
+    """Answer the process-wide runner's commands from a corpus instead of running them"""
+    get_command_runner().use_corpus(corpus, CORPUS_REPLAY, speed)
+    return corpus
+
+
+def stop_corpus() -> Optional[CommandCorpus]:
+    """Go back to running commands normally; returns the corpus that was in use"""
+    return get_command_runner().use_corpus(None)
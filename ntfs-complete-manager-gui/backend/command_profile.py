@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Command Profile Module
+Per-tool and per-device breakdown of external commands for --profile
+"""
+
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List
+
+from command_runner import CommandTiming, get_command_runner
+
+
+@dataclass
+class ProfileRow:
+    """Aggregated timings of one tool or device"""
+    count: int = 0
+    total: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    max: float = 0.0
+    failures: int = 0
+    timeouts: int = 0
+    output_bytes: int = 0
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 for an empty one)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(len(sorted_values) * fraction))
+    return sorted_values[rank - 1]
+
+
+def aggregate(timings: Iterable[CommandTiming], key: str) -> Dict[str, ProfileRow]:
+    """
+    Group timings by 'tool' or 'device' and summarize each group
+
+    Returns:
+        dict: {tool or device: ProfileRow}, slowest total first
+    """
+    groups = {}
+    for timing in timings:
+        groups.setdefault(getattr(timing, key) or "-", []).append(timing)
+
+    rows = {}
+    for name, group in groups.items():
+        durations = sorted(timing.duration for timing in group)
+        rows[name] = ProfileRow(
+            count=len(group),
+            total=sum(durations),
+            p50=percentile(durations, 0.50),
+            p95=percentile(durations, 0.95),
+            max=durations[-1],
+            failures=sum(timing.returncode != 0 for timing in group),
+            timeouts=sum(timing.timed_out for timing in group),
+            output_bytes=sum(timing.output_bytes for timing in group),
+        )
+    return dict(sorted(rows.items(), key=lambda item: item[1].total, reverse=True))
+
+
+class CommandProfile:
+    """Timings of the external commands run while profiling"""
+
+    def __init__(self, timings: List[CommandTiming]):
+        self.timings = sorted(timings, key=lambda timing: timing.started)
+
+    def by_tool(self) -> Dict[str, ProfileRow]:
+        return aggregate(self.timings, "tool")
+
+    def by_device(self) -> Dict[str, ProfileRow]:
+        return aggregate(self.timings, "device")
+
+    def report(self) -> str:
+        """Human-readable tables per tool and per device"""
+        lines = ["=== Command profile ==="]
+        if self.timings:
+            wall = max(timing.started + timing.duration for timing in self.timings) - self.timings[0].started
+            lines.append(f"{len(self.timings)} commands over {wall * 1000:.1f} ms")
+        else:
+            lines.append("No commands were run")
+        for title, rows in (("Tool", self.by_tool()), ("Device", self.by_device())):
+            if not rows:
+                continue
+            lines.append(f"{title:<14}{'count':>7}{'total ms':>11}{'p50 ms':>9}{'p95 ms':>9}"
+                         f"{'max ms':>9}{'failed':>8}{'bytes':>10}")
+            for name, row in rows.items():
+                lines.append(f"{name:<14}{row.count:>7}{row.total * 1000:>11.1f}{row.p50 * 1000:>9.1f}"
+                             f"{row.p95 * 1000:>9.1f}{row.max * 1000:>9.1f}{row.failures:>8}"
+                             f"{row.output_bytes:>10}")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Timeline in Chrome trace event format (chrome://tracing, Perfetto)"""
+        origin = self.timings[0].started if self.timings else 0.0
+        events = []
+        for timing in self.timings:
+            events.append({
+                "name": timing.tool,
+                "cat": timing.source,
+                "ph": "X",
+                "ts": round((timing.started - origin) * 1e6, 1),
+                "dur": round(timing.duration * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": timing.thread,
+                "args": {
+                    "device": timing.device,
+                    "returncode": timing.returncode,
+                    "output_bytes": timing.output_bytes,
+                    "timed_out": timing.timed_out,
+                },
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> bool:
+        """
+        Write the Chrome trace JSON to a file
+
+        Returns:
+            bool: True if the file was written
+        """
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.chrome_trace(), f)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            print(f"[PROFILE] Could not write {path}: {e}")
+            return False
+
+
+def start_profiling():
+    """Start keeping every command the process-wide runner runs"""
+    get_command_runner().start_profile()
+
+
+def stop_profiling() -> CommandProfile:
+    """Stop profiling and return what was recorded since start_profiling()"""
+    return CommandProfile(get_command_runner().stop_profile())
+
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Command Runner Module
+One execution layer for external tools: timeouts, concurrency caps,
+in-flight deduplication, short-lived result caching and per-call timing
+"""
+
+import os
+import re
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from dataclasses import dataclass, asdict
+
+# Timeout for tools without an entry in TOOL_TIMEOUTS, in seconds
+DEFAULT_TIMEOUT = 30.0
+
+# Per-tool default timeouts; smartctl and ntfs-3g tools can stall on slow USB bridges
+TOOL_TIMEOUTS = {
+    "lsblk": 10.0,
+    "udevadm": 5.0,
+    "findmnt": 5.0,
+    "blkid": 5.0,
+    "stat": 5.0,
+    "getfacl": 5.0,
+    "df": 10.0,
+    "uname": 5.0,
+    "modinfo": 5.0,
+    "e2label": 5.0,
+    "ntfslabel": 10.0,
+    "ntfsinfo": 15.0,
+    "ntfsfix": 30.0,
+    "smartctl": 15.0,
+    "lsof": 5.0,
+    "fuser": 5.0,
+}
+
+# Commands running at once, across the process and against one disk
+MAX_CONCURRENT = 8
+MAX_PER_DEVICE = 2
+
+# Timings kept for get_timings()
+TIMING_HISTORY = 512
+
+# Wrappers whose first argument is the tool that actually runs
+_WRAPPERS = ("sudo", "pkexec", "env", "nice", "ionice")
+
+# Partition suffixes: sdb1 -> sdb, nvme0n1p2 -> nvme0n1, mmcblk0p1 -> mmcblk0
+_PARTITION_RE = re.compile(r"^(nvme\d+n\d+|mmcblk\d+|loop\d+)p\d+$|^((?:s|h|v|xv)d[a-z]+)\d+$")
+
+# Reported for a command killed at its timeout, like a process killed by SIGKILL
+TIMEOUT_RETURNCODE = -9
+
+# What use_corpus() does with a command corpus (see command_corpus.py)
+CORPUS_RECORD = "record"
+CORPUS_REPLAY = "replay"
+
+
+@dataclass
+class CommandTiming:
+    """One call to CommandRunner.run"""
+    tool: str
+    device: str
+    started: float  # time.monotonic() when the call was made
+    duration: float  # seconds until the caller got its result
+    returncode: int
+    source: str = "run"  # 'run', 'shared' (joined an identical call), 'cached' or 'probe'
+    timed_out: bool = False
+    output_bytes: int = 0  # stdout plus stderr
+    thread: int = 0  # threading.get_ident() of the caller
+
+
+@dataclass
+class ToolStats:
+    """Aggregated timings of one tool"""
+    calls: int = 0
+    runs: int = 0
+    shared: int = 0
+    cached: int = 0
+    probes: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+
+def tool_name(args: Sequence[str]) -> str:
+    """Name of the tool a command runs ('sudo ntfsinfo -m /dev/sdb1' -> 'ntfsinfo')"""
+    index = 0
+    while index < len(args) - 1 and os.path.basename(args[index]) in _WRAPPERS:
+        index += 1
+    return os.path.basename(args[index]) if args else ""
+
+
+def disk_of(device_path: str) -> str:
+    """Whole-disk name for a device path ('/dev/sdb1' -> 'sdb'), '' if not a /dev path"""
+    if not device_path.startswith("/dev/"):
+        return ""
+    name = device_path[len("/dev/"):]
+    match = _PARTITION_RE.match(name)
+    if match:
+        return match.group(1) or match.group(2)
+    return name
+
+
+def command_device(args: Sequence[str]) -> str:
+    """Disk a command works on, from its first /dev argument"""
+    for arg in args:
+        if isinstance(arg, str) and arg.startswith("/dev/"):
+            return disk_of(arg)
+    return ""
+
+
+class _Flight:
+    """An in-flight command that identical callers wait for"""
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class CommandRunner:
+    """
+    Runs external commands with the same limits everywhere
+
+    run() behaves like subprocess.run(capture_output=True, text=True), so
+    call sites keep their error handling, with these additions:
+
+    - Every call gets a timeout: the tool's entry in TOOL_TIMEOUTS unless
+      the caller passes one (None for long operations such as mkfs). A
+      command killed at its timeout is reported with returncode -9, and
+      with check=True as CalledProcessError, so existing failure paths
+      cover it.
+    - At most max_concurrent commands run at once, and at most max_per_device
+      against one disk (partitions count towards their disk).
+    - Identical commands already running are joined instead of started
+      again (share=False opts out, e.g. for operations that change a disk).
+    - cache_ttl > 0 reuses a successful result for that many seconds.
+    - Each call is timed; see get_stats() and get_timings().
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT, max_per_device: int = MAX_PER_DEVICE,
+                 timeouts: Optional[Dict[str, float]] = None):
+        self.max_per_device = max_per_device
+        self.timeouts = dict(TOOL_TIMEOUTS if timeouts is None else timeouts)
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._device_slots = {}  # {disk: BoundedSemaphore}
+        self._flights = {}  # {command key: _Flight}
+        self._cache = {}  # {command key: (expires, CompletedProcess)}
+        self._stats = {}  # {tool: ToolStats}
+        self._timings = deque(maxlen=TIMING_HISTORY)
+        self._profile = None  # every timing while profiling, see start_profile()
+        self._corpus = None  # (corpus, mode, replay speed) while recording or replaying
+        self._lock = threading.Lock()
+
+    def timeout_for(self, tool: str) -> float:
+        return self.timeouts.get(tool, DEFAULT_TIMEOUT)
+
+    def run(self, args: Sequence[str], timeout: Any = "default", check: bool = False,
+            input: Optional[str] = None, device: Optional[str] = None,
+            share: bool = True, cache_ttl: float = 0.0) -> subprocess.CompletedProcess:
+        """
+        Run a command and capture its output as text
+
+        Args:
+            args: Command and arguments
+            timeout: Seconds, None for no limit, or 'default' for the tool's default
+            check: Raise CalledProcessError for a non-zero exit, like subprocess.run
+            input: Text for the command's stdin
+            device: Disk for the per-device cap; defaults to the first /dev argument
+            share: Join an identical command that is already running
+            cache_ttl: Seconds a successful result may be reused (0 disables)
+
+        Returns:
+            subprocess.CompletedProcess
+
+        Raises:
+            FileNotFoundError/OSError: If the command can't be started
+            subprocess.CalledProcessError: If check is set and the command failed
+        """
+        args = list(args)
+        tool = tool_name(args)
+        if timeout == "default":
+            timeout = self.timeout_for(tool)
+        if device is None:
+            device = command_device(args)
+        key = (tuple(args), input)
+        start = time.monotonic()
+
+        if cache_ttl > 0:
+            with self._lock:
+                cached = self._cache.get(key)
+            if cached is not None and cached[0] > start:
+                result = cached[1]
+                self._record(tool, device, start, result, "cached", False)
+                return self._checked(result, check)
+
+        flight = None
+        if share:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight()
+            if not leader:
+                flight.done.wait()
+                if flight.error is not None:
+                    raise flight.error
+                self._record(tool, device, start, flight.result, "shared", False)
+                return self._checked(flight.result, check)
+
+        timed_out = False
+        try:
+            result, timed_out = self._execute(args, timeout, input, device)
+        except BaseException as e:
+            if flight is not None:
+                self._land(key, flight, None, e)
+            raise
+
+        if cache_ttl > 0 and result.returncode == 0:
+            with self._lock:
+                self._cache[key] = (time.monotonic() + cache_ttl, result)
+        if flight is not None:
+            self._land(key, flight, result, None)
+        self._record(tool, device, start, result, "run", timed_out)
+        return self._checked(result, check)
+
+    def _land(self, key, flight: _Flight, result, error):
+        with self._lock:
+            self._flights.pop(key, None)
+        flight.result = result
+        flight.error = error
+        flight.done.set()
+
+    def _device_slot(self, device: str) -> Optional[threading.BoundedSemaphore]:
+        if not device:
+            return None
+        with self._lock:
+            slot = self._device_slots.get(device)
+            if slot is None:
+                slot = self._device_slots[device] = threading.BoundedSemaphore(self.max_per_device)
+            return slot
+
+    def _execute(self, args: List[str], timeout: Optional[float], input: Optional[str],
+                 device: str) -> Tuple[subprocess.CompletedProcess, bool]:
+        device_slot = self._device_slot(device)
+        if device_slot is not None:
+            device_slot.acquire()
+        try:
+            with self._slots:
+                corpus = self._corpus
+                if corpus is not None and corpus[1] == CORPUS_REPLAY:
+                    return corpus[0].replay(args, input, timeout, corpus[2])
+                start = time.monotonic()
+                result, timed_out = self._spawn(args, timeout, input)
+                if corpus is not None:
+                    corpus[0].record(args, input, result, time.monotonic() - start, timed_out)
+                return result, timed_out
+        finally:
+            if device_slot is not None:
+                device_slot.release()
+
+    @staticmethod
+    def _spawn(args: List[str], timeout: Optional[float],
+               input: Optional[str]) -> Tuple[subprocess.CompletedProcess, bool]:
+        try:
+            return subprocess.run(args, capture_output=True, text=True, input=input,
+                                  timeout=timeout), False
+        except subprocess.TimeoutExpired as e:
+            # subprocess.run has already killed and reaped the process
+            return subprocess.CompletedProcess(
+                args, TIMEOUT_RETURNCODE, _text(e.stdout),
+                _text(e.stderr) or f"{args[0]} timed out after {timeout:g}s"), True
+
+    @staticmethod
+    def _checked(result: subprocess.CompletedProcess, check: bool) -> subprocess.CompletedProcess:
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, result.args,
+                                                result.stdout, result.stderr)
+        return result
+
+    def _record(self, tool: str, device: str, start: float, result: subprocess.CompletedProcess,
+                source: str, timed_out: bool):
+        self._add_timing(tool, device, start, result.returncode,
+                         _output_bytes(result.stdout) + _output_bytes(result.stderr), source, timed_out)
+
+    def record(self, args: Sequence[str], start: float, returncode: int, output_bytes: int = 0,
+               timed_out: bool = False, stdout: str = "", stderr: str = ""):
+        """
+        Record a command that was run without run(), such as an asyncio probe
+
+        Calls that are not commands at all, such as UDisks2 D-Bus methods,
+        are recorded the same way under a pseudo-tool name.
+
+        Args:
+            args: Command and arguments
+            start: time.monotonic() when the command was started
+            returncode: Exit code, TIMEOUT_RETURNCODE if it was killed at its timeout
+            output_bytes: Bytes read from stdout and stderr
+            timed_out: Whether the command was killed at its timeout
+            stdout: Output to keep when a corpus is recording
+            stderr: Error output to keep when a corpus is recording
+        """
+        output_bytes = output_bytes or _output_bytes(stdout) + _output_bytes(stderr)
+        corpus = self._corpus
+        if corpus is not None and corpus[1] == CORPUS_RECORD:
+            result = subprocess.CompletedProcess(list(args), returncode, stdout, stderr)
+            corpus[0].record(args, None, result, time.monotonic() - start, timed_out)
+        self._add_timing(tool_name(args), command_device(args), start, returncode,
+                         output_bytes, "probe", timed_out)
+
+    def _add_timing(self, tool: str, device: str, start: float, returncode: int,
+                    output_bytes: int, source: str, timed_out: bool):
+        duration = time.monotonic() - start
+        timing = CommandTiming(tool, device, start, duration, returncode, source, timed_out,
+                               output_bytes, threading.get_ident())
+        with self._lock:
+            stats = self._stats.setdefault(tool, ToolStats())
+            stats.calls += 1
+            if source == "run":
+                stats.runs += 1
+            elif source == "shared":
+                stats.shared += 1
+            elif source == "cached":
+                stats.cached += 1
+            else:
+                stats.probes += 1
+            stats.failures += returncode != 0
+            stats.timeouts += timed_out
+            stats.total_time += duration
+            stats.max_time = max(stats.max_time, duration)
+            self._timings.append(timing)
+            if self._profile is not None:
+                self._profile.append(timing)
+
+    def invalidate(self, device: Optional[str] = None):
+        """Drop cached results, for one disk ('sdb') or all of them"""
+        with self._lock:
+            if device is None:
+                self._cache.clear()
+            else:
+                for key in [key for key in self._cache if command_device(key[0]) == device]:
+                    del self._cache[key]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tool counters and times, for logging"""
+        with self._lock:
+            return {tool: asdict(stats) for tool, stats in self._stats.items()}
+
+    def get_timings(self) -> List[CommandTiming]:
+        """Most recent calls, oldest first"""
+        with self._lock:
+            return list(self._timings)
+
+    def start_profile(self):
+        """Keep every timing from now on, not just the last TIMING_HISTORY"""
+        with self._lock:
+            if self._profile is None:
+                self._profile = []
+
+    def stop_profile(self) -> List[CommandTiming]:
+        """Stop keeping every timing and return those kept since start_profile()"""
+        with self._lock:
+            timings, self._profile = self._profile or [], None
+            return timings
+
+    @property
+    def profiling(self) -> bool:
+        return self._profile is not None
+
+    def use_corpus(self, corpus, mode: str = CORPUS_RECORD, speed: float = 1.0):
+        """
+        Record commands into a corpus, or answer them from one instead of running them
+
+        Args:
+            corpus: command_corpus.CommandCorpus, or None to run commands normally again
+            mode: CORPUS_RECORD or CORPUS_REPLAY
+            speed: Replay only: multiplier for recorded durations (0 answers immediately)
+
+        Returns:
+            The corpus that was in use before, or None
+        """
+        if mode not in (CORPUS_RECORD, CORPUS_REPLAY):
+            raise ValueError(f"unknown corpus mode: {mode}")
+        previous = self._corpus[0] if self._corpus is not None else None
+        self._corpus = (corpus, mode, speed) if corpus is not None else None
+        # Results cached from real runs must not leak into a replay, or the other way round
+        self.invalidate()
+        return previous
+
+    @property
+    def corpus_mode(self) -> Optional[str]:
+        """CORPUS_RECORD or CORPUS_REPLAY while a corpus is in use, else None"""
+        corpus = self._corpus
+        return corpus[1] if corpus is not None else None
+
+
+def _output_bytes(output) -> int:
+    if not output:
+        return 0
+    if isinstance(output, bytes):
+        return len(output)
+    return len(output.encode("utf-8", errors="replace"))
+
+
+def _text(output) -> str:
+    if output is None:
+        return ""
+    if isinstance(output, bytes):
+        return output.decode("utf-8", errors="replace")
+    return output
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_command_runner() -> CommandRunner:
+    """Get the process-wide command runner"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = CommandRunner()
+        return _runner
+
+
+def run_command(args: Sequence[str], **kwargs) -> subprocess.CompletedProcess:
+    """CommandRunner.run on the process-wide runner"""
+    return get_command_runner().run(args, **kwargs)
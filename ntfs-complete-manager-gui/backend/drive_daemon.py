@@ -0,0 +1,642 @@
+#!/usr/bin/env python3
+"""
+Drive Daemon Module
+Long-running owner of drive enumeration, monitoring and caches, shared by the
+GUI, the Nautilus extension and the command line over a Unix socket
+"""
+
+import json
+import os
+import queue
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import asdict, fields
+from pathlib import Path
+from types import MappingProxyType
+
+from drive_manager import DriveManager, DriveInfo, DriveStateSnapshot, EventBus, POLICY_MERGE, format_size
+
+PROTOCOL_VERSION = 3
+CALL_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 1.0
+SUBSCRIBER_QUEUE_SIZE = 256
+HEARTBEAT_INTERVAL = 15.0
+RECONNECT_DELAY = 2.0
+
+# Set to any value to make frontends use a local DriveManager instead
+NO_DAEMON_ENV = "NTFS_MANAGER_NO_DAEMON"
+
+
+def default_socket_path() -> Path:
+    """Per-user socket, in $XDG_RUNTIME_DIR when the session has one"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "ntfs-manager" / "daemon.sock"
+    return Path.home() / ".cache/ntfs-manager/daemon.sock"
+
+
+def drive_to_dict(drive: DriveInfo) -> Dict[str, Any]:
+    return asdict(drive)
+
+
+def drive_from_dict(data: Dict[str, Any]) -> DriveInfo:
+    """Rebuild a DriveInfo, ignoring fields this version does not know"""
+    known_fields = {field.name for field in fields(DriveInfo)}
+    return DriveInfo(**{key: value for key, value in data.items() if key in known_fields})
+
+
+def state_message(item) -> Dict[str, Any]:
+    """Wire form of a DriveStateSnapshot or DriveDelta"""
+    if isinstance(item, DriveStateSnapshot):
+        return {"event": "snapshot", "seq": item.seq, "drives": list(item.drives.values())}
+    return {"event": "delta", "seq": item.seq, "name": item.name, "cause": item.event,
+            "changes": {key: [old, new] for key, (old, new) in item.changes.items()}}
+
+
+class DaemonError(Exception):
+    """The daemon is unreachable or reported an error"""
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """One client connection: JSON request lines in, JSON response lines out"""
+
+    def _send(self, message: Dict[str, Any]):
+        self.wfile.write((json.dumps(message) + "\n").encode())
+        self.wfile.flush()
+
+    def handle(self):
+        daemon = self.server.drive_daemon
+        try:
+            for line in self.rfile:
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    self._send({"id": None, "error": "invalid JSON request"})
+                    continue
+                if not isinstance(request, dict):
+                    self._send({"id": None, "error": "request must be an object"})
+                    continue
+
+                if request.get("method") == "subscribe":
+                    # The connection becomes a one-way event stream
+                    params = request.get("params") or {}
+                    daemon.serve_subscription(self._send, params.get("since"))
+                    return
+                self._send(daemon.dispatch(request))
+        except OSError:
+            pass  # client went away
+
+
+class _DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class DriveDaemon:
+    """
+    Serves one DriveManager to every frontend of the user session
+
+    Requests are single JSON lines ({"id", "method", "params"}) answered by
+    a single line ({"id", "result"} or {"id", "error"}). A "subscribe"
+    request turns the connection into a stream of the manager's versioned
+    drive table: a snapshot, or the deltas after the client's "since"
+    sequence number, then one line per field-level delta. A subscriber
+    that falls more than SUBSCRIBER_QUEUE_SIZE deltas behind gets a fresh
+    snapshot instead of the backlog.
+    """
+
+    METHODS = ("ping", "get_drives", "refresh_drives", "get_changes", "get_generation",
+               "get_drive_properties", "mount_drive", "unmount_drive",
+               "format_drive", "repair_drive")
+
+    def __init__(self, socket_path: Optional[Path] = None,
+                 drive_manager: Optional[DriveManager] = None):
+        """
+        Args:
+            socket_path: Unix socket to listen on (default_socket_path() if None)
+            drive_manager: Manager to serve; a new DriveManager if None
+        """
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.manager = drive_manager if drive_manager is not None else DriveManager()
+        self._enumerate_lock = threading.Lock()
+        self._enumerations = 0
+        self._subscribers = 0
+        self._subscribers_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._server = None
+
+    # Drive state
+
+    def _enumerate(self) -> List[DriveInfo]:
+        """
+        Re-enumerate drives, sharing the work between concurrent callers
+
+        A caller that had to wait for another enumeration reuses its result
+        instead of starting a new one.
+        """
+        started = self._enumerations
+        with self._enumerate_lock:
+            if self._enumerations != started:
+                return self._drive_list()
+            drives = self.manager.refresh_drives()
+            self._enumerations += 1
+            return drives
+
+    def _drive_list(self) -> List[DriveInfo]:
+        """The manager's drive table, enumerating first if that never happened"""
+        if not self._enumerations:
+            return self._enumerate()
+        return [drive_from_dict(data) for data in self.manager.state.snapshot().drives.values()]
+
+    def serve_subscription(self, send: Callable[[Dict[str, Any]], None],
+                           since: Optional[int] = None):
+        """Stream the drive table and its deltas until the client disconnects"""
+        self._drive_list()
+        subscriber = queue.Queue(SUBSCRIBER_QUEUE_SIZE)
+
+        def enqueue(item):
+            try:
+                subscriber.put_nowait(state_message(item))
+            except queue.Full:
+                # Too far behind: replace the backlog with the current state
+                while True:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        break
+                subscriber.put_nowait(state_message(self.manager.state.snapshot()))
+
+        token = self.manager.subscribe(enqueue, since)
+        with self._subscribers_lock:
+            self._subscribers += 1
+        try:
+            while not self._stopping.is_set():
+                try:
+                    message = subscriber.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    # Also how a vanished client is noticed
+                    message = {"event": "heartbeat"}
+                send(message)
+        except OSError:
+            pass
+        finally:
+            self.manager.unsubscribe(token)
+            with self._subscribers_lock:
+                self._subscribers -= 1
+
+    # Requests
+
+    def dispatch(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one request and build its response"""
+        response = {"id": request.get("id")}
+        method = request.get("method")
+        params = request.get("params") or {}
+
+        if method not in self.METHODS:
+            response["error"] = f"unknown method: {method}"
+            return response
+        if not isinstance(params, dict):
+            response["error"] = "params must be an object"
+            return response
+
+        try:
+            response["result"] = getattr(self, f"_rpc_{method}")(**params)
+        except TypeError as e:
+            response["error"] = f"bad parameters for {method}: {e}"
+        except Exception as e:
+            response["error"] = f"{method} failed: {e}"
+        return response
+
+    def _rpc_ping(self) -> Dict[str, Any]:
+        return {"version": PROTOCOL_VERSION, "pid": os.getpid(),
+                "subscribers": self._subscribers, "seq": self.manager.state.seq}
+
+    def _rpc_get_drives(self) -> List[Dict[str, Any]]:
+        return [drive_to_dict(drive) for drive in self._drive_list()]
+
+    def _rpc_refresh_drives(self) -> List[Dict[str, Any]]:
+        return [drive_to_dict(drive) for drive in self._enumerate()]
+
+    def _rpc_get_changes(self, since: Optional[int] = None) -> Dict[str, Any]:
+        """Deltas after since, or a snapshot if since is None or too old"""
+        self._drive_list()
+        deltas = self.manager.state.changes_since(since) if since is not None else None
+        if deltas is None:
+            return state_message(self.manager.state.snapshot())
+        return {"event": "changes", "seq": deltas[-1].seq if deltas else since,
+                "deltas": [state_message(delta) for delta in deltas]}
+
+    def _rpc_get_generation(self, drive_name: str) -> str:
+        return self.manager.get_generation(drive_name)
+
+    def _rpc_get_drive_properties(self, drive_name: str) -> Dict[str, Any]:
+        return self.manager.get_drive_properties(drive_name)
+
+    def _rpc_mount_drive(self, drive_name: str, mount_point: Optional[str] = None,
+                         options: str = "") -> bool:
+        return self.manager.mount_drive(drive_name, mount_point, options)
+
+    def _rpc_unmount_drive(self, drive_name: str) -> bool:
+        return self.manager.unmount_drive(drive_name)
+
+    def _rpc_format_drive(self, drive_name: str, fstype: str, label: str = "") -> bool:
+        success = self.manager.format_drive(drive_name, fstype, label)
+        self._enumerate()
+        return success
+
+    def _rpc_repair_drive(self, drive_name: str) -> bool:
+        success = self.manager.repair_drive(drive_name)
+        self._enumerate()
+        return success
+
+    # Server lifecycle
+
+    def _prepare_socket(self):
+        """
+        Create the socket directory and clear a socket left by a dead daemon
+
+        Only a directory created here is made private to the user; a
+        --socket in an existing directory such as /tmp leaves it alone.
+
+        Raises:
+            DaemonError: If the socket can't be set up or a daemon is already listening
+        """
+        directory = self.socket_path.parent
+        try:
+            if not directory.is_dir():
+                directory.parent.mkdir(parents=True, exist_ok=True)
+                directory.mkdir(mode=0o700)
+                os.chmod(directory, 0o700)  # mkdir's mode is subject to the umask
+            if not self.socket_path.exists():
+                return
+            if DriveDaemonClient(self.socket_path).is_running():
+                raise DaemonError(f"a drive daemon is already listening on {self.socket_path}")
+            self.socket_path.unlink()
+        except OSError as e:
+            raise DaemonError(f"cannot set up {self.socket_path}: {e}") from e
+
+    def serve_forever(self):
+        """Listen until shutdown() is called or the process is stopped"""
+        self._prepare_socket()
+        try:
+            self._server = _DaemonServer(str(self.socket_path), _RequestHandler)
+            os.chmod(self.socket_path, 0o600)
+        except OSError as e:
+            if self._server is not None:
+                self._server.server_close()
+            raise DaemonError(f"cannot listen on {self.socket_path}: {e}") from e
+        self._server.drive_daemon = self
+
+        self.manager.start_monitoring()
+        self._enumerate()
+        print(f"[DAEMON] Listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._stopping.set()
+            self.manager.stop_monitoring()
+            self._server.server_close()
+            try:
+                self.socket_path.unlink()
+            except OSError:
+                pass
+            print("[DAEMON] Stopped")
+
+    def shutdown(self):
+        """Stop serve_forever() from another thread"""
+        self._stopping.set()
+        if self._server is not None:
+            self._server.shutdown()
+
+
+class DriveDaemonClient:
+    """Low-level client: one connection per call, plus a streaming subscription"""
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = CALL_TIMEOUT):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.timeout = timeout
+        self._next_id = 0
+        self._id_lock = threading.Lock()
+
+    def _connect(self, timeout: Optional[float]) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(min(CONNECT_TIMEOUT, timeout) if timeout else CONNECT_TIMEOUT)
+            sock.connect(str(self.socket_path))
+            sock.settimeout(timeout)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _request_line(self, method: str, params: Dict[str, Any]) -> bytes:
+        with self._id_lock:
+            self._next_id += 1
+            request_id = self._next_id
+        return (json.dumps({"id": request_id, "method": method, "params": params}) + "\n").encode()
+
+    def call(self, method: str, timeout: Optional[float] = -1, **params) -> Any:
+        """
+        Run one request on the daemon
+
+        Args:
+            method: One of DriveDaemon.METHODS
+            timeout: Seconds to wait for the answer; None waits forever, -1 uses self.timeout
+            **params: Method parameters
+
+        Returns:
+            The method's result
+
+        Raises:
+            DaemonError: If the daemon is unreachable or the method failed
+        """
+        if timeout == -1:
+            timeout = self.timeout
+        try:
+            with self._connect(timeout) as sock:
+                sock.sendall(self._request_line(method, params))
+                with sock.makefile('r') as reader:
+                    line = reader.readline()
+        except OSError as e:
+            raise DaemonError(f"drive daemon unavailable: {e}") from e
+
+        if not line:
+            raise DaemonError("drive daemon closed the connection")
+        try:
+            response = json.loads(line)
+        except ValueError as e:
+            raise DaemonError(f"invalid response from drive daemon: {e}") from e
+        if response.get("error"):
+            raise DaemonError(response["error"])
+        return response.get("result")
+
+    def is_running(self) -> bool:
+        """Check if a compatible daemon answers on the socket"""
+        if not self.socket_path.exists():
+            return False
+        try:
+            info = self.call("ping", timeout=CONNECT_TIMEOUT)
+        except DaemonError:
+            return False
+        return isinstance(info, dict) and info.get("version") == PROTOCOL_VERSION
+
+    def subscribe(self, on_message: Callable[[Dict[str, Any]], None],
+                  on_connected: Optional[Callable[[socket.socket], None]] = None,
+                  since: Optional[int] = None):
+        """
+        Stream drive table messages to on_message until the connection ends
+
+        Args:
+            on_message: Called with a snapshot (or the deltas after since), then each delta
+            on_connected: Called with the socket, e.g. to keep it for closing
+            since: Last sequence number already seen, to catch up without a snapshot
+
+        Raises:
+            DaemonError: If the daemon is unreachable or the stream breaks
+        """
+        try:
+            with self._connect(None) as sock:
+                if on_connected:
+                    on_connected(sock)
+                sock.sendall(self._request_line("subscribe", {"since": since}))
+                with sock.makefile('r') as reader:
+                    for line in reader:
+                        on_message(json.loads(line))
+        except (OSError, ValueError) as e:
+            raise DaemonError(f"drive daemon subscription ended: {e}") from e
+
+
+class RemoteDriveManager:
+    """
+    DriveManager stand-in that delegates to the drive daemon
+
+    Keeps a local drives table, filled by get_all_drives() and kept current
+    by the daemon's delta stream once monitoring starts, and calls the
+    registered callbacks with the event behind each delta. After a lost
+    connection it resubscribes from the last sequence number it applied.
+    Like DriveManager.drives, the table is a read-only mapping that is
+    replaced, never modified, when a message arrives.
+    """
+
+    def __init__(self, client: DriveDaemonClient):
+        self.client = client
+        self.drives = MappingProxyType({})
+        self.seq = None  # last drive table version applied from the stream
+        self.monitoring = False
+        self.events = EventBus()
+        self._subscription = None
+
+    def add_callback(self, callback, policy: str = POLICY_MERGE) -> int:
+        """Add callback for drive events, dispatched like DriveManager.add_callback"""
+        return self.events.subscribe(callback, policy=policy)
+
+    def remove_callback(self, token: int):
+        self.events.unsubscribe(token)
+
+    def get_event_metrics(self) -> Dict[str, Dict[str, Any]]:
+        return self.events.get_metrics()
+
+    def notify_callbacks(self, event_type: str, drive_info: DriveInfo):
+        """Queue an event for the registered callbacks"""
+        self.events.publish(event_type, drive_info)
+
+    def _set_drives(self, drives: List[DriveInfo]):
+        self.drives = MappingProxyType({drive.name: drive for drive in drives})
+
+    def get_all_drives(self) -> List[DriveInfo]:
+        """Get the daemon's current drive list"""
+        try:
+            drives = [drive_from_dict(data) for data in self.client.call("get_drives")]
+        except DaemonError as e:
+            print(f"[DAEMON] Error getting drive list: {e}")
+            return []
+        self._set_drives(drives)
+        return drives
+
+    def refresh_drives(self) -> List[DriveInfo]:
+        """Have the daemon re-enumerate drives"""
+        drives = [drive_from_dict(data) for data in self.client.call("refresh_drives")]
+        self._set_drives(drives)
+        return drives
+
+    def get_generation(self, drive_name: str) -> str:
+        try:
+            return self.client.call("get_generation", drive_name=drive_name)
+        except DaemonError:
+            return ""
+
+    def get_drive_properties(self, drive_name: str) -> Dict:
+        try:
+            return self.client.call("get_drive_properties", drive_name=drive_name)
+        except DaemonError as e:
+            print(f"[DAEMON] Error getting properties of {drive_name}: {e}")
+            return {}
+
+    def _operation(self, method: str, **params) -> bool:
+        # Mounts may wait on a PolicyKit prompt, formats and repairs on the disk
+        try:
+            return bool(self.client.call(method, timeout=None, **params))
+        except DaemonError as e:
+            print(f"[DAEMON] {method} {params.get('drive_name', '')} failed: {e}")
+            return False
+
+    def mount_drive(self, drive_name: str, mount_point: str = None, options: str = "") -> bool:
+        return self._operation("mount_drive", drive_name=drive_name,
+                               mount_point=mount_point, options=options)
+
+    def unmount_drive(self, drive_name: str) -> bool:
+        return self._operation("unmount_drive", drive_name=drive_name)
+
+    def format_drive(self, drive_name: str, fstype: str, label: str = "") -> bool:
+        return self._operation("format_drive", drive_name=drive_name, fstype=fstype, label=label)
+
+    def repair_drive(self, drive_name: str) -> bool:
+        return self._operation("repair_drive", drive_name=drive_name)
+
+    def start_monitoring(self):
+        """Follow the daemon's event stream on a background thread"""
+        if self.monitoring:
+            return
+        self.monitoring = True
+        self.monitor_thread = threading.Thread(target=self._monitor_daemon_events, daemon=True)
+        self.monitor_thread.start()
+
+    def stop_monitoring(self):
+        """Stop following the event stream"""
+        self.monitoring = False
+        if self._subscription is not None:
+            try:
+                self._subscription.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _monitor_daemon_events(self):
+        while self.monitoring:
+            try:
+                self.client.subscribe(self._handle_message, self._set_subscription, self.seq)
+            except DaemonError as e:
+                if self.monitoring:
+                    print(f"[DAEMON] {e}; reconnecting")
+            if self.monitoring:
+                time.sleep(RECONNECT_DELAY)
+
+    def _set_subscription(self, sock: socket.socket):
+        self._subscription = sock
+
+    def _handle_message(self, message: Dict[str, Any]):
+        event_type = message.get("event")
+        if event_type == "heartbeat":
+            return
+
+        if event_type == "snapshot":
+            # Initial state or a resync: report what changed since our table
+            drives = [drive_from_dict(data) for data in message.get("drives", [])]
+            old_drives = self.drives
+            self._set_drives(drives)
+            self.seq = message.get("seq")
+            for drive in drives:
+                old_drive = old_drives.get(drive.name)
+                if old_drive is None:
+                    self.notify_callbacks("added", drive)
+                elif old_drive != drive:
+                    self.notify_callbacks("changed", drive)
+            for name, drive in old_drives.items():
+                if name not in self.drives:
+                    self.notify_callbacks("removed", drive)
+            return
+
+        if event_type == "delta":
+            self.seq = message.get("seq")
+            name = message.get("name", "")
+            changes = message.get("changes", {})
+            cause = message.get("cause", "changed")
+            if cause == "removed":
+                # Deltas for removals carry the last known fields as old values
+                drive = drive_from_dict({key: old for key, (old, new) in changes.items()})
+                drives = dict(self.drives)
+                drives.pop(name, None)
+                self.drives = MappingProxyType(drives)
+            else:
+                fields_now = asdict(self.drives[name]) if name in self.drives else {}
+                fields_now.update({key: new for key, (old, new) in changes.items()})
+                try:
+                    drive = drive_from_dict(fields_now)
+                except TypeError:
+                    return  # partial delta for a drive we never saw; the next snapshot fixes it
+                self.drives = MappingProxyType({**self.drives, name: drive})
+            self.notify_callbacks(cause, drive)
+
+
+def connect_drive_manager(socket_path: Optional[Path] = None):
+    """
+    Get the drive manager a frontend should use
+
+    Returns:
+        RemoteDriveManager if a drive daemon is running (and NTFS_MANAGER_NO_DAEMON
+        is unset), otherwise a local DriveManager
+    """
+    if not os.environ.get(NO_DAEMON_ENV):
+        client = DriveDaemonClient(socket_path)
+        if client.is_running():
+            print(f"[DAEMON] Using drive daemon at {client.socket_path}")
+            return RemoteDriveManager(client)
+    return DriveManager()
+
+
+def print_state_message(message: Dict[str, Any]):
+    """Print one subscription message, e.g. '[42] sdb1.mountpoint: '' -> '/media/x'"""
+    if message.get("event") == "snapshot":
+        print(f"[{message['seq']}] snapshot of {len(message['drives'])} drives")
+    elif message.get("event") == "delta":
+        changes = ", ".join(f"{message['name']}.{key}: {old!r} -> {new!r}"
+                            for key, (old, new) in message["changes"].items())
+        print(f"[{message['seq']}] {message['cause']}: {changes or message['name']}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NTFS Manager drive daemon")
+    parser.add_argument("command", nargs="?", default="serve", choices=("serve", "status", "list", "watch"),
+                        help="serve (default), show daemon status, list drives or watch changes")
+    parser.add_argument("--socket", type=Path, default=None,
+                        help=f"socket path (default: {default_socket_path()})")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        daemon = DriveDaemon(args.socket)
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+        try:
+            daemon.serve_forever()
+        except DaemonError as e:
+            print(f"[DAEMON] {e}")
+            return 1
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    client = DriveDaemonClient(args.socket)
+    try:
+        if args.command == "status":
+            info = client.call("ping")
+            print(f"Drive daemon running (pid {info['pid']}, {info['subscribers']} subscribers, "
+                  f"drive table version {info['seq']})")
+        elif args.command == "watch":
+            client.subscribe(print_state_message)
+        else:
+            for data in client.call("get_drives"):
+                print(f"{data['name']:<12} {format_size(data['size']):>8}  {data['fstype'] or '-':<8} {data['mountpoint']}")
+    except DaemonError as e:
+        print(f"[DAEMON] {e}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
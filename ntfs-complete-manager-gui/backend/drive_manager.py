@@ -8,18 +8,118 @@ import subprocess
 import re
 import json
 import os
+import sys
 import time
 import threading
 import configparser
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+from collections import deque
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Callable, List, Dict, Mapping, Optional, Tuple
+from dataclasses import dataclass, asdict, field, replace
 from pathlib import Path
 
-@dataclass
+from udisks_client import UDisksClient, UDisksError, UDisksUnavailableError
+from mount_tuner import MountProfileStore, MountOptionTuner, udisks_fstype
+from tool_registry import get_tool_registry
+from command_runner import get_command_runner, run_command
+
+class FsType(str, Enum):
+    """Filesystem types lsblk commonly reports; others stay plain strings"""
+    NTFS = "ntfs"
+    EXFAT = "exfat"
+    VFAT = "vfat"
+    EXT2 = "ext2"
+    EXT3 = "ext3"
+    EXT4 = "ext4"
+    BTRFS = "btrfs"
+    XFS = "xfs"
+    F2FS = "f2fs"
+    SWAP = "swap"
+    ISO9660 = "iso9660"
+    LUKS = "crypto_LUKS"
+    LVM = "LVM2_member"
+    UNKNOWN = "Unknown"
+
+    # Compare, hash, print and serialize as the plain value ("ntfs")
+    __str__ = str.__str__
+    __repr__ = str.__repr__
+    __format__ = str.__format__
+
+
+class Health(str, Enum):
+    """Health status values reported by DriveManager"""
+    UNKNOWN = "Unknown"
+    HEALTHY = "Healthy"
+    MOUNTED_OK = "Mounted (OK)"
+    DIRTY = "Dirty"
+    ERROR = "Error"
+    VIRTUAL = "N/A (virtual device)"
+
+    __str__ = str.__str__
+    __repr__ = str.__repr__
+    __format__ = str.__format__
+
+
+def _coded(enum_type, value: str):
+    """The enum member for value, or the interned string if it has none"""
+    try:
+        return enum_type(value)
+    except ValueError:
+        return sys.intern(str(value))
+
+
+_SIZE_UNITS = "BKMGTPE"
+
+
+def format_size(size: int) -> str:
+    """Human-readable size in lsblk's style (1024-based): 1000204886016 -> '931.5G'"""
+    if size < 1024:
+        return f"{size}B"
+    value = float(size)
+    unit = 0
+    while value >= 1024 and unit < len(_SIZE_UNITS) - 1:
+        value /= 1024
+        unit += 1
+    text = f"{value:.1f}".rstrip("0").rstrip(".")
+    return f"{text}{_SIZE_UNITS[unit]}"
+
+
+def parse_size(size) -> int:
+    """
+    Bytes from an integer or a size string ('512', '931.5G', '1T')
+
+    Returns:
+        int: Size in bytes, 0 if it can't be parsed
+    """
+    if isinstance(size, int):
+        return size
+    text = str(size).strip().upper().rstrip("IB") or "0"
+    unit = _SIZE_UNITS.find(text[-1])
+    try:
+        if unit > 0:
+            return int(float(text[:-1]) * 1024 ** unit)
+        return int(float(text))
+    except ValueError:
+        return 0
+
+
+# Slotted records need Python 3.10; older interpreters get a regular dataclass
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class DriveInfo:
-    """Data class for drive information"""
+    """
+    Data class for drive information (immutable; use dataclasses.replace)
+    
+    size is in bytes (format_size() it for display). fstype and
+    health_status hold FsType and Health members, which compare equal to
+    their string values; filesystem types without a member are kept as
+    interned strings.
+    """
     name: str
-    size: str
+    size: int
     fstype: str
     mountpoint: str
     label: str
@@ -29,39 +129,526 @@ class DriveInfo:
     uuid: str = ""
     is_removable: bool = False
     is_rotational: bool = False
-    health_status: str = "Unknown"
+    health_status: str = Health.UNKNOWN
     temperature: float = 0.0
     smart_status: str = "Unknown"
+    major: int = 0
+    minor: int = 0
+    
+    def __post_init__(self):
+        # Also normalizes records rebuilt from JSON (snapshots, the daemon)
+        object.__setattr__(self, "size", parse_size(self.size))
+        object.__setattr__(self, "fstype", _coded(FsType, self.fstype))
+        object.__setattr__(self, "health_status", _coded(Health, self.health_status))
+
+@dataclass(frozen=True)
+class DriveTable:
+    """One published version of the drive table"""
+    version: int
+    drives: Mapping[str, DriveInfo]  # read-only view
+
+# Deltas kept for subscribers catching up from a sequence number
+DELTA_HISTORY = 1024
+
+# Seconds a disk's smartctl output is reused; every partition of a disk asks for it
+SMART_CACHE_TTL = 10.0
+
+# Filesystems the running kernel supports, built in or from loaded modules
+PROC_FILESYSTEMS = "/proc/filesystems"
+
+# Name UDisks2 D-Bus calls are timed and recorded under by the command runner
+UDISKS_DBUS_TOOL = "udisks2-dbus"
+
+@dataclass
+class DriveDelta:
+    """Field-level change of one drive, numbered in publication order"""
+    seq: int
+    name: str
+    event: str  # 'added', 'removed', 'changed' or the DriveManager event behind it ('mounted', ...)
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)  # {field: (old, new)}
+    
+    def __str__(self) -> str:
+        if self.event in ("added", "removed") and len(self.changes) > 1:
+            return f"{self.name}: {self.event}"
+        return ", ".join(f"{self.name}.{key}: {old!r} -> {new!r}"
+                         for key, (old, new) in self.changes.items()) or f"{self.name}: {self.event}"
+
+@dataclass
+class DriveStateSnapshot:
+    """Every drive's fields as of sequence number seq"""
+    seq: int
+    drives: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # {name: asdict(DriveInfo)}
+
+class DriveStateTracker:
+    """
+    Versioned drive table publishing field-level deltas
+    
+    Every change gets the next sequence number and is kept in a bounded
+    history. A subscriber starts from a snapshot, or, given the last
+    sequence number it saw, from the deltas it missed, so reconnecting
+    consumers catch up without a rescan.
+    """
+    
+    def __init__(self, history: int = DELTA_HISTORY):
+        self.seq = 0
+        self._drives = {}  # {name: asdict(DriveInfo)}
+        self._history = deque(maxlen=history)
+        self._subscribers = {}  # {token: callback}
+        self._next_token = 0
+        self._lock = threading.RLock()
+    
+    def _append(self, name: str, event: str, changes: Dict[str, Tuple[Any, Any]]) -> DriveDelta:
+        """Record one delta; caller holds self._lock"""
+        self.seq += 1
+        delta = DriveDelta(seq=self.seq, name=name, event=event, changes=changes)
+        self._history.append(delta)
+        for callback in list(self._subscribers.values()):
+            try:
+                callback(delta)
+            except Exception as e:
+                print(f"Subscriber error: {e}")
+        return delta
+    
+    def update(self, drive: DriveInfo, event: str = "changed", force: bool = False) -> Optional[DriveDelta]:
+        """
+        Publish the current fields of one drive
+        
+        Args:
+            drive: Drive as it is now
+            event: Event name recorded with the delta
+            force: Record a delta even if no field changed
+        
+        Returns:
+            DriveDelta, or None if nothing changed
+        """
+        new = asdict(drive)
+        with self._lock:
+            old = self._drives.get(drive.name)
+            self._drives[drive.name] = new
+            if old is None:
+                return self._append(drive.name, "added" if event == "changed" else event,
+                                    {key: (None, value) for key, value in new.items()})
+            changes = {key: (old.get(key), value) for key, value in new.items() if old.get(key) != value}
+            if not changes and not force:
+                return None
+            return self._append(drive.name, event, changes)
+    
+    def remove(self, name: str) -> Optional[DriveDelta]:
+        """Publish the removal of a drive, with its last known fields"""
+        with self._lock:
+            old = self._drives.pop(name, None)
+            if old is None:
+                return None
+            return self._append(name, "removed", {key: (value, None) for key, value in old.items()})
+    
+    def replace_all(self, drives: List[DriveInfo]) -> List[DriveDelta]:
+        """Publish a complete enumeration: additions, changes and removals"""
+        with self._lock:
+            deltas = []
+            names = set()
+            for drive in drives:
+                names.add(drive.name)
+                delta = self.update(drive)
+                if delta:
+                    deltas.append(delta)
+            for name in [name for name in self._drives if name not in names]:
+                deltas.append(self.remove(name))
+            return deltas
+    
+    def snapshot(self) -> DriveStateSnapshot:
+        """Current table and its sequence number"""
+        with self._lock:
+            return DriveStateSnapshot(seq=self.seq, drives={name: dict(fields)
+                                                           for name, fields in self._drives.items()})
+    
+    def changes_since(self, seq: int) -> Optional[List[DriveDelta]]:
+        """
+        Deltas after seq, or None if the history no longer reaches back that far
+        """
+        with self._lock:
+            if seq > self.seq:
+                return None
+            if seq == self.seq:
+                return []
+            if not self._history or self._history[0].seq > seq + 1:
+                return None
+            return [delta for delta in self._history if delta.seq > seq]
+    
+    def subscribe(self, callback: Callable[[Any], None], since: Optional[int] = None) -> int:
+        """
+        Receive the drive table and every later change
+        
+        The callback first gets either a DriveStateSnapshot or, when since is
+        given and still covered by the history, the DriveDeltas after since;
+        then each new DriveDelta as it is published. Callbacks run on the
+        publishing thread and must not block.
+        
+        Returns:
+            int: Token for unsubscribe()
+        """
+        with self._lock:
+            backlog = self.changes_since(since) if since is not None else None
+            if backlog is None:
+                callback(self.snapshot())
+            else:
+                for delta in backlog:
+                    callback(delta)
+            self._next_token += 1
+            self._subscribers[self._next_token] = callback
+            return self._next_token
+    
+    def unsubscribe(self, token: int):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+# Events queued per subscriber before the overflow policy applies
+EVENT_QUEUE_SIZE = 64
+
+# Overflow policies for EventBus subscribers
+POLICY_MERGE = "merge"  # coalesce with a queued event for the same drive and type, then drop oldest
+POLICY_DROP_OLDEST = "drop_oldest"
+POLICY_DROP_NEWEST = "drop_newest"
+
+@dataclass
+class SubscriberStats:
+    """Delivery counters for one event bus subscriber"""
+    delivered: int = 0
+    merged: int = 0
+    dropped: int = 0
+    errors: int = 0
+    max_depth: int = 0
+    total_latency: float = 0.0  # seconds from publish to callback return
+    max_latency: float = 0.0
+    
+    @property
+    def avg_latency(self) -> float:
+        return self.total_latency / self.delivered if self.delivered else 0.0
+
+class _Subscriber:
+    """Bounded queue and dispatch thread of one event bus subscriber"""
+    
+    def __init__(self, name: str, callback: Callable[[str, Any], None], max_queue: int, policy: str):
+        self.name = name
+        self.callback = callback
+        self.max_queue = max_queue
+        self.policy = policy
+        self.stats = SubscriberStats()
+        self.queue = deque()  # [(event_type, drive_info, publish time)]
+        self.busy = False
+        self.running = True
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name=f"events-{name}", daemon=True)
+        self.thread.start()
+    
+    def offer(self, event_type: str, drive_info, published: float):
+        with self.condition:
+            if self.policy == POLICY_MERGE:
+                # Coalesce with the drive's last queued event if it is of the same type;
+                # newer state replaces it, keeping its place and age
+                for index in range(len(self.queue) - 1, -1, -1):
+                    queued_type, queued_drive, queued_at = self.queue[index]
+                    if queued_drive.name != drive_info.name:
+                        continue
+                    if queued_type == event_type:
+                        self.queue[index] = (event_type, drive_info, queued_at)
+                        self.stats.merged += 1
+                        return
+                    break
+            
+            if len(self.queue) >= self.max_queue:
+                self.stats.dropped += 1
+                if self.policy == POLICY_DROP_NEWEST:
+                    return
+                self.queue.popleft()
+            
+            self.queue.append((event_type, drive_info, published))
+            self.stats.max_depth = max(self.stats.max_depth, len(self.queue))
+            self.condition.notify()
+    
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.queue:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                event_type, drive_info, published = self.queue.popleft()
+                self.busy = True
+            
+            try:
+                self.callback(event_type, drive_info)
+            except Exception as e:
+                self.stats.errors += 1
+                print(f"[EVENTS] Subscriber {self.name} failed on {event_type}: {e}")
+            
+            latency = time.monotonic() - published
+            with self.condition:
+                self.busy = False
+                self.stats.delivered += 1
+                self.stats.total_latency += latency
+                self.stats.max_latency = max(self.stats.max_latency, latency)
+                self.condition.notify_all()
+    
+    def wait_idle(self, deadline: float) -> bool:
+        with self.condition:
+            while self.queue or self.busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.running:
+                    return False
+                self.condition.wait(remaining)
+        return True
+    
+    def stop(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+class EventBus:
+    """
+    Drive event fan-out with a bounded queue and a dispatch thread per subscriber
+    
+    publish() never runs subscriber code, so a slow subscriber (a GUI
+    refresh, logging) cannot hold up the udev monitor thread or the other
+    subscribers. When a subscriber falls behind its queue applies its
+    overflow policy; the counters in get_metrics() show how often.
+    """
+    
+    def __init__(self, max_queue: int = EVENT_QUEUE_SIZE):
+        self.max_queue = max_queue
+        self._subscribers = {}  # {token: _Subscriber}
+        self._next_token = 0
+        self._lock = threading.Lock()
+    
+    def subscribe(self, callback: Callable[[str, Any], None], name: Optional[str] = None,
+                  policy: str = POLICY_MERGE, max_queue: Optional[int] = None) -> int:
+        """
+        Register a callback(event_type, drive_info)
+        
+        Args:
+            callback: Called on the subscriber's own thread
+            name: Label for metrics and thread names (defaults to the callback's name)
+            policy: POLICY_MERGE, POLICY_DROP_OLDEST or POLICY_DROP_NEWEST
+            max_queue: Queue bound (EventBus default if None)
+        
+        Returns:
+            int: Token for unsubscribe()
+        """
+        if policy not in (POLICY_MERGE, POLICY_DROP_OLDEST, POLICY_DROP_NEWEST):
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        with self._lock:
+            self._next_token += 1
+            name = name or getattr(callback, "__qualname__", "subscriber")
+            self._subscribers[self._next_token] = _Subscriber(
+                f"{name}#{self._next_token}", callback, max_queue or self.max_queue, policy)
+            return self._next_token
+    
+    def unsubscribe(self, token: int):
+        with self._lock:
+            subscriber = self._subscribers.pop(token, None)
+        if subscriber:
+            subscriber.stop()
+    
+    def publish(self, event_type: str, drive_info):
+        """Queue an event for every subscriber without waiting for any of them"""
+        published = time.monotonic()
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for subscriber in subscribers:
+            subscriber.offer(event_type, drive_info, published)
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Wait until every queued event has been delivered"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        return all(subscriber.wait_idle(deadline) for subscriber in subscribers)
+    
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-subscriber queue depth, delivery counters and dispatch latency"""
+        metrics = {}
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for subscriber in subscribers:
+            with subscriber.condition:
+                stats = asdict(subscriber.stats)
+                stats["avg_latency"] = round(subscriber.stats.avg_latency, 6)
+                stats["depth"] = len(subscriber.queue)
+                stats["policy"] = subscriber.policy
+            metrics[subscriber.name] = stats
+        return metrics
+    
+    def close(self):
+        """Stop every dispatch thread"""
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+            self._subscribers.clear()
+        for subscriber in subscribers:
+            subscriber.stop()
 
 class DriveManager:
     """Main drive management class"""
     
-    def __init__(self):
-        self.drives = {}
+    def __init__(self, sys_root: str = "/sys"):
+        # sysfs mount point; benchmarks point it at a synthetic tree
+        self.sys_root = sys_root
+        # Copy-on-write drive table: writers publish a new DriveTable, readers never lock
+        self._table = DriveTable(version=0, drives=MappingProxyType({}))
+        self._table_lock = threading.Lock()
         self.monitoring = False
-        self.callbacks = []
+        # Callbacks run on their own threads, fed through bounded queues
+        self.events = EventBus()
+        # Persistent UDisks2 D-Bus client shared by all mount/unmount calls
+        self.udisks = UDisksClient() if UDisksClient.is_supported() else None
+        # Per-volume mount profiles produced by the option tuner
+        self.mount_profiles = MountProfileStore()
+        # Per-drive event counters backing get_generation()
+        self._generations = {}
+        # Versioned drive table behind subscribe()
+        self.state = DriveStateTracker()
+        
+    @property
+    def drives(self) -> Mapping[str, DriveInfo]:
+        """
+        Current drive table, as a read-only mapping
+        
+        Take one reference and read from it for a consistent view; later
+        updates publish a new mapping instead of changing this one.
+        """
+        return self._table.drives
+    
+    def get_drive_table(self) -> DriveTable:
+        """Current drive table with its version number"""
+        return self._table
+    
+    def update_drives(self, updates: Dict[str, Optional[DriveInfo]],
+                      replace_all: bool = False) -> DriveTable:
+        """
+        Publish the next version of the drive table
+        
+        All updates land in one new version, so readers see either none or
+        all of them.
+        
+        Args:
+            updates: {name: DriveInfo} to add or replace, {name: None} to remove
+            replace_all: Drop every drive not in updates (a complete enumeration)
+        
+        Returns:
+            DriveTable: The published version
+        """
+        with self._table_lock:
+            drives = {} if replace_all else dict(self._table.drives)
+            for name, drive in updates.items():
+                if drive is None:
+                    drives.pop(name, None)
+                else:
+                    drives[name] = drive
+            return self._swap_table(drives)
+    
+    def _swap_table(self, drives: Dict[str, DriveInfo]) -> DriveTable:
+        """Publish drives as the next table version; caller holds _table_lock"""
+        self._table = DriveTable(version=self._table.version + 1,
+                                 drives=MappingProxyType(drives))
+        return self._table
+    
+    def _update_drive(self, drive_name: str, **changes) -> Optional[DriveInfo]:
+        """Publish a copy of one drive with some fields changed; None if it is unknown"""
+        with self._table_lock:
+            drive = self._table.drives.get(drive_name)
+            if drive is None:
+                return None
+            drive = replace(drive, **changes)
+            self._swap_table({**self._table.drives, drive_name: drive})
+            return drive
+    
+    def add_callback(self, callback, policy: str = POLICY_MERGE) -> int:
+        """
+        Add callback for drive events
         
-    def add_callback(self, callback):
-        """Add callback for drive events"""
-        self.callbacks.append(callback)
+        The callback runs on a dispatch thread of its own, not on the thread
+        that detected the event; see EventBus for the overflow policies.
+        
+        Returns:
+            int: Token for remove_callback()
+        """
+        return self.events.subscribe(callback, policy=policy)
+    
+    def remove_callback(self, token: int):
+        """Remove a callback added with add_callback()"""
+        self.events.unsubscribe(token)
+    
+    def get_event_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth, drop/merge counts and dispatch latency per callback"""
+        return self.events.get_metrics()
         
     def notify_callbacks(self, event_type: str, drive_info: DriveInfo):
         """Notify all registered callbacks"""
-        for callback in self.callbacks:
-            try:
-                callback(event_type, drive_info)
-            except Exception as e:
-                print(f"Callback error: {e}")
+        # Every event may change what cached properties would report
+        self._generations[drive_info.name] = self._generations.get(drive_info.name, 0) + 1
+        
+        # Lifecycle events are already published by the enumeration that found them;
+        # others (mounted, dirty_volume, ...) are recorded even without a field change
+        if event_type == "removed":
+            self.state.remove(drive_info.name)
+        else:
+            self.state.update(drive_info, event_type, force=event_type != "added")
+        
+        self.events.publish(event_type, drive_info)
+    
+    def get_generation(self, drive_name: str) -> str:
+        """
+        Get a key that changes whenever cached properties of a drive go stale
+        
+        Combines the drive's event counter (bumped on add/remove/mount/unmount
+        and other notifications) with its current UUID and mount point, so
+        changes made by other programs are caught on the next enumeration.
+        The counter, before the first ':', is only meaningful within this
+        process; the rest is stable across restarts.
+        """
+        drive = self.drives.get(drive_name)
+        uuid = drive.uuid if drive else ""
+        mountpoint = drive.mountpoint if drive else ""
+        return f"{self._generations.get(drive_name, 0)}:{uuid}:{mountpoint}"
+    
+    def subscribe(self, callback: Callable[[Any], None], since: Optional[int] = None) -> int:
+        """
+        Subscribe to the versioned drive table (see DriveStateTracker.subscribe)
+        
+        Args:
+            callback: Gets a DriveStateSnapshot or the missed DriveDeltas, then each new DriveDelta
+            since: Last sequence number the subscriber saw, to catch up from
+        
+        Returns:
+            int: Token for unsubscribe()
+        """
+        return self.state.subscribe(callback, since)
+    
+    def unsubscribe(self, token: int):
+        """Stop a subscribe() callback"""
+        self.state.unsubscribe(token)
     
     def get_all_drives(self) -> List[DriveInfo]:
         """Get list of all detected drives and partitions"""
+        return self._refresh_table()[0]
+    
+    def _refresh_table(self) -> Tuple[List[DriveInfo], List[DriveInfo], List[DriveInfo]]:
+        """
+        Enumerate drives and publish them as the next table version
+        
+        Added and removed drives are worked out against the version being
+        replaced, inside the same critical section as the swap, so two
+        concurrent refreshes never report the same change. An enumeration
+        that fails or finds nothing leaves the table alone.
+        
+        Returns:
+            Tuple of (drives, added drives, removed drives)
+        """
         drives = []
+        added, removed = [], []
         
         try:
             # Get block devices using lsblk
-            result = subprocess.run(
-                ["lsblk", "-J", "-o", "NAME,SIZE,FSTYPE,MOUNTPOINT,LABEL,MODEL,SERIAL,UUID,RM,ROTA"],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                ["lsblk", "-J", "-b", "-o", "NAME,SIZE,FSTYPE,MOUNTPOINT,LABEL,MODEL,SERIAL,UUID,RM,ROTA,MAJ:MIN"], check=True
             )
             
             data = json.loads(result.stdout)
@@ -71,21 +658,30 @@ class DriveManager:
                 drive_info = self._parse_device_info(device)
                 if drive_info:
                     drives.append(drive_info)
-                    self.drives[drive_info.name] = drive_info
                 
                 # Add child devices (partitions)
                 for partition in device.get("children", []):
                     partition_info = self._parse_device_info(partition)
                     if partition_info:
                         drives.append(partition_info)
-                        self.drives[partition_info.name] = partition_info
+            
+            # Publish the whole enumeration as one table version; only a
+            # complete enumeration can tell that a drive is gone
+            if drives:
+                new_drives = {drive.name: drive for drive in drives}
+                with self._table_lock:
+                    old_drives = self._table.drives
+                    self._swap_table(new_drives)
+                    self.state.replace_all(drives)
+                added = [drive for drive in drives if drive.name not in old_drives]
+                removed = [drive for name, drive in old_drives.items() if name not in new_drives]
                     
         except subprocess.CalledProcessError as e:
             print(f"Error getting drive list: {e}")
         except json.JSONDecodeError as e:
             print(f"Error parsing lsblk output: {e}")
             
-        return drives
+        return drives, added, removed
     
     def _parse_device_info(self, device: dict) -> Optional[DriveInfo]:
         """Parse device information from lsblk JSON output"""
@@ -98,7 +694,8 @@ class DriveManager:
             if name.startswith("loop") or name.startswith("dm-"):
                 return None
             
-            size = device.get("size", "Unknown")
+            size = parse_size(device.get("size") or 0)  # bytes, thanks to lsblk -b
+            major, _, minor = (device.get("maj:min") or "0:0").partition(":")
             fstype = device.get("fstype", "")
             mountpoint = device.get("mountpoint", "")
             label = device.get("label", "")
@@ -130,7 +727,7 @@ class DriveManager:
             
             # Get health and SMART status (with device type awareness)
             if device_type in ["ram", "loop"]:
-                health_status = "N/A (virtual device)"
+                health_status = Health.VIRTUAL
                 smart_status = "N/A (virtual device)"
                 temperature = 0.0
             else:
@@ -152,7 +749,9 @@ class DriveManager:
                 is_rotational=is_rotational,
                 health_status=health_status,
                 temperature=temperature,
-                smart_status=smart_status
+                smart_status=smart_status,
+                major=int(major or 0),
+                minor=int(minor or 0)
             )
             
         except Exception as e:
@@ -194,12 +793,11 @@ class DriveManager:
         # Method 2: Check if device is connected via USB
         try:
             # Check if device path contains 'usb' in its hierarchy
-            device_path = f"/sys/block/{device_to_check}"
+            device_path = f"{self.sys_root}/block/{device_to_check}"
             if os.path.exists(device_path):
                 # Read the device's subsystem links
-                result = subprocess.run(
-                    ["udevadm", "info", "--query=property", "--name", f"/dev/{device_to_check}"],
-                    capture_output=True, text=True
+                result = run_command(
+                    ["udevadm", "info", "--query=property", "--name", f"/dev/{device_to_check}"]
                 )
                 if result.returncode == 0:
                     for line in result.stdout.splitlines():
@@ -216,7 +814,7 @@ class DriveManager:
         
         # Method 3: Check sysfs removable flag
         try:
-            removable_path = f"/sys/block/{device_to_check}/removable"
+            removable_path = f"{self.sys_root}/block/{device_to_check}/removable"
             if os.path.exists(removable_path):
                 with open(removable_path, 'r') as f:
                     removable_value = f.read().strip()
@@ -229,12 +827,11 @@ class DriveManager:
         # Method 4: Check if it's an external/hotplug capable device
         try:
             # Check for hotplug capability
-            device_path = f"/sys/block/{device_to_check}/device"
+            device_path = f"{self.sys_root}/block/{device_to_check}/device"
             if os.path.exists(device_path):
                 # Read device type information
-                result = subprocess.run(
-                    ["udevadm", "info", "--query=property", "--name", f"/dev/{device_to_check}"],
-                    capture_output=True, text=True
+                result = run_command(
+                    ["udevadm", "info", "--query=property", "--name", f"/dev/{device_to_check}"]
                 )
                 if result.returncode == 0:
                     for line in result.stdout.splitlines():
@@ -299,7 +896,7 @@ class DriveManager:
         
         try:
             # Try /sys/block first
-            sys_path = f"/sys/block/{device_name}/device"
+            sys_path = f"{self.sys_root}/block/{device_name}/device"
             
             if os.path.exists(sys_path):
                 # Read model
@@ -322,7 +919,7 @@ class DriveManager:
             
             # For NVMe devices, try different paths
             if device_name.startswith("nvme"):
-                nvme_path = f"/sys/block/{device_name}"
+                nvme_path = f"{self.sys_root}/block/{device_name}"
                 if os.path.exists(nvme_path):
                     model_file = f"{nvme_path}/device/model"
                     if os.path.exists(model_file):
@@ -349,9 +946,8 @@ class DriveManager:
             # Fallback to udevadm - try multiple vendor fields
             if not model or not vendor or not serial:
                 device_path = f"/dev/{device_name}"
-                result = subprocess.run(
-                    ["udevadm", "info", "--query=property", "--name", device_path],
-                    capture_output=True, text=True, check=True
+                result = run_command(
+                    ["udevadm", "info", "--query=property", "--name", device_path], check=True
                 )
                 
                 for line in result.stdout.splitlines():
@@ -377,9 +973,8 @@ class DriveManager:
         
         # Try blkid with sudo for all filesystem types (more reliable)
         try:
-            result = subprocess.run(
-                ["sudo", "blkid", "-s", "LABEL", "-o", "value", device_path],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                ["sudo", "blkid", "-s", "LABEL", "-o", "value", device_path], check=True
             )
             label = result.stdout.strip()
             if label:
@@ -390,9 +985,8 @@ class DriveManager:
         # NTFS-specific: try ntfslabel with sudo
         if fstype == "ntfs":
             try:
-                result = subprocess.run(
-                    ["sudo", "ntfslabel", device_path],
-                    capture_output=True, text=True, check=True
+                result = run_command(
+                    ["sudo", "ntfslabel", device_path], check=True
                 )
                 label = result.stdout.strip()
                 if label:
@@ -402,9 +996,8 @@ class DriveManager:
             
             # Alternative: try ntfsinfo to extract volume name
             try:
-                result = subprocess.run(
-                    ["sudo", "ntfsinfo", "-m", device_path],
-                    capture_output=True, text=True, check=True
+                result = run_command(
+                    ["sudo", "ntfsinfo", "-m", device_path], check=True
                 )
                 for line in result.stdout.splitlines():
                     if "Volume Name:" in line:
@@ -417,9 +1010,8 @@ class DriveManager:
         # ext filesystem: try e2label
         if fstype and fstype.startswith("ext"):
             try:
-                result = subprocess.run(
-                    ["sudo", "e2label", device_path],
-                    capture_output=True, text=True, check=True
+                result = run_command(
+                    ["sudo", "e2label", device_path], check=True
                 )
                 label = result.stdout.strip()
                 if label:
@@ -429,13 +1021,12 @@ class DriveManager:
         
         return ""
     
-    def _get_health_status(self, device_path: str) -> str:
+    def _get_health_status(self, device_path: str) -> Health:
         """Get drive health status"""
         try:
             # Check if device is mounted
-            result = subprocess.run(
-                ["findmnt", "-n", "-o", "SOURCE", device_path],
-                capture_output=True, text=True
+            result = run_command(
+                ["findmnt", "-n", "-o", "SOURCE", device_path]
             )
             is_mounted = result.returncode == 0
             
@@ -444,31 +1035,29 @@ class DriveManager:
             if fstype == "ntfs":
                 if is_mounted:
                     # For mounted partitions, use read-only check
-                    result = subprocess.run(
-                        ["ntfsfix", "-n", device_path],
-                        capture_output=True, text=True
+                    result = run_command(
+                        ["ntfsfix", "-n", device_path]
                     )
                 else:
                     # For unmounted partitions, normal check
-                    result = subprocess.run(
-                        ["ntfsfix", "-n", device_path],
-                        capture_output=True, text=True
+                    result = run_command(
+                        ["ntfsfix", "-n", device_path]
                     )
                 
                 if "marked to be fixed" in result.stdout or "dirty" in result.stdout.lower():
-                    return "Dirty"
+                    return Health.DIRTY
                 elif "refusing to operate" in result.stdout.lower() or "read-write mounted" in result.stdout.lower():
                     # Mounted, cannot check - return healthy assumption
-                    return "Mounted (OK)"
+                    return Health.MOUNTED_OK
                 elif result.returncode == 0:
-                    return "Healthy"
+                    return Health.HEALTHY
                 else:
-                    return "Error"
+                    return Health.ERROR
                     
         except (subprocess.CalledProcessError, FileNotFoundError):
             pass
             
-        return "Unknown"
+        return Health.UNKNOWN
     
     def _get_temperature(self, device_path: str) -> float:
         """Get drive temperature if available"""
@@ -485,9 +1074,8 @@ class DriveManager:
                 device_path = f"/dev/{parent_device}"
             
             # Try to get temperature from smartctl
-            result = subprocess.run(
-                ["smartctl", "-A", device_path],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                ["smartctl", "-A", device_path], check=True, cache_ttl=SMART_CACHE_TTL
             )
             
             for line in result.stdout.splitlines():
@@ -516,9 +1104,8 @@ class DriveManager:
                 parent_device = self._get_parent_device(device_name)
                 device_path = f"/dev/{parent_device}"
             
-            result = subprocess.run(
-                ["smartctl", "-H", device_path],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                ["smartctl", "-H", device_path], check=True, cache_ttl=SMART_CACHE_TTL
             )
             
             for line in result.stdout.splitlines():
@@ -536,9 +1123,8 @@ class DriveManager:
     def _get_filesystem_type(self, device_path: str) -> str:
         """Get filesystem type for a device"""
         try:
-            result = subprocess.run(
-                ["lsblk", "-no", "FSTYPE", device_path],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                ["lsblk", "-no", "FSTYPE", device_path], check=True
             )
             return result.stdout.strip()
         except subprocess.CalledProcessError:
@@ -554,15 +1140,10 @@ class DriveManager:
         """
         # Check for ntfs3 kernel module (kernel 5.15+)
         try:
-            result = subprocess.run(
-                ["modprobe", "-l", "ntfs3"],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0 and "ntfs3" in result.stdout:
+            if self._is_ntfs_driver_available("ntfs3"):
                 # Verify kernel version
-                kernel_info = subprocess.run(
-                    ["uname", "-r"],
-                    capture_output=True, text=True, check=True
+                kernel_info = run_command(
+                    ["uname", "-r"], check=True
                 )
                 kernel_version = kernel_info.stdout.strip()
                 # Parse version (e.g., "5.15.0-53-generic" -> 5.15)
@@ -578,32 +1159,82 @@ class DriveManager:
         except (subprocess.CalledProcessError, FileNotFoundError):
             pass
         
+        tools = get_tool_registry()
+        
         # Check for lowntfs-3g (preferred FUSE driver)
+        if tools.is_available("lowntfs-3g"):
+            print("[NTFS] Detected lowntfs-3g driver")
+            return "lowntfs-3g"
+        
+        # Check for ntfs-3g (fallback FUSE driver)
+        if tools.is_available("ntfs-3g"):
+            print("[NTFS] Detected ntfs-3g driver")
+            return "ntfs-3g"
+        
+        print("[NTFS] WARNING: No NTFS driver detected!")
+        return "unknown"
+    
+    def _is_ntfs_driver_available(self, driver: str) -> bool:
+        """Check if a specific NTFS driver can be used on this system"""
+        if driver != "ntfs3":
+            return get_tool_registry().is_available(driver)
+        
+        # kmod dropped 'modprobe -l'; a loaded or built-in driver is listed in
+        # /proc/filesystems, one that can still be loaded is known to modinfo
         try:
-            result = subprocess.run(
-                ["which", "lowntfs-3g"],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                print("[NTFS] Detected lowntfs-3g driver")
-                return "lowntfs-3g"
-        except (subprocess.CalledProcessError, FileNotFoundError):
+            with open(PROC_FILESYSTEMS) as f:
+                if any(line.split()[-1:] == ["ntfs3"] for line in f):
+                    return True
+        except OSError:
             pass
         
-        # Check for ntfs-3g (fallback FUSE driver)
         try:
-            result = subprocess.run(
-                ["which", "ntfs-3g"],
-                capture_output=True, text=True
+            return run_command(["modinfo", "-F", "name", "ntfs3"]).returncode == 0
+        except FileNotFoundError:
+            return False
+    
+    def _get_mount_point(self, device_path: str) -> str:
+        """Get current mount point of a device (empty if not mounted)"""
+        try:
+            result = run_command(
+                ["findmnt", "-n", "-o", "TARGET", "-S", device_path]
             )
-            if result.returncode == 0:
-                print("[NTFS] Detected ntfs-3g driver")
-                return "ntfs-3g"
+            return result.stdout.strip() if result.returncode == 0 else ""
+        except FileNotFoundError:
+            return ""
+    
+    def _get_filesystem_uuid(self, drive_name: str) -> str:
+        """Get filesystem UUID, preferring the cached drive info"""
+        drive = self.drives.get(drive_name)
+        if drive and drive.uuid:
+            return drive.uuid
+        
+        try:
+            result = run_command(
+                ["lsblk", "-no", "UUID", f"/dev/{drive_name}"], check=True
+            )
+            return result.stdout.strip()
         except (subprocess.CalledProcessError, FileNotFoundError):
-            pass
+            return ""
+    
+    def _get_tuned_profile(self, drive_name: str):
+        """Get the tuned mount profile for a drive's filesystem UUID, if any"""
+        uuid = self._get_filesystem_uuid(drive_name)
+        return self.mount_profiles.get(uuid) if uuid else None
+    
+    def tune_mount_options(self, drive_name: str, drivers: Optional[List[str]] = None,
+                           size_mb: int = 64, file_count: int = 200):
+        """
+        Benchmark candidate NTFS drivers/options on an unmounted volume
         
-        print("[NTFS] WARNING: No NTFS driver detected!")
-        return "unknown"
+        The winning profile is stored by filesystem UUID and used by
+        mount_drive automatically from then on.
+        
+        Returns:
+            MountProfile: Winning profile, or None if tuning failed
+        """
+        tuner = MountOptionTuner(self, self.mount_profiles)
+        return tuner.tune(drive_name, drivers, size_mb, file_count)
     
     def _load_mount_options_config(self) -> Dict[str, str]:
         """Load mount options from config file or use defaults"""
@@ -651,6 +1282,108 @@ class DriveManager:
         print(f"[NTFS] Using mount options for {driver}: {options}")
         return options
     
+    def _udisks_mount(self, drive_name: str, options: str = "",
+                      fstype: Optional[str] = None) -> Tuple[bool, str, str]:
+        """
+        Mount a device through UDisks2
+
+        Uses the persistent D-Bus client when available and falls back to
+        udisksctl when the system bus cannot be reached.
+
+        Returns:
+            Tuple[bool, str, str]: (success, mount path, error message)
+        """
+        if self.udisks is not None:
+            call = [UDISKS_DBUS_TOOL, "mount", f"/dev/{drive_name}"]
+            if options:
+                call.extend(["-o", options])
+            if fstype:
+                call.extend(["-t", fstype])
+            start = time.monotonic()
+            try:
+                mount_path = self.udisks.mount(drive_name, options, fstype)
+                get_command_runner().record(call, start, 0, stdout=mount_path)
+                return True, mount_path, ""
+            except UDisksUnavailableError as e:
+                print(f"[UDISKS] D-Bus unavailable, falling back to udisksctl: {e}")
+            except UDisksError as e:
+                get_command_runner().record(call, start, 1, stderr=str(e))
+                return False, "", str(e)
+        
+        mount_cmd = ["udisksctl", "mount", "-b", f"/dev/{drive_name}"]
+        if options:
+            mount_cmd.extend(["-o", options])
+        if fstype:
+            mount_cmd.extend(["-t", fstype])
+        
+        try:
+            result = run_command(mount_cmd, timeout=None, share=False)
+        except FileNotFoundError as e:
+            return False, "", str(e)
+        
+        if result.returncode != 0:
+            return False, "", result.stderr or ""
+        
+        # Parse mount point from udisksctl output ("Mounted /dev/sdb1 at /media/x")
+        mount_path = ""
+        if "Mounted" in result.stdout:
+            parts = result.stdout.split(" at ")
+            if len(parts) > 1:
+                mount_path = parts[1].strip().rstrip('.')
+        return True, mount_path, ""
+    
+    def _udisks_unmount(self, drive_name: str) -> Tuple[bool, str]:
+        """
+        Unmount a device through UDisks2 (D-Bus with udisksctl fallback)
+
+        Returns:
+            Tuple[bool, str]: (success, error message)
+        """
+        if self.udisks is not None:
+            call = [UDISKS_DBUS_TOOL, "unmount", f"/dev/{drive_name}"]
+            start = time.monotonic()
+            try:
+                self.udisks.unmount(drive_name)
+                get_command_runner().record(call, start, 0)
+                return True, ""
+            except UDisksUnavailableError as e:
+                print(f"[UDISKS] D-Bus unavailable, falling back to udisksctl: {e}")
+            except UDisksError as e:
+                get_command_runner().record(call, start, 1, stderr=str(e))
+                return False, str(e)
+        
+        try:
+            result = run_command(
+                ["udisksctl", "unmount", "-b", f"/dev/{drive_name}"], timeout=None, share=False
+            )
+        except FileNotFoundError as e:
+            return False, str(e)
+        
+        if result.returncode != 0:
+            return False, result.stderr or ""
+        return True, ""
+    
+    def _record_mount(self, drive_name: str, mount_path: str, read_only: bool = False):
+        """Update cached drive info after a successful mount and notify listeners"""
+        if not mount_path:
+            return
+        
+        if read_only:
+            drive = self._update_drive(drive_name, mountpoint=mount_path + " (READ-ONLY)")
+            if drive:
+                self.notify_callbacks("mounted_readonly", drive)
+        else:
+            drive = self._update_drive(drive_name, mountpoint=mount_path)
+            if drive:
+                self.notify_callbacks("mounted", drive)
+    
+    @staticmethod
+    def _is_dirty_volume_error(error_message: str) -> bool:
+        """Check if a mount error indicates an unclean or hibernated NTFS volume"""
+        error_output = error_message.lower() if error_message else ""
+        return ("dirty" in error_output or "inconsistent" in error_output
+                or "hibernated" in error_output)
+    
     def mount_drive(self, drive_name: str, mount_point: str = None, options: str = "") -> bool:
         """
         Mount a drive with intelligent NTFS handling and fallback
@@ -672,30 +1405,13 @@ class DriveManager:
             return self._mount_ntfs_with_fallback(drive_name, mount_point, options)
         
         # For other filesystems, use standard mounting
-        try:
-            mount_cmd = ["udisksctl", "mount", "-b", device_path]
-            
-            if options:
-                mount_cmd.extend(["-o", options])
-                
-            result = subprocess.run(mount_cmd, capture_output=True, text=True, check=True)
-            
-            # Parse mount point from udisksctl output
-            if "Mounted" in result.stdout:
-                parts = result.stdout.split(" at ")
-                if len(parts) > 1:
-                    actual_mount_point = parts[1].strip().rstrip('.')
-                    
-                    if drive_name in self.drives:
-                        self.drives[drive_name].mountpoint = actual_mount_point
-                        self.notify_callbacks("mounted", self.drives[drive_name])
-            
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            print(f"Error mounting drive {drive_name}: {e}")
-            print(f"stderr: {e.stderr if hasattr(e, 'stderr') else 'N/A'}")
+        success, mount_path, error = self._udisks_mount(drive_name, options)
+        if not success:
+            print(f"Error mounting drive {drive_name}: {error}")
             return False
+        
+        self._record_mount(drive_name, mount_path)
+        return True
     
     def _mount_ntfs_with_fallback(self, drive_name: str, mount_point: str = None, 
                                     options: str = "") -> bool:
@@ -712,8 +1428,6 @@ class DriveManager:
         Returns:
             bool: True if mounted successfully (any mode)
         """
-        device_path = f"/dev/{drive_name}"
-        
         # Step 1: Detect available drivers
         if not hasattr(self, '_ntfs_driver'):
             self._ntfs_driver = self._detect_ntfs_driver()
@@ -721,6 +1435,19 @@ class DriveManager:
         driver = self._ntfs_driver
         print(f"[NTFS] Primary driver: {driver}")
         
+        # Step 1b: Prefer a tuned per-volume profile when no options were given
+        if not options:
+            profile = self._get_tuned_profile(drive_name)
+            if profile:
+                print(f"[NTFS] Using tuned profile for {drive_name}: {profile.driver} ({profile.options})")
+                success, mount_path, error = self._udisks_mount(drive_name, profile.options,
+                                                                fstype=udisks_fstype(profile.driver))
+                if success:
+                    print(f"[NTFS] Successfully mounted {drive_name} with tuned profile")
+                    self._record_mount(drive_name, mount_path)
+                    return True
+                print(f"[NTFS] Tuned profile failed ({error}), using defaults")
+        
         # Step 2: Get mount options (custom or defaults)
         if not options:
             options = self._get_ntfs_mount_options(driver)
@@ -728,49 +1455,28 @@ class DriveManager:
             print(f"[NTFS] Using custom mount options: {options}")
         
         # Step 3: Try primary driver
-        result = subprocess.run(
-            ["udisksctl", "mount", "-b", device_path, "-o", options],
-            capture_output=True, text=True
-        )
-        
-        if result.returncode == 0:
+        success, mount_path, error = self._udisks_mount(drive_name, options)
+        if success:
             print(f"[NTFS] Successfully mounted {drive_name} with {driver}")
-            if "Mounted" in result.stdout:
-                parts = result.stdout.split(" at ")
-                if len(parts) > 1:
-                    actual_mount_point = parts[1].strip().rstrip('.')
-                    if drive_name in self.drives:
-                        self.drives[drive_name].mountpoint = actual_mount_point
-                        self.notify_callbacks("mounted", self.drives[drive_name])
+            self._record_mount(drive_name, mount_path)
             return True
         
         # Step 4: Check for dirty volume
-        error_output = result.stderr.lower() if result.stderr else ""
-        if "dirty" in error_output or "inconsistent" in error_output or "hibernated" in error_output:
+        if self._is_dirty_volume_error(error):
             print(f"[NTFS] DIRTY VOLUME detected on {drive_name}")
-            print(f"[NTFS] Error: {result.stderr}")
+            print(f"[NTFS] Error: {error}")
             
             # Update health status
-            if drive_name in self.drives:
-                self.drives[drive_name].health_status = "Dirty"
-                self.notify_callbacks("dirty_volume", self.drives[drive_name])
+            drive = self._update_drive(drive_name, health_status=Health.DIRTY)
+            if drive:
+                self.notify_callbacks("dirty_volume", drive)
             
             # Try read-only mount for data recovery
             print(f"[NTFS] Attempting read-only mount for data recovery...")
-            result = subprocess.run(
-                ["udisksctl", "mount", "-b", device_path, "-o", "ro,nofail"],
-                capture_output=True, text=True
-            )
-            
-            if result.returncode == 0:
+            success, mount_path, error = self._udisks_mount(drive_name, "ro,nofail")
+            if success:
                 print(f"[NTFS] Mounted {drive_name} in READ-ONLY mode")
-                if "Mounted" in result.stdout:
-                    parts = result.stdout.split(" at ")
-                    if len(parts) > 1:
-                        actual_mount_point = parts[1].strip().rstrip('.')
-                        if drive_name in self.drives:
-                            self.drives[drive_name].mountpoint = actual_mount_point + " (READ-ONLY)"
-                            self.notify_callbacks("mounted_readonly", self.drives[drive_name])
+                self._record_mount(drive_name, mount_path, read_only=True)
                 return True
             
             return False
@@ -788,77 +1494,47 @@ class DriveManager:
         
         for fallback_driver in fallback_drivers:
             # Check if fallback is available
-            if fallback_driver == "ntfs3":
-                check_cmd = ["modprobe", "-l", "ntfs3"]
-            else:
-                check_cmd = ["which", fallback_driver]
-            
-            if subprocess.run(check_cmd, capture_output=True).returncode != 0:
+            if not self._is_ntfs_driver_available(fallback_driver):
                 print(f"[NTFS] Fallback {fallback_driver} not available, skipping")
                 continue
             
             print(f"[NTFS] Trying fallback driver: {fallback_driver}")
             fallback_options = self._get_ntfs_mount_options(fallback_driver)
             
-            result = subprocess.run(
-                ["udisksctl", "mount", "-b", device_path, "-o", fallback_options],
-                capture_output=True, text=True
-            )
-            
-            if result.returncode == 0:
+            success, mount_path, error = self._udisks_mount(drive_name, fallback_options,
+                                                            fstype=udisks_fstype(fallback_driver))
+            if success:
                 print(f"[NTFS] Successfully mounted with fallback driver: {fallback_driver}")
-                if "Mounted" in result.stdout:
-                    parts = result.stdout.split(" at ")
-                    if len(parts) > 1:
-                        actual_mount_point = parts[1].strip().rstrip('.')
-                        if drive_name in self.drives:
-                            self.drives[drive_name].mountpoint = actual_mount_point
-                            self.notify_callbacks("mounted", self.drives[drive_name])
+                self._record_mount(drive_name, mount_path)
                 return True
         
         # Step 6: Last resort - try read-only mount
         print(f"[NTFS] All drivers failed for {drive_name}, trying read-only mount")
-        result = subprocess.run(
-            ["udisksctl", "mount", "-b", device_path, "-o", "ro,nofail"],
-            capture_output=True, text=True
-        )
-        
-        if result.returncode == 0:
+        success, mount_path, error = self._udisks_mount(drive_name, "ro,nofail")
+        if success:
             print(f"[NTFS] Mounted {drive_name} in READ-ONLY mode (last resort)")
-            if "Mounted" in result.stdout:
-                parts = result.stdout.split(" at ")
-                if len(parts) > 1:
-                    actual_mount_point = parts[1].strip().rstrip('.')
-                    if drive_name in self.drives:
-                        self.drives[drive_name].mountpoint = actual_mount_point + " (READ-ONLY)"
-                        self.notify_callbacks("mounted_readonly", self.drives[drive_name])
+            self._record_mount(drive_name, mount_path, read_only=True)
             return True
         
         # Complete failure
         print(f"[NTFS] Failed to mount {drive_name} with any method")
-        print(f"[NTFS] Last error: {result.stderr}")
+        print(f"[NTFS] Last error: {error}")
         return False
     
     def unmount_drive(self, drive_name: str) -> bool:
-        """Unmount a drive using udisksctl for better PolicyKit integration"""
-        try:
-            device_path = f"/dev/{drive_name}"
-            
-            # Use udisksctl for unmounting (works with PolicyKit)
-            result = subprocess.run(["udisksctl", "unmount", "-b", device_path], 
-                                 capture_output=True, text=True, check=True)
-            
-            # Update drive info
-            if drive_name in self.drives:
-                self.drives[drive_name].mountpoint = ""
-                self.notify_callbacks("unmounted", self.drives[drive_name])
-                
-            return True
-            
-        except subprocess.CalledProcessError as e:
-            print(f"Error unmounting drive {drive_name}: {e}")
-            print(f"stderr: {e.stderr if hasattr(e, 'stderr') else 'N/A'}")
+        """Unmount a drive through UDisks2 for better PolicyKit integration"""
+        success, error = self._udisks_unmount(drive_name)
+        if not success:
+            print(f"Error unmounting drive {drive_name}: {error}")
             return False
+        
+        # Update drive info
+        drive = self._update_drive(drive_name, mountpoint="")
+        if drive:
+            self.notify_callbacks("unmounted", drive)
+            
+        return True
+    
     
     def format_drive(self, drive_name: str, fstype: str, label: str = "") -> bool:
         """Format a drive (DANGEROUS OPERATION)"""
@@ -890,7 +1566,7 @@ class DriveManager:
                 print(f"Unsupported filesystem type: {fstype}")
                 return False
                 
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            result = run_command(cmd, check=True, timeout=None, share=False)
             
             # Refresh drive information
             self.get_all_drives()
@@ -910,9 +1586,8 @@ class DriveManager:
                 # Fallback to basic repair
                 return self._basic_repair(drive_name)
                 
-            result = subprocess.run(
-                [script_path, "repair", drive_name],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                [script_path, "repair", drive_name], check=True, timeout=None, share=False
             )
             
             # Refresh drive information
@@ -932,10 +1607,10 @@ class DriveManager:
             
             if fstype == "ntfs":
                 # NTFS repair using ntfsfix
-                subprocess.run(["ntfsfix", "-d", device_path], capture_output=True, text=True, check=True)
+                run_command(["ntfsfix", "-d", device_path], check=True, timeout=None, share=False)
             elif fstype.startswith("ext"):
                 # EXT filesystem repair
-                subprocess.run(["e2fsck", "-y", device_path], capture_output=True, text=True, check=True)
+                run_command(["e2fsck", "-y", device_path], check=True, timeout=None, share=False)
             else:
                 print(f"No basic repair available for filesystem: {fstype}")
                 return False
@@ -975,9 +1650,8 @@ class DriveManager:
         try:
             if drive.fstype == "ntfs":
                 # Get NTFS-specific information
-                result = subprocess.run(
-                    ["ntfsinfo", device_path],
-                    capture_output=True, text=True, check=True
+                result = run_command(
+                    ["ntfsinfo", device_path], check=True
                 )
                 
                 # Parse NTFS info
@@ -1034,27 +1708,7 @@ class DriveManager:
                     # Wait a moment for system to settle
                     time.sleep(0.5)
                     
-                    # Get current drives
-                    old_drives = set(self.drives.keys())
-                    new_drive_list = self.get_all_drives()
-                    new_drives = set(self.drives.keys())
-                    
-                    # Check for new drives
-                    for drive_name in new_drives - old_drives:
-                        if drive_name in self.drives:
-                            self.notify_callbacks("added", self.drives[drive_name])
-                    
-                    # Check for removed drives
-                    for drive_name in old_drives - new_drives:
-                        # Create temporary DriveInfo for removed drive
-                        removed_drive = DriveInfo(
-                            name=drive_name,
-                            size="",
-                            fstype="",
-                            mountpoint="",
-                            label=""
-                        )
-                        self.notify_callbacks("removed", removed_drive)
+                    self.refresh_drives()
                         
         except Exception as e:
             print(f"Error in udev monitoring: {e}")
@@ -1063,20 +1717,11 @@ class DriveManager:
                 process.terminate()
     
     def refresh_drives(self) -> List[DriveInfo]:
-        """Refresh the drive list"""
-        old_drives = set(self.drives.keys())
-        new_drives = self.get_all_drives()
-        new_drive_names = set(drive.name for drive in new_drives)
-        
-        # Check for new drives
-        for drive_name in new_drive_names - old_drives:
-            if drive_name in self.drives:
-                self.notify_callbacks("added", self.drives[drive_name])
-                
-        # Check for removed drives
-        for drive_name in old_drives - new_drive_names:
-            if drive_name in self.drives:
-                self.notify_callbacks("removed", self.drives[drive_name])
-                del self.drives[drive_name]
-                
-        return new_drives
+        """Refresh the drive list, reporting drives that appeared or disappeared"""
+        drives, added, removed = self._refresh_table()
+        for drive in added:
+            self.notify_callbacks("added", drive)
+        # Removed drives are reported with their last known details
+        for drive in removed:
+            self.notify_callbacks("removed", drive)
+        return drives
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Drive Snapshot Module
+Persists the last reconciled drive inventory so the GUI can paint it at startup
+"""
+
+import json
+import os
+import time
+from typing import List, Optional
+from dataclasses import asdict, fields
+from pathlib import Path
+
+from drive_manager import DriveInfo
+
+DRIVE_SNAPSHOT_PATH = Path.home() / ".cache/ntfs-manager/drives.json"
+SNAPSHOT_VERSION = 1
+
+
+def drive_identity(drive: DriveInfo) -> str:
+    """Stable key for a drive across reboots: filesystem UUID, then serial, then name"""
+    if drive.uuid:
+        return f"uuid:{drive.uuid}"
+    if drive.serial:
+        return f"serial:{drive.serial}:{drive.name}"
+    return f"name:{drive.name}"
+
+
+def save_drive_snapshot(drives: List[DriveInfo], path: Path = DRIVE_SNAPSHOT_PATH) -> bool:
+    """
+    Write the drive inventory, keyed by identity, preserving display order
+
+    Args:
+        drives: Drives from the last completed enumeration
+        path: Snapshot file
+
+    Returns:
+        bool: True if the snapshot was written
+    """
+    path = Path(path)
+    entries = {}
+    for drive in drives:
+        entries[drive_identity(drive)] = asdict(drive)
+
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "saved_at": time.time(),
+        "drives": entries,
+    }
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[SNAPSHOT] Error saving drive snapshot to {path}: {e}")
+        return False
+    return True
+
+
+def load_drive_snapshot(path: Path = DRIVE_SNAPSHOT_PATH) -> Optional[List[DriveInfo]]:
+    """
+    Read the last saved drive inventory
+
+    Unknown fields are ignored so snapshots survive DriveInfo changes.
+
+    Returns:
+        List[DriveInfo] in saved order, or None if there is no usable snapshot
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"[SNAPSHOT] Error loading drive snapshot from {path}: {e}")
+        return None
+
+    if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+        return None
+
+    known_fields = {field.name for field in fields(DriveInfo)}
+    drives = []
+    for entry in data.get("drives", {}).values():
+        if not isinstance(entry, dict) or not entry.get("name"):
+            continue
+        try:
+            drives.append(DriveInfo(**{key: value for key, value in entry.items()
+                                       if key in known_fields}))
+        except TypeError:
+            continue
+    return drives
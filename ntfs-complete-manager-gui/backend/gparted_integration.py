@@ -12,6 +12,9 @@ from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+from tool_registry import get_tool_registry
+from command_runner import run_command
+
 @dataclass
 class PartitionInfo:
     """Data class for partition information"""
@@ -47,14 +50,7 @@ class GPartedManager:
         
     def _find_gparted(self) -> str:
         """Find GParted executable"""
-        try:
-            result = subprocess.run(
-                ["which", "gparted"],
-                capture_output=True, text=True, check=True
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError:
-            return ""
+        return get_tool_registry().which("gparted")
     
     def is_available(self) -> bool:
         """Check if GParted is available"""
@@ -67,9 +63,8 @@ class GPartedManager:
         
         try:
             # Get list of devices
-            result = subprocess.run(
-                [self.gparted_path, "--list", "--json"],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                [self.gparted_path, "--list", "--json"], check=True
             )
             
             if result.returncode != 0:
@@ -167,9 +162,8 @@ class GPartedManager:
             partition_name = f"{device}{partition_num}"
             
             # Try to get mount point from system
-            result = subprocess.run(
-                ["findmnt", "-n", "-o", "TARGET", "-S", partition_name],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                ["findmnt", "-n", "-o", "TARGET", "-S", partition_name], check=True
             )
             
             if result.returncode == 0:
@@ -202,7 +196,7 @@ class GPartedManager:
             if label:
                 cmd.extend(["--label", label])
             
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            result = run_command(cmd, check=True, timeout=None, share=False)
             return result.returncode == 0
             
         except subprocess.CalledProcessError:
@@ -214,9 +208,9 @@ class GPartedManager:
             return False
         
         try:
-            result = subprocess.run(
-                [self.gparted_path, "rm", f"{device}{partition_num}"],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                [self.gparted_path, "rm", f"{device}{partition_num}"], check=True,
+                timeout=None, share=False
             )
             return result.returncode == 0
             
@@ -233,7 +227,7 @@ class GPartedManager:
             if label:
                 cmd.extend(["--label", label])
             
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            result = run_command(cmd, check=True, timeout=None, share=False)
             return result.returncode == 0
             
         except subprocess.CalledProcessError:
@@ -245,9 +239,9 @@ class GPartedManager:
             return False
         
         try:
-            result = subprocess.run(
-                [self.gparted_path, "resize", f"{device}{partition_num}", new_size],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                [self.gparted_path, "resize", f"{device}{partition_num}", new_size], check=True,
+                timeout=None, share=False
             )
             return result.returncode == 0
             
@@ -260,9 +254,9 @@ class GPartedManager:
             return False
         
         try:
-            result = subprocess.run(
-                [self.gparted_path, "set", f"{device}{partition_num}", flag, "on"],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                [self.gparted_path, "set", f"{device}{partition_num}", flag, "on"], check=True,
+                timeout=None, share=False
             )
             return result.returncode == 0
             
@@ -275,9 +269,8 @@ class GPartedManager:
             return None
         
         try:
-            result = subprocess.run(
-                [self.gparted_path, "info", f"{device}{partition_num}"],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                [self.gparted_path, "info", f"{device}{partition_num}"], check=True
             )
             
             if result.returncode != 0:
@@ -315,9 +308,8 @@ class GPartedManager:
             return False
         
         try:
-            result = subprocess.run(
-                [self.gparted_path, device],
-                capture_output=True, text=True, check=True
+            result = run_command(
+                [self.gparted_path, device], check=True, timeout=None, share=False
             )
             return result.returncode == 0
             
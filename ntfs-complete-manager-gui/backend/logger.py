@@ -9,6 +9,7 @@ import logging.handlers
 import os
 import sys
 import json
+import threading
 import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
@@ -21,15 +22,48 @@ class NTFSLogger:
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
-        # Create loggers for different purposes
-        self.main_logger = self._create_logger("main", "main.log")
-        self.operation_logger = self._create_logger("operations", "operations.log")
-        self.error_logger = self._create_logger("errors", "errors.log")
-        self.security_logger = self._create_logger("security", "security.log")
-        self.audit_logger = self._create_logger("audit", "audit.log")
-        
-        # JSON structured logger for machine parsing
-        self.json_logger = self._create_json_logger("json", "structured.json")
+        # Loggers for different purposes are created on first use (see properties below)
+        self._loggers = {}
+        self._loggers_lock = threading.Lock()
+    
+    def _get_logger(self, logger_name: str, filename: str, json_format: bool = False) -> logging.Logger:
+        """Create a configured logger on first use"""
+        logger = self._loggers.get(logger_name)
+        if logger is None:
+            with self._loggers_lock:
+                logger = self._loggers.get(logger_name)
+                if logger is None:
+                    if json_format:
+                        logger = self._create_json_logger(logger_name, filename)
+                    else:
+                        logger = self._create_logger(logger_name, filename)
+                    self._loggers[logger_name] = logger
+        return logger
+    
+    @property
+    def main_logger(self) -> logging.Logger:
+        return self._get_logger("main", "main.log")
+    
+    @property
+    def operation_logger(self) -> logging.Logger:
+        return self._get_logger("operations", "operations.log")
+    
+    @property
+    def error_logger(self) -> logging.Logger:
+        return self._get_logger("errors", "errors.log")
+    
+    @property
+    def security_logger(self) -> logging.Logger:
+        return self._get_logger("security", "security.log")
+    
+    @property
+    def audit_logger(self) -> logging.Logger:
+        return self._get_logger("audit", "audit.log")
+    
+    @property
+    def json_logger(self) -> logging.Logger:
+        """JSON structured logger for machine parsing"""
+        return self._get_logger("json", "structured.json", json_format=True)
         
     def _create_logger(self, logger_name: str, filename: str) -> logging.Logger:
         """Create a configured logger"""
@@ -43,7 +77,8 @@ class NTFSLogger:
         file_handler = logging.handlers.RotatingFileHandler(
             self.log_dir / filename,
             maxBytes=10*1024*1024,  # 10MB
-            backupCount=5
+            backupCount=5,
+            delay=True  # Open the file on the first record, not at startup
         )
         file_handler.setLevel(logging.DEBUG)
         
@@ -79,7 +114,8 @@ class NTFSLogger:
         file_handler = logging.handlers.RotatingFileHandler(
             self.log_dir / filename,
             maxBytes=10*1024*1024,  # 10MB
-            backupCount=5
+            backupCount=5,
+            delay=True  # Open the file on the first record, not at startup
         )
         file_handler.setLevel(logging.DEBUG)
         
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Mount Index Module
+Maps file paths to the drive mounted at their longest matching mount point
+"""
+
+import os
+from typing import Iterable, List, Optional
+
+
+class _Node:
+    """One path component in the mount point trie"""
+    __slots__ = ("children", "drive")
+
+    def __init__(self):
+        self.children = {}  # {component: _Node}
+        self.drive = None
+
+
+def _components(path: str) -> List[str]:
+    """Split an absolute path into components ('/mnt/data/' -> ['mnt', 'data'])"""
+    return [part for part in os.path.normpath(path).split(os.sep) if part]
+
+
+class MountIndex:
+    """
+    Path-component trie over the mount points of a set of drives
+
+    Built once per drive cache refresh and never modified afterwards, so
+    lookups need no locking: a refresh builds a new index and swaps it in.
+    Matching is done on whole components, so '/mnt/data2/file' does not
+    match a drive mounted at '/mnt/data'.
+
+    The index also maps the st_dev of each mounted filesystem to its drive,
+    so a caller that already has a file's device number can reject files
+    on unrelated filesystems with a single dict lookup. known_devices holds
+    the st_dev of every mounted drive, whatever its type, so the caller can
+    also tell a device the index has never seen (a mount newer than the
+    index) from one it deliberately left out.
+    """
+
+    def __init__(self, drives: Iterable = (), device_fstypes: Optional[Iterable[str]] = None):
+        """
+        Args:
+            drives: DriveInfo objects (anything with name, fstype and mountpoint)
+            device_fstypes: Filesystem types to include in the st_dev map (None for all)
+        """
+        self._root = _Node()
+        self.by_name = {}  # {drive name: drive}
+        self.devices = {}  # {st_dev of the mounted filesystem: drive}
+        self.known_devices = set()  # st_dev of every mounted drive
+        device_fstypes = set(device_fstypes) if device_fstypes is not None else None
+        for drive in drives:
+            self.by_name[drive.name] = drive
+            if not drive.mountpoint:
+                continue
+            self._insert(drive.mountpoint, drive)
+            st_dev = self._mounted_device(drive.mountpoint)
+            if st_dev is None:
+                continue
+            self.known_devices.add(st_dev)
+            if device_fstypes is None or drive.fstype in device_fstypes:
+                self.devices[st_dev] = drive
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+    def _insert(self, mountpoint: str, drive):
+        node = self._root
+        for part in _components(mountpoint):
+            node = node.children.setdefault(part, _Node())
+        node.drive = drive
+
+    @staticmethod
+    def _mounted_device(mountpoint: str) -> Optional[int]:
+        """st_dev of the filesystem at mountpoint, None if nothing is mounted there"""
+        mountpoint = os.path.normpath(mountpoint)
+        try:
+            st_dev = os.stat(mountpoint).st_dev
+            # A stale mount point directory reports its parent's device
+            if mountpoint != os.sep and os.stat(os.path.dirname(mountpoint)).st_dev == st_dev:
+                return None
+        except OSError:
+            return None
+        return st_dev
+
+    def lookup(self, path: str):
+        """
+        Drive whose mount point is the longest prefix of path
+
+        Cost is proportional to the depth of path, not the number of drives.
+
+        Returns:
+            The matching drive, or None
+        """
+        if not path or not path.startswith(os.sep):
+            return None
+
+        node = self._root
+        match = node.drive
+        for part in _components(path):
+            node = node.children.get(part)
+            if node is None:
+                break
+            if node.drive is not None:
+                match = node.drive
+        return match
+
+    def lookup_device(self, st_dev: int):
+        """Drive whose mounted filesystem has this st_dev, or None"""
+        return self.devices.get(st_dev)
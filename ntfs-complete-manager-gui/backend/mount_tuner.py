@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Mount Option Tuner Module
+Benchmarks candidate NTFS driver/option sets per volume and remembers the winner
+"""
+
+import json
+import os
+import sys
+import time
+import datetime
+import tempfile
+from typing import List, Dict, Optional, Any
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+
+PROFILE_STORE_PATH = Path.home() / ".config/ntfs-manager/mount-profiles.json"
+
+# Filesystem type UDisks2 is asked for to mount with each driver. UDisks2
+# only accepts well-known types, and mounts 'ntfs' through mount.ntfs
+# (ntfs-3g); it has no way to select lowntfs-3g, so that driver is not tuned.
+UDISKS_FSTYPES = {
+    'ntfs3': 'ntfs3',
+    'ntfs-3g': 'ntfs',
+}
+
+# Candidate option sets per driver. The first entry of each list matches the
+# driver's default from mount-options.conf so the baseline is always measured.
+# UDisks2 refuses options missing from its allowlist for the filesystem type
+# (ntfs3_allow / ntfs_allow plus the generic allow= in mount_options.conf),
+# so candidates stick to those.
+CANDIDATE_OPTIONS = {
+    'ntfs3': [
+        'prealloc,windows_names,nocase',
+        'prealloc,noatime,windows_names,nocase',
+        'noatime,windows_names,nocase',
+    ],
+    'ntfs-3g': [
+        'noexec,windows_names',
+        'noexec,big_writes,windows_names',
+        'noexec,big_writes,noatime,windows_names',
+    ],
+}
+
+BENCHMARK_CHUNK_SIZE = 1024 * 1024
+
+
+def udisks_fstype(driver: str) -> Optional[str]:
+    """Filesystem type to ask UDisks2 for to mount with a driver (None if it can't select it)"""
+    return UDISKS_FSTYPES.get(driver)
+
+
+@dataclass
+class BenchmarkResult:
+    """Micro-benchmark result for one driver/option candidate"""
+    driver: str
+    options: str
+    write_mb_s: float = 0.0
+    read_mb_s: float = 0.0
+    metadata_ops_s: float = 0.0
+    error: str = ""
+
+    @property
+    def score(self) -> float:
+        """Geometric mean of the three throughput figures (0 on failure)"""
+        if self.error or min(self.write_mb_s, self.read_mb_s, self.metadata_ops_s) <= 0:
+            return 0.0
+        return (self.write_mb_s * self.read_mb_s * self.metadata_ops_s) ** (1.0 / 3.0)
+
+
+@dataclass
+class MountProfile:
+    """Winning mount profile for a filesystem UUID"""
+    uuid: str
+    driver: str
+    options: str
+    score: float = 0.0
+    tuned_at: str = ""
+    results: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class MountProfileStore:
+    """JSON-backed store of tuned mount profiles keyed by filesystem UUID"""
+
+    def __init__(self, path: Path = PROFILE_STORE_PATH):
+        self.path = Path(path)
+        self._profiles = None
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._profiles is None:
+            self._profiles = {}
+            if self.path.exists():
+                try:
+                    with open(self.path, 'r') as f:
+                        self._profiles = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"[TUNER] Error loading mount profiles from {self.path}: {e}")
+        return self._profiles
+
+    def get(self, uuid: str) -> Optional[MountProfile]:
+        """Get the tuned profile for a filesystem UUID, if any"""
+        if not uuid:
+            return None
+        data = self._load().get(uuid)
+        if not data:
+            return None
+        try:
+            return MountProfile(**data)
+        except TypeError:
+            return None
+
+    def save(self, profile: MountProfile):
+        """Persist a tuned profile, replacing any earlier one for the same UUID"""
+        profiles = self._load()
+        profiles[profile.uuid] = asdict(profile)
+        self._write(profiles)
+
+    def remove(self, uuid: str) -> bool:
+        """Forget the tuned profile for a UUID"""
+        profiles = self._load()
+        if uuid not in profiles:
+            return False
+        del profiles[uuid]
+        self._write(profiles)
+        return True
+
+    def _write(self, profiles: Dict[str, Dict[str, Any]]):
+        """Replace the store file atomically, so an interrupted write leaves the old one"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(profiles, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def run_micro_benchmark(directory: str, size_mb: int = 64, file_count: int = 200) -> Dict[str, float]:
+    """
+    Run a short read/write/metadata benchmark inside a directory
+
+    Args:
+        directory: Writable directory on the mounted volume
+        size_mb: Size of the sequential write/read test file
+        file_count: Number of small files for the metadata test
+
+    Returns:
+        Dict with write_mb_s, read_mb_s and metadata_ops_s
+    """
+    work_dir = tempfile.mkdtemp(prefix=".ntfs-manager-tune-", dir=directory)
+    data_file = os.path.join(work_dir, "seq.bin")
+    chunk = os.urandom(BENCHMARK_CHUNK_SIZE)
+
+    try:
+        # Sequential write, flushed to the device
+        start = time.perf_counter()
+        fd = os.open(data_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            for _ in range(size_mb):
+                os.write(fd, chunk)
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        write_time = time.perf_counter() - start
+
+        # Sequential read, asking the kernel to drop cached pages first
+        fd = os.open(data_file, os.O_RDONLY)
+        try:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            start = time.perf_counter()
+            while os.read(fd, BENCHMARK_CHUNK_SIZE):
+                pass
+            read_time = time.perf_counter() - start
+        finally:
+            os.close(fd)
+
+        # Metadata: create, stat and delete many small files
+        start = time.perf_counter()
+        for index in range(file_count):
+            path = os.path.join(work_dir, f"meta-{index}.txt")
+            with open(path, 'w') as f:
+                f.write("x")
+        for index in range(file_count):
+            os.stat(os.path.join(work_dir, f"meta-{index}.txt"))
+        for index in range(file_count):
+            os.unlink(os.path.join(work_dir, f"meta-{index}.txt"))
+        metadata_time = time.perf_counter() - start
+    finally:
+        try:
+            if os.path.exists(data_file):
+                os.unlink(data_file)
+            for name in os.listdir(work_dir):
+                os.unlink(os.path.join(work_dir, name))
+            os.rmdir(work_dir)
+        except OSError:
+            pass
+
+    return {
+        "write_mb_s": size_mb / write_time if write_time > 0 else 0.0,
+        "read_mb_s": size_mb / read_time if read_time > 0 else 0.0,
+        "metadata_ops_s": (file_count * 3) / metadata_time if metadata_time > 0 else 0.0,
+    }
+
+
+class MountOptionTuner:
+    """Mounts a volume under candidate option sets and picks the fastest"""
+
+    def __init__(self, drive_manager, store: Optional[MountProfileStore] = None):
+        self.drive_manager = drive_manager
+        self.store = store or drive_manager.mount_profiles
+
+    def get_candidates(self, drivers: Optional[List[str]] = None) -> List[tuple]:
+        """List (driver, options) candidates for the available drivers"""
+        candidates = []
+        for driver in drivers or list(CANDIDATE_OPTIONS.keys()):
+            if driver not in CANDIDATE_OPTIONS:
+                if driver == 'lowntfs-3g':
+                    print(f"[TUNER] UDisks2 cannot mount with {driver}, skipping")
+                else:
+                    print(f"[TUNER] Unknown driver {driver}, skipping")
+                continue
+            if not self.drive_manager._is_ntfs_driver_available(driver):
+                print(f"[TUNER] Driver {driver} not available, skipping")
+                continue
+            for options in CANDIDATE_OPTIONS[driver]:
+                candidates.append((driver, options))
+        return candidates
+
+    def _benchmark_candidate(self, drive_name: str, driver: str, options: str,
+                             size_mb: int, file_count: int) -> BenchmarkResult:
+        """Mount with one candidate, benchmark it and unmount again"""
+        result = BenchmarkResult(driver=driver, options=options)
+
+        success, mount_path, error = self.drive_manager._udisks_mount(drive_name, options,
+                                                                      fstype=udisks_fstype(driver))
+        if not success or not mount_path:
+            result.error = error or "mount path unknown"
+            return result
+
+        try:
+            figures = run_micro_benchmark(mount_path, size_mb, file_count)
+            result.write_mb_s = round(figures["write_mb_s"], 2)
+            result.read_mb_s = round(figures["read_mb_s"], 2)
+            result.metadata_ops_s = round(figures["metadata_ops_s"], 2)
+        except OSError as e:
+            result.error = str(e)
+        finally:
+            unmounted, error = self.drive_manager._udisks_unmount(drive_name)
+            if not unmounted:
+                print(f"[TUNER] Failed to unmount {drive_name} after benchmark: {error}")
+                if not result.error:
+                    result.error = f"unmount failed: {error}"
+
+        return result
+
+    def tune(self, drive_name: str, drivers: Optional[List[str]] = None,
+             size_mb: int = 64, file_count: int = 200) -> Optional[MountProfile]:
+        """
+        Benchmark every candidate on an unmounted NTFS volume and persist the winner
+
+        Args:
+            drive_name: Device name (e.g., 'sdb1')
+            drivers: Optional subset of drivers to compare
+            size_mb: Sequential test file size in MiB
+            file_count: Number of files for the metadata test
+
+        Returns:
+            MountProfile: The winning profile, or None if nothing could be measured
+        """
+        device_path = f"/dev/{drive_name}"
+        if self.drive_manager._get_filesystem_type(device_path) != "ntfs":
+            print(f"[TUNER] {drive_name} is not an NTFS volume")
+            return None
+
+        if self.drive_manager._get_mount_point(device_path):
+            print(f"[TUNER] {drive_name} is mounted; unmount it before tuning")
+            return None
+
+        uuid = self.drive_manager._get_filesystem_uuid(drive_name)
+        if not uuid:
+            print(f"[TUNER] Cannot determine filesystem UUID for {drive_name}")
+            return None
+
+        results = []
+        for driver, options in self.get_candidates(drivers):
+            print(f"[TUNER] Benchmarking {drive_name} with {driver} ({options})")
+            result = self._benchmark_candidate(drive_name, driver, options, size_mb, file_count)
+            if result.error:
+                print(f"[TUNER]   failed: {result.error}")
+            else:
+                print(f"[TUNER]   write {result.write_mb_s} MB/s, read {result.read_mb_s} MB/s, "
+                      f"metadata {result.metadata_ops_s} ops/s")
+            results.append(result)
+
+        measured = [result for result in results if result.score > 0]
+        if not measured:
+            print(f"[TUNER] No candidate could be measured on {drive_name}")
+            return None
+
+        best = max(measured, key=lambda result: result.score)
+        profile = MountProfile(
+            uuid=uuid,
+            driver=best.driver,
+            options=best.options,
+            score=round(best.score, 2),
+            tuned_at=datetime.datetime.now().isoformat(),
+            results=[dict(asdict(result), score=round(result.score, 2)) for result in results]
+        )
+        self.store.save(profile)
+        print(f"[TUNER] Saved profile for {uuid}: {profile.driver} ({profile.options})")
+        return profile
+
+
+def main():
+    """Command line entry point: tune mount options for one device"""
+    import argparse
+    from drive_manager import DriveManager
+
+    parser = argparse.ArgumentParser(description="Tune NTFS mount options for a volume")
+    parser.add_argument("device", help="Device name, e.g. sdb1")
+    parser.add_argument("--drivers", default="", help="Comma-separated drivers to compare")
+    parser.add_argument("--size-mb", type=int, default=64, help="Sequential test size in MiB")
+    parser.add_argument("--files", type=int, default=200, help="Files for the metadata test")
+    args = parser.parse_args()
+
+    drivers = [driver.strip() for driver in args.drivers.split(",") if driver.strip()] or None
+    manager = DriveManager()
+    profile = manager.tune_mount_options(os.path.basename(args.device), drivers,
+                                         args.size_mb, args.files)
+    if profile is None:
+        sys.exit(1)
+    print(json.dumps(asdict(profile), indent=2))
+
+
+if __name__ == "__main__":
+    main()
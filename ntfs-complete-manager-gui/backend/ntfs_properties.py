@@ -4,15 +4,47 @@ NTFS Properties Module
 Provides Windows-style NTFS drive properties and information
 """
 
+import asyncio
 import subprocess
 import re
 import os
 import json
 import datetime
-from typing import Dict, Any, Optional, List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Iterable, Tuple
 from pathlib import Path
 from dataclasses import dataclass
 
+from proc_scanner import get_mount_points
+from command_runner import get_command_runner, TIMEOUT_RETURNCODE
+
+# Per-probe timeout; ntfsfix and smartctl can stall on slow USB bridges
+PROBE_TIMEOUT = 15.0
+
+SECTIONS = ("volume", "security", "health", "device", "performance")
+
+# How long a computed section may be reused, in seconds
+SECTION_TTLS = {
+    "volume": 30.0,
+    "security": 300.0,
+    "health": 120.0,
+    "device": 3600.0,
+    "performance": 3600.0,
+}
+
+# Probes whose failures are reported with each section
+SECTION_PROBES = {
+    "volume": ("ntfsinfo", "df", "findmnt"),
+    "security": ("stat", "getfacl", "lsblk_fstype"),
+    "health": ("ntfsfix", "smartctl"),
+    "device": ("lsblk_device",),
+    "performance": (),
+}
+
+DISK_CHECKS = ("filesystem", "smart")
+
 @dataclass
 class NTFSVolumeInfo:
     """NTFS volume information structure"""
@@ -62,6 +94,19 @@ class NTFSHealthInfo:
         if self.volume_errors is None:
             self.volume_errors = []
 
+@dataclass
+class ProbeResult:
+    """Output of one external probe"""
+    name: str
+    returncode: int = -1
+    stdout: str = ""
+    stderr: str = ""
+    error: str = ""
+    
+    @property
+    def ok(self) -> bool:
+        return not self.error and self.returncode == 0
+
 class NTFSProperties:
     """Main NTFS properties class"""
     
@@ -71,14 +116,193 @@ class NTFSProperties:
         self.volume_info = NTFSVolumeInfo()
         self.security_info = NTFSSecurityInfo()
         self.health_info = NTFSHealthInfo()
+        self.probe_errors = {}
+        self._sections = {}  # {section: (timestamp, invalidation key, value)}
+        self._lock = threading.Lock()
         
     def get_all_properties(self) -> Dict[str, Any]:
-        """Get comprehensive NTFS properties"""
-        properties = {}
+        """Get comprehensive NTFS properties (blocking wrapper around get_all_properties_async)"""
+        return self.get_sections(SECTIONS)
+    
+    async def get_all_properties_async(self, timeout: float = PROBE_TIMEOUT) -> Dict[str, Any]:
+        """
+        Get comprehensive NTFS properties, running the probes concurrently
+        
+        Every external tool is started at once and given its own timeout.
+        A probe that fails or times out leaves its fields at their defaults;
+        the reason is reported under "probe_errors".
+        
+        Args:
+            timeout: Per-probe timeout in seconds
+            
+        Returns:
+            Dict[str, Any]: Properties grouped by section
+        """
+        return await self.get_sections_async(SECTIONS, timeout)
+    
+    def get_sections(self, sections: Iterable[str], timeout: float = PROBE_TIMEOUT) -> Dict[str, Any]:
+        """Get only the requested sections (blocking wrapper around get_sections_async)"""
+        with self._lock:
+            return self._run_sync(self.get_sections_async(sections, timeout))
+    
+    async def get_sections_async(self, sections: Iterable[str],
+                                 timeout: float = PROBE_TIMEOUT) -> Dict[str, Any]:
+        """
+        Get the requested property sections, computing each on first access
+        
+        A computed section is reused until its TTL (SECTION_TTLS) expires or
+        its invalidation key changes, e.g. the volume section is recomputed
+        as soon as the device is mounted somewhere else. Missing sections are
+        collected concurrently.
+        
+        Args:
+            sections: Section names from SECTIONS
+            timeout: Per-probe timeout in seconds
+            
+        Returns:
+            Dict[str, Any]: The requested sections, plus "probe_errors" if any
+            probe behind them failed
+        """
+        names = list(dict.fromkeys(sections))
+        unknown = [name for name in names if name not in SECTIONS]
+        if unknown:
+            raise ValueError(f"Unknown property section(s): {', '.join(unknown)}")
+        
+        now = time.monotonic()
+        keys = {name: self._section_key(name) for name in names}
+        stale = []
+        for name in names:
+            entry = self._sections.get(name)
+            if entry is None or now - entry[0] >= SECTION_TTLS[name] or entry[1] != keys[name]:
+                stale.append(name)
+        
+        if stale:
+            for name in stale:
+                for probe_name in SECTION_PROBES[name]:
+                    self.probe_errors.pop(probe_name, None)
+            collectors = [getattr(self, f"_collect_{name}_info")(timeout) for name in stale]
+            values = await asyncio.gather(*collectors)
+            now = time.monotonic()
+            for name, value in zip(stale, values):
+                self._sections[name] = (now, keys[name], value)
+        
+        properties = {name: self._sections[name][2] for name in names}
+        errors = {probe_name: self.probe_errors[probe_name]
+                  for name in names for probe_name in SECTION_PROBES[name]
+                  if probe_name in self.probe_errors}
+        if errors:
+            properties["probe_errors"] = errors
+        
+        return properties
+    
+    def invalidate(self, *sections: str):
+        """Drop memoized sections so the next access recomputes them (all if none given)"""
+        for name in sections or SECTIONS:
+            self._sections.pop(name, None)
+    
+    def _section_key(self, section: str) -> Tuple:
+        """
+        Cheap fingerprint of the device state a section depends on
+        
+        Volume and health data change with the mount state, device data with
+        the block device itself, security data with the device node's owner
+        and mode. Performance has no key and only expires by TTL.
+        """
+        if section == "performance":
+            return ()
+        
+        try:
+            device_stat = os.stat(self.device_path)
+        except OSError:
+            return (None,)
+        
+        if section == "security":
+            return (device_stat.st_uid, device_stat.st_gid, device_stat.st_mode)
+        
+        size = ""
+        try:
+            with open(f"/sys/class/block/{self.device_name}/size", 'r') as f:
+                size = f.read().strip()
+        except OSError:
+            pass
+        
+        if section == "device":
+            return (device_stat.st_rdev, size)
+        
+        # volume and health
+        return (device_stat.st_rdev, size, tuple(get_mount_points(self.device_path)))
+    
+    @staticmethod
+    def _run_sync(coroutine):
+        """Run a coroutine to completion from synchronous code"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        
+        # Called from inside a running event loop: use a private loop in a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    async def _run_probe(self, name: str, args: List[str], timeout: float) -> ProbeResult:
+        """Run one external tool, recording failures in probe_errors"""
+        probe = ProbeResult(name=name)
+        runner = get_command_runner()
+        if runner.corpus_mode is not None:
+            return await self._run_probe_via_runner(probe, args, timeout)
+        
+        start = time.monotonic()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except OSError as e:
+            probe.error = f"{args[0]} not available: {e.strerror or e}"
+            self.probe_errors[name] = probe.error
+            return probe
+        
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            probe.error = f"{args[0]} timed out after {timeout:g}s"
+            self.probe_errors[name] = probe.error
+            runner.record(args, start, TIMEOUT_RETURNCODE, timed_out=True)
+            return probe
+        
+        runner.record(args, start, process.returncode, len(stdout) + len(stderr))
+        probe.returncode = process.returncode
+        probe.stdout = stdout.decode("utf-8", errors="replace")
+        probe.stderr = stderr.decode("utf-8", errors="replace")
+        return probe
+    
+    async def _run_probe_via_runner(self, probe: ProbeResult, args: List[str], timeout: float) -> ProbeResult:
+        """_run_probe through the command runner, so a command corpus records or answers it"""
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                None, lambda: get_command_runner().run(args, timeout=timeout))
+        except OSError as e:
+            probe.error = f"{args[0]} not available: {e.strerror or e}"
+            self.probe_errors[probe.name] = probe.error
+            return probe
+        
+        if result.returncode == TIMEOUT_RETURNCODE:
+            probe.error = f"{args[0]} timed out after {timeout:g}s"
+            self.probe_errors[probe.name] = probe.error
+            return probe
         
-        # Volume information
-        self._get_volume_info()
-        properties["volume"] = {
+        probe.returncode = result.returncode
+        probe.stdout = result.stdout
+        probe.stderr = result.stderr
+        return probe
+    
+    def _volume_section(self) -> Dict[str, Any]:
+        return {
             "name": self.volume_info.volume_name,
             "serial": self.volume_info.volume_serial,
             "filesystem": self.volume_info.filesystem_type,
@@ -97,20 +321,18 @@ class NTFSProperties:
             "last_write_time": self.volume_info.last_write_time,
             "last_access_time": self.volume_info.last_access_time
         }
-        
-        # Security information
-        self._get_security_info()
-        properties["security"] = {
+    
+    def _security_section(self) -> Dict[str, Any]:
+        return {
             "owner": self.security_info.owner,
             "group": self.security_info.group,
             "permissions": self.security_info.permissions,
             "acl_entries": self.security_info.acl_entries,
             "encryption_status": self.security_info.encryption_status
         }
-        
-        # Health information
-        self._get_health_info()
-        properties["health"] = {
+    
+    def _health_section(self) -> Dict[str, Any]:
+        return {
             "dirty_bit": self.health_info.dirty_bit,
             "needs_check": self.health_info.needs_check,
             "volume_errors": self.health_info.volume_errors,
@@ -120,83 +342,66 @@ class NTFSProperties:
             "pending_sectors": self.health_info.pending_sectors,
             "power_on_hours": self.health_info.power_on_hours
         }
-        
-        # Device information
-        properties["device"] = self._get_device_info()
-        
-        # Performance metrics
-        properties["performance"] = self._get_performance_metrics()
-        
-        return properties
     
-    def _get_volume_info(self):
+    async def _collect_volume_info(self, timeout: float) -> Dict[str, Any]:
         """Get NTFS volume information"""
-        try:
-            # Use ntfsinfo for detailed NTFS information
-            result = subprocess.run(
-                ["ntfsinfo", self.device_path],
-                capture_output=True, text=True, check=True
-            )
-            
-            for line in result.stdout.splitlines():
-                line = line.strip()
-                
-                if "Volume Name" in line:
-                    self.volume_info.volume_name = line.split(":", 1)[1].strip()
-                elif "Volume Serial Number" in line:
-                    self.volume_info.volume_serial = line.split(":", 1)[1].strip()
-                elif "Cluster Size" in line:
-                    cluster_str = line.split(":", 1)[1].strip()
-                    self.volume_info.cluster_size = self._parse_size(cluster_str)
-                elif "Volume Size" in line:
-                    size_str = line.split(":", 1)[1].strip()
-                    self.volume_info.total_size = self._parse_size(size_str)
-                elif "Free Space" in line:
-                    free_str = line.split(":", 1)[1].strip()
-                    self.volume_info.free_space = self._parse_size(free_str)
-                    
-        except subprocess.CalledProcessError:
-            # Fallback to df for basic information
-            self._get_basic_volume_info()
+        self.volume_info = NTFSVolumeInfo()
+        
+        # ntfsinfo has the detail; df is only used when ntfsinfo fails, but is
+        # started alongside it so the fallback costs no extra wall time
+        ntfsinfo, df, findmnt = await asyncio.gather(
+            self._run_probe("ntfsinfo", ["ntfsinfo", self.device_path], timeout),
+            self._run_probe("df", ["df", "-B", "1", self.device_path], timeout),
+            self._run_probe("findmnt", ["findmnt", "-n", "-o", "TARGET", "-S", self.device_path], timeout)
+        )
+        
+        if ntfsinfo.ok:
+            self._parse_ntfsinfo(ntfsinfo.stdout)
+        elif df.ok:
+            self._parse_df(df.stdout)
         
         # Calculate derived values
         if self.volume_info.total_size > 0:
             self.volume_info.used_space = self.volume_info.total_size - self.volume_info.free_space
         
         # Get mount point for additional information
-        mount_point = self._get_mount_point()
+        mount_point = findmnt.stdout.strip() if findmnt.ok else ""
         if mount_point:
             self._get_mount_point_info(mount_point)
+        
+        return self._volume_section()
     
-    def _get_basic_volume_info(self):
-        """Get basic volume information using df"""
-        try:
-            result = subprocess.run(
-                ["df", "-B", "1", self.device_path],
-                capture_output=True, text=True, check=True
-            )
+    def _parse_ntfsinfo(self, output: str):
+        """Parse ntfsinfo output into volume_info"""
+        for line in output.splitlines():
+            line = line.strip()
             
-            lines = result.stdout.strip().split('\n')
-            if len(lines) >= 2:
-                parts = lines[1].split()
-                if len(parts) >= 4:
+            if "Volume Name" in line:
+                self.volume_info.volume_name = line.split(":", 1)[1].strip()
+            elif "Volume Serial Number" in line:
+                self.volume_info.volume_serial = line.split(":", 1)[1].strip()
+            elif "Cluster Size" in line:
+                cluster_str = line.split(":", 1)[1].strip()
+                self.volume_info.cluster_size = self._parse_size(cluster_str)
+            elif "Volume Size" in line:
+                size_str = line.split(":", 1)[1].strip()
+                self.volume_info.total_size = self._parse_size(size_str)
+            elif "Free Space" in line:
+                free_str = line.split(":", 1)[1].strip()
+                self.volume_info.free_space = self._parse_size(free_str)
+    
+    def _parse_df(self, output: str):
+        """Parse 'df -B 1' output into volume_info"""
+        lines = output.strip().split('\n')
+        if len(lines) >= 2:
+            parts = lines[1].split()
+            if len(parts) >= 4:
+                try:
                     self.volume_info.total_size = int(parts[1])
                     self.volume_info.used_space = int(parts[2])
                     self.volume_info.free_space = int(parts[3])
-                    
-        except subprocess.CalledProcessError:
-            pass
-    
-    def _get_mount_point(self) -> str:
-        """Get mount point for the device"""
-        try:
-            result = subprocess.run(
-                ["findmnt", "-n", "-o", "TARGET", "-S", self.device_path],
-                capture_output=True, text=True, check=True
-            )
-            return result.stdout.strip()
-        except subprocess.CalledProcessError:
-            return ""
+                except ValueError:
+                    pass
     
     def _get_mount_point_info(self, mount_point: str):
         """Get information from mount point"""
@@ -221,38 +426,35 @@ class NTFSProperties:
         except OSError:
             pass
     
-    def _get_security_info(self):
+    async def _collect_security_info(self, timeout: float) -> Dict[str, Any]:
         """Get NTFS security information"""
-        try:
-            # Get ownership information
-            result = subprocess.run(
-                ["stat", "-c", "%U:%G:%a", self.device_path],
-                capture_output=True, text=True, check=True
-            )
-            
-            parts = result.stdout.strip().split(":")
+        self.security_info = NTFSSecurityInfo()
+        
+        ownership, acl, fstype = await asyncio.gather(
+            self._run_probe("stat", ["stat", "-c", "%U:%G:%a", self.device_path], timeout),
+            self._run_probe("getfacl", ["getfacl", self.device_path], timeout),
+            self._run_probe("lsblk_fstype", ["lsblk", "-o", "FSTYPE", "-n", self.device_path], timeout)
+        )
+        
+        # Ownership information
+        if ownership.ok:
+            parts = ownership.stdout.strip().split(":")
             if len(parts) >= 3:
                 self.security_info.owner = parts[0]
                 self.security_info.group = parts[1]
                 self.security_info.permissions = parts[2]
-                
-        except subprocess.CalledProcessError:
-            pass
         
-        # Get ACL information if available
-        try:
-            result = subprocess.run(
-                ["getfacl", self.device_path],
-                capture_output=True, text=True, check=True
-            )
-            
-            self._parse_acl_output(result.stdout)
-            
-        except subprocess.CalledProcessError:
-            pass
+        # ACL information if available
+        if acl.ok:
+            self._parse_acl_output(acl.stdout)
         
-        # Check encryption status
-        self._check_encryption_status()
+        # Encryption status (BitLocker or other encryption)
+        if fstype.ok:
+            self._parse_encryption_status(fstype.stdout)
+        else:
+            self.security_info.encryption_status = "Unknown"
+        
+        return self._security_section()
     
     def _parse_acl_output(self, acl_output: str):
         """Parse ACL output"""
@@ -270,76 +472,60 @@ class NTFSProperties:
                     }
                     self.security_info.acl_entries.append(entry)
     
-    def _check_encryption_status(self):
-        """Check if volume is encrypted"""
-        try:
-            # Check for BitLocker or other encryption
-            result = subprocess.run(
-                ["lsblk", "-o", "FSTYPE", "-n", self.device_path],
-                capture_output=True, text=True, check=True
-            )
-            
-            fstype = result.stdout.strip()
-            if "crypto" in fstype.lower() or "bitlocker" in fstype.lower():
-                self.security_info.encryption_status = "Encrypted"
-            else:
-                self.security_info.encryption_status = "Not Encrypted"
-                
-        except subprocess.CalledProcessError:
-            self.security_info.encryption_status = "Unknown"
+    def _parse_encryption_status(self, fstype_output: str):
+        """Derive encryption status from the lsblk FSTYPE column"""
+        fstype = fstype_output.strip()
+        if "crypto" in fstype.lower() or "bitlocker" in fstype.lower():
+            self.security_info.encryption_status = "Encrypted"
+        else:
+            self.security_info.encryption_status = "Not Encrypted"
     
-    def _get_health_info(self):
+    async def _collect_health_info(self, timeout: float) -> Dict[str, Any]:
         """Get NTFS health information"""
-        try:
-            # Check dirty bit and filesystem health
-            result = subprocess.run(
-                ["ntfsfix", "-n", self.device_path],
-                capture_output=True, text=True
-            )
-            
-            if "Dirty" in result.stderr:
+        self.health_info = NTFSHealthInfo()
+        
+        ntfsfix, smartctl = await asyncio.gather(
+            self._run_probe("ntfsfix", ["ntfsfix", "-n", self.device_path], timeout),
+            self._run_probe("smartctl", ["smartctl", "-A", "-H", self.device_path], timeout)
+        )
+        
+        # Dirty bit and filesystem health
+        if not ntfsfix.error:
+            if "Dirty" in ntfsfix.stderr:
                 self.health_info.dirty_bit = True
                 self.health_info.needs_check = True
             
-            if result.returncode != 0:
+            if ntfsfix.returncode != 0:
                 self.health_info.volume_errors.append("Filesystem check failed")
-                
-        except subprocess.CalledProcessError:
-            pass
         
-        # Get SMART data
-        self._get_smart_data()
+        # SMART data
+        if smartctl.ok:
+            self._parse_smart_data(smartctl.stdout)
+        else:
+            self.health_info.smart_status = "Unknown"
+        
+        return self._health_section()
     
-    def _get_smart_data(self):
-        """Get SMART health data"""
-        try:
-            result = subprocess.run(
-                ["smartctl", "-A", "-H", self.device_path],
-                capture_output=True, text=True, check=True
-            )
+    def _parse_smart_data(self, output: str):
+        """Parse 'smartctl -A -H' output into health_info"""
+        for line in output.splitlines():
+            line = line.strip()
             
-            # Parse SMART status
-            for line in result.stdout.splitlines():
-                line = line.strip()
-                
-                if "SMART overall-health self-assessment test result:" in line:
-                    if "PASSED" in line:
-                        self.health_info.smart_status = "PASSED"
-                    else:
-                        self.health_info.smart_status = "FAILED"
-                
-                # Parse specific SMART attributes
-                if "Reallocated_Sector_Ct" in line:
-                    self.health_info.reallocated_sectors = self._extract_smart_value(line)
-                elif "Pending_Sector_Ct" in line:
-                    self.health_info.pending_sectors = self._extract_smart_value(line)
-                elif "Power_On_Hours" in line:
-                    self.health_info.power_on_hours = self._extract_smart_value(line)
-                elif "Reallocated_Event_Count" in line:
-                    self.health_info.bad_sectors = self._extract_smart_value(line)
-                    
-        except subprocess.CalledProcessError:
-            self.health_info.smart_status = "Unknown"
+            if "SMART overall-health self-assessment test result:" in line:
+                if "PASSED" in line:
+                    self.health_info.smart_status = "PASSED"
+                else:
+                    self.health_info.smart_status = "FAILED"
+            
+            # Parse specific SMART attributes
+            if "Reallocated_Sector_Ct" in line:
+                self.health_info.reallocated_sectors = self._extract_smart_value(line)
+            elif "Pending_Sector_Ct" in line:
+                self.health_info.pending_sectors = self._extract_smart_value(line)
+            elif "Power_On_Hours" in line:
+                self.health_info.power_on_hours = self._extract_smart_value(line)
+            elif "Reallocated_Event_Count" in line:
+                self.health_info.bad_sectors = self._extract_smart_value(line)
     
     def _extract_smart_value(self, line: str) -> int:
         """Extract numeric value from SMART attribute line"""
@@ -351,30 +537,16 @@ class NTFSProperties:
             pass
         return 0
     
-    def _get_device_info(self) -> Dict[str, Any]:
+    async def _collect_device_info(self, timeout: float) -> Dict[str, Any]:
         """Get device information"""
-        device_info = {}
-        
-        try:
-            # Get device model and serial
-            result = subprocess.run(
-                ["lsblk", "-d", "-o", "MODEL,SERIAL,VENDOR,SIZE,ROTA,RM", "-n", self.device_path],
-                capture_output=True, text=True, check=True
-            )
-            
-            parts = result.stdout.strip().split()
-            if len(parts) >= 5:
-                device_info = {
-                    "model": parts[0] if parts[0] else "Unknown",
-                    "serial": parts[1] if parts[1] else "Unknown",
-                    "vendor": parts[2] if parts[2] else "Unknown",
-                    "size": parts[3] if parts[3] else "Unknown",
-                    "rotational": parts[4] == "1",
-                    "removable": parts[5] == "1" if len(parts) > 5 else False
-                }
-                
-        except subprocess.CalledProcessError:
-            device_info = {
+        # Get device model and serial
+        lsblk = await self._run_probe(
+            "lsblk_device",
+            ["lsblk", "-d", "-o", "MODEL,SERIAL,VENDOR,SIZE,ROTA,RM", "-n", self.device_path],
+            timeout
+        )
+        if not lsblk.ok:
+            return {
                 "model": "Unknown",
                 "serial": "Unknown",
                 "vendor": "Unknown",
@@ -382,9 +554,26 @@ class NTFSProperties:
                 "rotational": False,
                 "removable": False
             }
-        
+        return self._parse_device_info(lsblk.stdout)
+    
+    def _parse_device_info(self, output: str) -> Dict[str, Any]:
+        """Parse lsblk MODEL,SERIAL,VENDOR,SIZE,ROTA,RM output"""
+        device_info = {}
+        parts = output.strip().split()
+        if len(parts) >= 5:
+            device_info = {
+                "model": parts[0] if parts[0] else "Unknown",
+                "serial": parts[1] if parts[1] else "Unknown",
+                "vendor": parts[2] if parts[2] else "Unknown",
+                "size": parts[3] if parts[3] else "Unknown",
+                "rotational": parts[4] == "1",
+                "removable": parts[5] == "1" if len(parts) > 5 else False
+            }
         return device_info
     
+    async def _collect_performance_info(self, timeout: float) -> Dict[str, Any]:
+        return self._get_performance_metrics()
+    
     def _get_performance_metrics(self) -> Dict[str, Any]:
         """Get performance metrics"""
         metrics = {
@@ -434,57 +623,74 @@ class NTFSProperties:
         
         return f"{bytes_value:.2f} {units[unit_index]}"
     
-    def run_disk_check(self) -> Dict[str, Any]:
-        """Run comprehensive disk check"""
+    def run_disk_check(self, checks: Iterable[str] = DISK_CHECKS,
+                       timeout: float = PROBE_TIMEOUT) -> Dict[str, Any]:
+        """
+        Run comprehensive disk check
+        
+        Args:
+            checks: Subset of DISK_CHECKS to run (all by default)
+            timeout: Per-check timeout in seconds
+        """
+        with self._lock:
+            return self._run_sync(self.run_disk_check_async(checks, timeout))
+    
+    async def run_disk_check_async(self, checks: Iterable[str] = DISK_CHECKS,
+                                   timeout: float = PROBE_TIMEOUT) -> Dict[str, Any]:
+        """Run the requested disk checks concurrently"""
+        names = list(dict.fromkeys(checks))
+        unknown = [name for name in names if name not in DISK_CHECKS]
+        if unknown:
+            raise ValueError(f"Unknown disk check(s): {', '.join(unknown)}")
+        
         check_results = {
             "timestamp": datetime.datetime.now().isoformat(),
             "checks": {},
             "overall_status": "Unknown"
         }
         
-        # Filesystem check
-        try:
-            result = subprocess.run(
-                ["ntfsfix", "-n", self.device_path],
-                capture_output=True, text=True
-            )
-            
-            check_results["checks"]["filesystem"] = {
-                "status": "Passed" if result.returncode == 0 else "Failed",
-                "dirty_bit": "Dirty" in result.stderr,
-                "errors": result.stderr.strip() if result.stderr else ""
-            }
-        except subprocess.CalledProcessError as e:
-            check_results["checks"]["filesystem"] = {
-                "status": "Error",
-                "error": str(e)
-            }
+        commands = {
+            "filesystem": ["ntfsfix", "-n", self.device_path],
+            "smart": ["smartctl", "-H", self.device_path],
+        }
+        probes = await asyncio.gather(*[
+            self._run_probe(f"check_{name}", commands[name], timeout) for name in names
+        ])
         
-        # SMART check
-        try:
-            result = subprocess.run(
-                ["smartctl", "-H", self.device_path],
-                capture_output=True, text=True, check=True
-            )
-            
-            smart_status = "Unknown"
-            for line in result.stdout.splitlines():
-                if "SMART overall-health self-assessment test result:" in line:
-                    if "PASSED" in line:
-                        smart_status = "Passed"
-                    else:
-                        smart_status = "Failed"
-                    break
-            
-            check_results["checks"]["smart"] = {
-                "status": smart_status,
-                "details": result.stdout.strip()
-            }
-        except subprocess.CalledProcessError as e:
-            check_results["checks"]["smart"] = {
-                "status": "Error",
-                "error": str(e)
-            }
+        for name, probe in zip(names, probes):
+            if probe.error:
+                check_results["checks"][name] = {
+                    "status": "Error",
+                    "error": probe.error
+                }
+            elif name == "filesystem":
+                check_results["checks"]["filesystem"] = {
+                    "status": "Passed" if probe.returncode == 0 else "Failed",
+                    "dirty_bit": "Dirty" in probe.stderr,
+                    "errors": probe.stderr.strip() if probe.stderr else ""
+                }
+            elif probe.returncode != 0:
+                check_results["checks"]["smart"] = {
+                    "status": "Error",
+                    "error": f"Command '{' '.join(commands[name])}' returned non-zero exit status {probe.returncode}."
+                }
+            else:
+                smart_status = "Unknown"
+                for line in probe.stdout.splitlines():
+                    if "SMART overall-health self-assessment test result:" in line:
+                        if "PASSED" in line:
+                            smart_status = "Passed"
+                        else:
+                            smart_status = "Failed"
+                        break
+                
+                check_results["checks"]["smart"] = {
+                    "status": smart_status,
+                    "details": probe.stdout.strip()
+                }
+        
+        # A fresh check supersedes any memoized health data
+        self.invalidate("health")
         
         # Determine overall status
         all_passed = all(
@@ -498,7 +704,7 @@ class NTFSProperties:
     
     def get_windows_style_properties(self) -> str:
         """Get properties formatted like Windows Explorer"""
-        properties = self.get_all_properties()
+        properties = self.get_sections(("volume", "device", "health"))
         
         output = []
         output.append(f"Volume: {properties['volume']['name'] or 'Local Disk'}")
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Properties Cache Module
+Bounded LRU cache for expensive per-drive property lookups
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+from dataclasses import dataclass, asdict
+from pathlib import Path
+
+CACHE_DIR = Path.home() / ".cache/ntfs-manager"
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_TTL = 300.0
+SAVE_DELAY = 5.0
+SNAPSHOT_VERSION = 2
+
+
+def default_snapshot_path(name: str) -> Path:
+    """Snapshot file for one cache user (e.g. 'gui' or 'nautilus')"""
+    return CACHE_DIR / f"properties-{name}.json"
+
+
+def persistent_generation(generation: Optional[str]) -> Optional[str]:
+    """
+    Part of a generation that still means the same after a restart
+
+    Generations look like '<event counter>:<uuid>:<mount point>' (see
+    DriveManager.get_generation). The counter starts over in every process,
+    so only what follows the first ':' is saved and compared across runs.
+    """
+    if generation is None:
+        return None
+    return generation.partition(":")[2]
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness"""
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0  # misses caused by an expired entry or a generation change
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class PropertiesCache:
+    """
+    Thread-safe LRU cache keyed by device, validated by a generation key
+
+    Every entry stores the generation it was computed for (see
+    DriveManager.get_generation). A lookup with a different generation is
+    a miss and drops the entry, so mount, unmount and udev events
+    invalidate cached properties without the caller tracking them. Entries
+    also expire after a TTL as a safety net. Entries restored by load() only
+    know the persistent part of their generation; the first lookup that
+    matches it adopts the caller's full generation.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL,
+                 snapshot_path: Optional[Path] = None):
+        """
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl: Maximum entry age in seconds
+            snapshot_path: Optional JSON file for save()/load()
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.stats = CacheStats()
+        self._entries = OrderedDict()  # {key: (timestamp, generation, value, restored)}
+        self._lock = threading.Lock()
+        self._save_timer = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def get(self, key: str, generation: Optional[str] = None) -> Optional[Any]:
+        """
+        Look up an entry
+
+        Args:
+            key: Cache key (usually the device path)
+            generation: Current generation of the device; None skips the check
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            timestamp, entry_generation, value, restored = entry
+            if generation is None:
+                current = True
+            elif restored:
+                current = entry_generation == persistent_generation(generation)
+            else:
+                current = entry_generation == generation
+            if not current or time.time() - timestamp >= self.ttl:
+                del self._entries[key]
+                self.stats.misses += 1
+                self.stats.stale += 1
+                return None
+
+            if restored and generation is not None:
+                self._entries[key] = (timestamp, generation, value, False)
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def put(self, key: str, value: Any, generation: Optional[str] = None):
+        """Store an entry, evicting the least recently used ones beyond max_entries"""
+        with self._lock:
+            self._entries[key] = (time.time(), generation, value, False)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any],
+                       generation: Optional[str] = None) -> Any:
+        """Return the cached value or compute, store and return a fresh one"""
+        value = self.get(key, generation)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value, generation)
+        return value
+
+    def invalidate(self, key: str) -> bool:
+        """Drop one entry"""
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return False
+            self.stats.invalidations += 1
+            return True
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self.stats.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus current size, for logging"""
+        with self._lock:
+            stats = asdict(self.stats)
+            stats["hit_rate"] = round(self.stats.hit_rate, 3)
+            stats["entries"] = len(self._entries)
+            stats["max_entries"] = self.max_entries
+        return stats
+
+    def save(self) -> bool:
+        """
+        Write the unexpired entries to the snapshot file
+
+        Only JSON-serializable values are persisted; others are skipped.
+        Generations are saved without their per-process part.
+        """
+        if not self.snapshot_path:
+            return False
+
+        now = time.time()
+        with self._lock:
+            entries = [(key, timestamp, generation if restored else persistent_generation(generation), value)
+                       for key, (timestamp, generation, value, restored) in self._entries.items()
+                       if now - timestamp < self.ttl]
+
+        serializable = []
+        for key, timestamp, generation, value in entries:
+            try:
+                json.dumps(value)
+            except (TypeError, ValueError):
+                continue
+            serializable.append({"key": key, "timestamp": timestamp,
+                                 "generation": generation, "value": value})
+
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_path.with_suffix(".tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": SNAPSHOT_VERSION, "entries": serializable}, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            print(f"[CACHE] Error saving properties cache to {self.snapshot_path}: {e}")
+            return False
+        return True
+
+    def schedule_save(self, delay: float = SAVE_DELAY):
+        """Save once, delay seconds from now, however often this is called meanwhile"""
+        if not self.snapshot_path:
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(delay, self._scheduled_save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def _scheduled_save(self):
+        with self._lock:
+            self._save_timer = None
+        self.save()
+
+    def load(self) -> int:
+        """
+        Restore entries from the snapshot file
+
+        Expired entries are ignored; the rest keep their original timestamp
+        and persistent generation, so they are still validated on lookup.
+
+        Returns:
+            int: Number of entries restored
+        """
+        if not self.snapshot_path or not self.snapshot_path.exists():
+            return 0
+
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[CACHE] Error loading properties cache from {self.snapshot_path}: {e}")
+            return 0
+
+        # Version 1 snapshots saved per-process generations, which can't be trusted
+        if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+            return 0
+
+        now = time.time()
+        restored = 0
+        with self._lock:
+            for item in data.get("entries", []):
+                try:
+                    key = item["key"]
+                    timestamp = float(item["timestamp"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if now - timestamp >= self.ttl or key in self._entries:
+                    continue
+                self._entries[key] = (timestamp, item.get("generation"), item.get("value"), True)
+                restored += 1
+
+            # Oldest first, so the LRU order roughly matches the original
+            for key in sorted(self._entries, key=lambda k: self._entries[k][0]):
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return restored
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Startup Trace Module
+Import-time and phase-time breakdown for --trace-startup
+"""
+
+import builtins
+import importlib
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import List, Optional, Tuple
+
+# Time-to-first-paint the GUI aims to stay under, in seconds
+STARTUP_BUDGET = 0.5
+
+
+class StartupTrace:
+    """
+    Collects import and phase timings while enabled
+
+    Import times are inclusive (a module's time contains the modules it
+    imports) and recorded with their nesting depth, like 'python -X importtime'.
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        self.origin = origin if origin is not None else time.monotonic()
+        self.enabled = False
+        self.imports = []  # [(module, seconds, depth)]
+        self.phases = []  # [(phase, start offset, seconds)]
+        self._original_import = None
+        self._depth = 0
+        self._main_thread = threading.main_thread()
+
+    def enable(self):
+        """Start recording; imports are timed from here on"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def disable(self):
+        """Stop recording imports"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only time first-time, absolute imports made on the main thread
+        if level != 0 or name in sys.modules or threading.current_thread() is not self._main_thread:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        depth = self._depth
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            if name in sys.modules:
+                self.imports.append((name, time.perf_counter() - start, depth))
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of startup work"""
+        if not self.enabled:
+            yield
+            return
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.phases.append((name, start - self.origin, time.monotonic() - start))
+
+    def import_module(self, name: str):
+        """importlib.import_module, recorded like a regular import"""
+        if not self.enabled or name in sys.modules:
+            return importlib.import_module(name)
+        start = time.perf_counter()
+        try:
+            return importlib.import_module(name)
+        finally:
+            if name in sys.modules:
+                self.imports.append((name, time.perf_counter() - start, 0))
+
+    def top_imports(self, limit: int = 15) -> List[Tuple[str, float]]:
+        """Slowest top-level imports"""
+        top_level = [(name, seconds) for name, seconds, depth in self.imports if depth == 0]
+        return sorted(top_level, key=lambda item: item[1], reverse=True)[:limit]
+
+    def report(self, milestones: Optional[dict] = None, budget: float = STARTUP_BUDGET) -> str:
+        """Human-readable breakdown of imports, phases and milestones"""
+        lines = ["=== Startup trace ==="]
+
+        total_import = sum(seconds for _, seconds, depth in self.imports if depth == 0)
+        lines.append(f"Imports: {total_import * 1000:.1f} ms in {len(self.imports)} modules")
+        for name, seconds in self.top_imports():
+            lines.append(f"  {seconds * 1000:8.1f} ms  {name}")
+
+        lines.append("Phases:")
+        for name, offset, seconds in self.phases:
+            lines.append(f"  {seconds * 1000:8.1f} ms  {name} (at {offset * 1000:.1f} ms)")
+
+        if milestones:
+            lines.append("Milestones:")
+            for name, value in milestones.items():
+                if isinstance(value, float):
+                    lines.append(f"  {value * 1000:8.1f} ms  {name}")
+                else:
+                    lines.append(f"  {value:>8}     {name}")
+
+            first_paint = milestones.get("first_paint")
+            if isinstance(first_paint, float):
+                verdict = "within" if first_paint <= budget else "OVER"
+                lines.append(f"First paint {first_paint * 1000:.1f} ms, {verdict} budget of {budget * 1000:.0f} ms")
+
+        return "\n".join(lines)
+
+
+_trace = None
+
+
+def get_startup_trace(origin: Optional[float] = None) -> StartupTrace:
+    """Get the process-wide startup trace (disabled until enable() is called)"""
+    global _trace
+    if _trace is None:
+        _trace = StartupTrace(origin)
+    return _trace
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Tool Registry Module
+Resolves external tools by scanning PATH and caches what is known about them
+"""
+
+import os
+import stat
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from command_runner import run_command, TIMEOUT_RETURNCODE
+
+VERSION_TIMEOUT = 5.0
+
+
+@dataclass
+class ToolInfo:
+    """Cached facts about one external tool"""
+    name: str
+    path: str = ""
+    mtime: float = 0.0
+    version: Optional[str] = None  # None until probed
+    features: Dict[str, bool] = field(default_factory=dict)
+
+    @property
+    def available(self) -> bool:
+        return bool(self.path)
+
+
+class ToolRegistry:
+    """
+    Shared cache of tool paths, version strings and feature flags
+
+    Lookups scan PATH in-process instead of forking 'which'. A found tool
+    stays cached until its binary's mtime changes (or it disappears); a
+    missing tool stays cached until a PATH directory's mtime changes, which
+    is what installing a package does.
+    """
+
+    def __init__(self, search_path: Optional[str] = None):
+        """
+        Args:
+            search_path: PATH-style directory list; defaults to $PATH at lookup time
+        """
+        self.search_path = search_path
+        self._tools = {}  # {name: ToolInfo}
+        self._missing = {}  # {name: (PATH, directory mtimes) when last not found}
+        self._lock = threading.Lock()
+
+    def _directories(self) -> List[str]:
+        search_path = self.search_path if self.search_path is not None else os.environ.get("PATH", os.defpath)
+        return [directory for directory in search_path.split(os.pathsep) if directory]
+
+    @staticmethod
+    def _directory_mtimes(directories: List[str]) -> Tuple:
+        mtimes = []
+        for directory in directories:
+            try:
+                mtimes.append(os.stat(directory).st_mtime)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _scan(self, name: str, directories: List[str]) -> Tuple[str, float]:
+        """Find the first executable regular file called name on PATH"""
+        if os.sep in name:
+            candidates = [name]
+        else:
+            candidates = [os.path.join(directory, name) for directory in directories]
+
+        for candidate in candidates:
+            try:
+                file_stat = os.stat(candidate)
+            except OSError:
+                continue
+            if stat.S_ISREG(file_stat.st_mode) and os.access(candidate, os.X_OK):
+                return candidate, file_stat.st_mtime
+        return "", 0.0
+
+    def get(self, name: str) -> ToolInfo:
+        """Get the (possibly cached) ToolInfo for a tool"""
+        directories = self._directories()
+        with self._lock:
+            info = self._tools.get(name)
+            if info is not None:
+                try:
+                    if os.stat(info.path).st_mtime == info.mtime:
+                        return info
+                except OSError:
+                    pass
+                # Binary replaced or removed: forget version and features too
+                del self._tools[name]
+
+            missing_key = (tuple(directories), self._directory_mtimes(directories))
+            if self._missing.get(name) == missing_key:
+                return ToolInfo(name=name)
+
+            path, mtime = self._scan(name, directories)
+            if not path:
+                self._missing[name] = missing_key
+                return ToolInfo(name=name)
+
+            self._missing.pop(name, None)
+            info = ToolInfo(name=name, path=path, mtime=mtime)
+            self._tools[name] = info
+            return info
+
+    def which(self, name: str) -> str:
+        """Full path of a tool, or '' if it is not on PATH"""
+        return self.get(name).path
+
+    def is_available(self, name: str) -> bool:
+        """Check if a tool is on PATH"""
+        return self.get(name).available
+
+    def get_version(self, name: str, args: Tuple[str, ...] = ("--version",)) -> str:
+        """
+        First non-empty output line of '<tool> --version', probed once per binary
+
+        Returns:
+            str: Version line, or '' if the tool is missing or printed nothing
+        """
+        info = self.get(name)
+        if not info.available:
+            return ""
+        if info.version is not None:
+            return info.version
+
+        version = ""
+        try:
+            result = run_command([info.path, *args], timeout=VERSION_TIMEOUT)
+            # A hung tool has no version line, only the runner's timeout note
+            if result.returncode != TIMEOUT_RETURNCODE:
+                for line in (result.stdout + "\n" + result.stderr).splitlines():
+                    if line.strip():
+                        version = line.strip()
+                        break
+        except OSError:
+            pass
+
+        info.version = version
+        return version
+
+    def has_feature(self, name: str, feature: str, probe: Callable[[ToolInfo], bool]) -> bool:
+        """
+        Cached feature flag for a tool
+
+        Args:
+            name: Tool name
+            feature: Flag name, e.g. 'json-output'
+            probe: Called once per binary with its ToolInfo to compute the flag
+
+        Returns:
+            bool: False if the tool is missing or the probe fails
+        """
+        info = self.get(name)
+        if not info.available:
+            return False
+        if feature not in info.features:
+            try:
+                info.features[feature] = bool(probe(info))
+            except Exception:
+                info.features[feature] = False
+        return info.features[feature]
+
+    def invalidate(self, name: Optional[str] = None):
+        """Forget one tool, or everything"""
+        with self._lock:
+            if name is None:
+                self._tools.clear()
+                self._missing.clear()
+            else:
+                self._tools.pop(name, None)
+                self._missing.pop(name, None)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_tool_registry() -> ToolRegistry:
+    """Get the process-wide tool registry"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ToolRegistry()
+        return _registry
@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+UDisks2 D-Bus Client Module
+Talks to org.freedesktop.UDisks2 over a persistent D-Bus connection
+"""
+
+import threading
+from typing import Dict, Optional
+
+try:
+    from gi.repository import Gio, GLib
+    GIO_AVAILABLE = True
+except ImportError:
+    GIO_AVAILABLE = False
+
+UDISKS_BUS_NAME = "org.freedesktop.UDisks2"
+UDISKS_BLOCK_PATH = "/org/freedesktop/UDisks2/block_devices"
+FILESYSTEM_INTERFACE = "org.freedesktop.UDisks2.Filesystem"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+# Mount and unmount can wait on a polkit prompt, so allow plenty of time
+DEFAULT_CALL_TIMEOUT_MS = 120 * 1000
+
+
+class UDisksError(Exception):
+    """Structured error returned by a UDisks2 method call"""
+
+    def __init__(self, error_name: str, message: str):
+        super().__init__(message)
+        self.error_name = error_name
+        self.message = message
+
+    @property
+    def short_name(self) -> str:
+        """Last component of the D-Bus error name (e.g. 'AlreadyMounted')"""
+        return self.error_name.rsplit(".", 1)[-1] if self.error_name else ""
+
+    def __str__(self):
+        if self.error_name:
+            return f"{self.error_name}: {self.message}"
+        return self.message
+
+
+class UDisksUnavailableError(UDisksError):
+    """Raised when no connection to the UDisks2 service can be made"""
+
+    def __init__(self, message: str):
+        super().__init__("", message)
+
+
+def block_object_path(device_name: str) -> str:
+    """
+    Build the UDisks2 block device object path for a kernel device name
+
+    UDisks2 escapes every character outside [A-Za-z0-9] as '_xx' (hex),
+    so 'sda1' stays 'sda1' while 'mmcblk0p1' and 'nvme0n1p1' are unchanged
+    and 'dm-0' becomes 'dm_2d0'.
+    """
+    escaped = []
+    for char in device_name:
+        if char.isascii() and char.isalnum():
+            escaped.append(char)
+        else:
+            escaped.append(f"_{ord(char):02x}")
+    return f"{UDISKS_BLOCK_PATH}/{''.join(escaped)}"
+
+
+def _decode_bytestring(value) -> str:
+    """Decode a NUL-terminated 'ay' value as returned by UDisks2"""
+    return bytes(value).rstrip(b"\x00").decode("utf-8", errors="replace")
+
+
+class UDisksClient:
+    """Persistent UDisks2 client for Filesystem.Mount/Unmount calls"""
+
+    def __init__(self, bus_address: Optional[str] = None,
+                 timeout_ms: int = DEFAULT_CALL_TIMEOUT_MS):
+        """
+        Args:
+            bus_address: Optional D-Bus address; defaults to the system bus
+            timeout_ms: Per-call timeout in milliseconds
+        """
+        self.bus_address = bus_address
+        self.timeout_ms = timeout_ms
+        self._connection = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Check if the Gio D-Bus bindings are importable"""
+        return GIO_AVAILABLE
+
+    def _get_connection(self):
+        """Return the shared connection, (re)connecting if needed"""
+        if not GIO_AVAILABLE:
+            raise UDisksUnavailableError("Gio D-Bus bindings not available")
+
+        with self._lock:
+            if self._connection is not None and not self._connection.is_closed():
+                return self._connection
+
+            try:
+                if self.bus_address:
+                    self._connection = Gio.DBusConnection.new_for_address_sync(
+                        self.bus_address,
+                        Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT |
+                        Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION,
+                        None, None
+                    )
+                else:
+                    self._connection = Gio.bus_get_sync(Gio.BusType.SYSTEM, None)
+            except GLib.Error as e:
+                self._connection = None
+                raise UDisksUnavailableError(f"Cannot connect to D-Bus: {e.message}")
+
+            return self._connection
+
+    def close(self):
+        """Drop the shared connection"""
+        with self._lock:
+            if self._connection is not None and self.bus_address:
+                try:
+                    self._connection.close_sync(None)
+                except GLib.Error:
+                    pass
+            self._connection = None
+
+    def _call(self, object_path: str, interface: str, method: str,
+              parameters, reply_type: str):
+        """Invoke a UDisks2 method and unpack the reply"""
+        connection = self._get_connection()
+        try:
+            reply = connection.call_sync(
+                UDISKS_BUS_NAME, object_path, interface, method,
+                parameters, GLib.VariantType.new(reply_type),
+                Gio.DBusCallFlags.NONE, self.timeout_ms, None
+            )
+        except GLib.Error as e:
+            error_name = Gio.DBusError.get_remote_error(e) or ""
+            if error_name:
+                Gio.DBusError.strip_remote_error(e)
+            raise UDisksError(error_name, e.message)
+        return reply.unpack()
+
+    @staticmethod
+    def _options_variant(options: Dict[str, object]):
+        """Pack a dict of typed mount options into an a{sv} variant"""
+        packed = {}
+        for key, value in options.items():
+            if isinstance(value, bool):
+                packed[key] = GLib.Variant("b", value)
+            elif isinstance(value, int):
+                packed[key] = GLib.Variant("i", value)
+            else:
+                packed[key] = GLib.Variant("s", str(value))
+        return packed
+
+    def mount(self, device_name: str, options: str = "",
+              fstype: Optional[str] = None) -> str:
+        """
+        Mount a filesystem via Filesystem.Mount
+
+        Args:
+            device_name: Device name (e.g., 'sda1')
+            options: Comma-separated mount options
+            fstype: Optional filesystem type/driver to request
+
+        Returns:
+            str: Mount path chosen by UDisks2
+
+        Raises:
+            UDisksError: On any D-Bus or UDisks2 failure
+        """
+        mount_options = {}
+        if options:
+            mount_options["options"] = options
+        if fstype:
+            mount_options["fstype"] = fstype
+
+        parameters = GLib.Variant("(a{sv})", (self._options_variant(mount_options),))
+        (mount_path,) = self._call(
+            block_object_path(device_name), FILESYSTEM_INTERFACE,
+            "Mount", parameters, "(s)"
+        )
+        return mount_path
+
+    def unmount(self, device_name: str, force: bool = False):
+        """
+        Unmount a filesystem via Filesystem.Unmount
+
+        Raises:
+            UDisksError: On any D-Bus or UDisks2 failure
+        """
+        unmount_options = {"force": True} if force else {}
+        parameters = GLib.Variant("(a{sv})", (self._options_variant(unmount_options),))
+        self._call(
+            block_object_path(device_name), FILESYSTEM_INTERFACE,
+            "Unmount", parameters, "()"
+        )
+
+    def get_mount_points(self, device_name: str) -> list:
+        """Get current mount points of a filesystem from its MountPoints property"""
+        parameters = GLib.Variant("(ss)", (FILESYSTEM_INTERFACE, "MountPoints"))
+        (value,) = self._call(
+            block_object_path(device_name), PROPERTIES_INTERFACE,
+            "Get", parameters, "(v)"
+        )
+        return [_decode_bytestring(point) for point in value]
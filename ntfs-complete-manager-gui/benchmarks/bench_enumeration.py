@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Enumeration Benchmark
+Times DriveManager.get_all_drives() against synthetic systems of growing size
+
+    python benchmarks/bench_enumeration.py --devices 1,10,100,1000 --output bench.json
+    python benchmarks/bench_enumeration.py --baseline bench.json
+
+Results are JSON so two runs can be compared; --baseline does that and
+exits non-zero when a device count got slower by more than --tolerance
+or started running more commands.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_PATH = os.path.join(os.path.dirname(BENCHMARK_DIR), "backend")
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from command_runner import get_command_runner
+from drive_manager import DriveManager
+from synthetic_system import build_system
+
+RESULTS_VERSION = 1
+
+DEFAULT_DEVICES = (1, 10, 100, 1000)
+
+# Relative slowdown of the median refresh that --baseline reports as a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+@contextlib.contextmanager
+def _stub_path(system):
+    """Put the stub tools first on PATH for commands started meanwhile"""
+    original = os.environ.get("PATH", "")
+    os.environ["PATH"] = system.path_env(original)
+    try:
+        yield
+    finally:
+        os.environ["PATH"] = original
+
+
+def _refresh(manager: DriveManager):
+    runner = get_command_runner()
+    # Each run starts cold, as after a hotplug event
+    runner.invalidate()
+    runner.start_profile()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        drives = manager.get_all_drives()
+    elapsed = time.perf_counter() - start
+    return drives, elapsed, runner.stop_profile()
+
+
+def bench_devices(count: int, runs: int, latency: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Benchmark one synthetic system
+
+    Args:
+        count: Number of block devices
+        runs: Timed refreshes
+        latency: Seconds each stub tool sleeps, by tool name
+
+    Returns:
+        dict: Timings, command counts and memory of the refreshes
+    """
+    with tempfile.TemporaryDirectory(prefix="ntfs-bench-") as root:
+        system = build_system(root, count, latency)
+        with _stub_path(system):
+            manager = DriveManager(sys_root=system.sys_root)
+
+            tracemalloc.start()
+            drives, _, timings = _refresh(manager)
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            times = []
+            for _ in range(runs):
+                drives, elapsed, timings = _refresh(manager)
+                times.append(elapsed)
+
+    commands = [timing for timing in timings if timing.source in ("run", "probe")]
+    return {
+        "devices": count,
+        "drives_found": len(drives),
+        "runs": runs,
+        "refresh_ms": {
+            "min": min(times) * 1000,
+            "median": statistics.median(times) * 1000,
+            "max": max(times) * 1000,
+        },
+        "per_device_ms": statistics.median(times) * 1000 / count,
+        "subprocesses": len(commands),
+        "subprocesses_by_tool": dict(Counter(timing.tool for timing in commands).most_common()),
+        "reused_results": len(timings) - len(commands),
+        "memory": {
+            "peak_traced_kb": peak / 1024,
+            "retained_kb": current / 1024,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+    }
+
+
+def run_benchmark(device_counts, runs: int = 3, latency: Optional[Dict[str, float]] = None,
+                  progress=None) -> Dict[str, Any]:
+    """Benchmark every device count and collect the results into one document"""
+    results = []
+    for count in device_counts:
+        result = bench_devices(count, runs, latency)
+        results.append(result)
+        if progress:
+            progress(result)
+    return {
+        "version": RESULTS_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "latency": dict(latency or {}),
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Regressions of current against baseline, for device counts both contain
+
+    Returns:
+        list: One line per regression, empty if there are none
+    """
+    previous = {result["devices"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in current["results"]:
+        before = previous.get(result["devices"])
+        if before is None:
+            continue
+        old_ms, new_ms = before["refresh_ms"]["median"], result["refresh_ms"]["median"]
+        if new_ms > old_ms * (1 + tolerance):
+            regressions.append(f"{result['devices']} devices: median refresh {old_ms:.1f} ms -> {new_ms:.1f} ms")
+        if result["subprocesses"] > before["subprocesses"]:
+            regressions.append(f"{result['devices']} devices: {before['subprocesses']} -> "
+                               f"{result['subprocesses']} commands per refresh")
+    return regressions
+
+
+def _parse_latency(value: str) -> Dict[str, float]:
+    latency = {}
+    for item in filter(None, value.split(",")):
+        tool, _, seconds = item.partition("=")
+        latency[tool.strip()] = float(seconds)
+    return latency
+
+
+def _print_result(result: Dict[str, Any]):
+    print(f"{result['devices']:>6} devices  {result['refresh_ms']['median']:9.1f} ms median  "
+          f"{result['subprocesses']:>6} commands  {result['memory']['peak_traced_kb']:9.1f} KiB peak",
+          file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark drive enumeration on synthetic systems")
+    parser.add_argument("--devices", default=",".join(map(str, DEFAULT_DEVICES)),
+                        help="Comma-separated device counts (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=3, help="Timed refreshes per device count")
+    parser.add_argument("--latency", default="",
+                        help="Stub tool latency in seconds, e.g. smartctl=0.05,ntfsinfo=0.1")
+    parser.add_argument("--output", help="Write the results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="Results JSON of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed relative slowdown against --baseline (default: %(default)s)")
+    args = parser.parse_args()
+
+    device_counts = [int(count) for count in args.devices.split(",") if count]
+    results = run_benchmark(device_counts, args.runs, _parse_latency(args.latency), _print_result)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
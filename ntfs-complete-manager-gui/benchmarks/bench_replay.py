@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Replay Benchmark
+Records real tool outputs into a corpus, then benchmarks parsers and refreshes against it
+
+    # on a machine with the drives of interest attached
+    python benchmarks/bench_replay.py record --output corpus.json
+    # anywhere, no disks needed
+    python benchmarks/bench_replay.py replay corpus.json --output replay.json
+
+'record' captures a drive refresh plus NTFS properties of every NTFS
+volume (and the GParted device list when GParted is installed). Mount
+errors come from 'main.py --record-commands FILE', which records a whole
+GUI session with a local drive manager: UDisks2 D-Bus mount and unmount
+results are recorded as the pseudo-tool 'udisks2-dbus'. Recordings
+contain serial numbers, UUIDs and labels of the recorded drives.
+
+'replay' answers every command from the corpus through the command
+runner. It times refreshes at recorded speed and with no tool latency,
+and the parsers on their recorded inputs. --baseline compares against an
+earlier replay of the same corpus.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_PATH = os.path.join(os.path.dirname(BENCHMARK_DIR), "backend")
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+from command_corpus import CommandCorpus, RecordedCommand, start_recording, start_replay, stop_corpus
+from command_runner import get_command_runner
+from drive_manager import DriveManager, UDISKS_DBUS_TOOL
+from gparted_integration import GPartedManager
+from ntfs_properties import NTFSProperties
+
+RESULTS_VERSION = 1
+
+# Shortest time each parser is looped for, in seconds
+PARSER_MIN_TIME = 0.2
+
+# Relative slowdown that --baseline reports as a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def _quiet():
+    """The backend prints progress; keep benchmark output readable"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def record(sys_root: str = "/sys", properties: bool = True, gparted: bool = True) -> CommandCorpus:
+    """
+    Run a refresh (and optionally NTFS properties and GParted) while recording
+
+    Returns:
+        CommandCorpus: Everything that was run
+    """
+    corpus = start_recording()
+    try:
+        with _quiet():
+            drives = DriveManager(sys_root=sys_root).get_all_drives()
+            if properties:
+                for drive in drives:
+                    if drive.fstype == "ntfs":
+                        NTFSProperties(f"/dev/{drive.name}").get_all_properties()
+            if gparted:
+                manager = GPartedManager()
+                if manager.is_available():
+                    manager.get_device_list()
+    finally:
+        stop_corpus()
+    return corpus
+
+
+# Parsers only fill in their object's fields, so one object of each serves every call
+_properties = NTFSProperties("/dev/null")
+_gparted = GPartedManager.__new__(GPartedManager)
+
+
+def _parse_ntfsinfo(entry: RecordedCommand):
+    _properties._parse_ntfsinfo(entry.stdout)
+
+
+def _parse_acl(entry: RecordedCommand):
+    _properties._parse_acl_output(entry.stdout)
+
+
+def _parse_smart(entry: RecordedCommand):
+    _properties._parse_smart_data(entry.stdout)
+
+
+def _parse_gparted_text(entry: RecordedCommand):
+    _gparted._parse_text_output(entry.stdout)
+
+
+def _classify_mount_error(entry: RecordedCommand):
+    DriveManager._is_dirty_volume_error(entry.stderr)
+
+
+def _parse_lsblk_json(entry: RecordedCommand):
+    json.loads(entry.stdout)
+
+
+# {parser: (tools, which of their recordings it takes, parse function)}
+PARSERS = {
+    "ntfsinfo": (("ntfsinfo",), lambda entry: "-m" not in entry.args, _parse_ntfsinfo),
+    "getfacl": (("getfacl",), lambda entry: True, _parse_acl),
+    "smartctl": (("smartctl",), lambda entry: True, _parse_smart),
+    "gparted_text": (("gparted",), lambda entry: "--json" not in entry.args, _parse_gparted_text),
+    # Mounts go through D-Bus; udisksctl only runs when the system bus is unreachable
+    "mount_error": ((UDISKS_DBUS_TOOL, "udisksctl"), lambda entry: entry.returncode != 0,
+                    _classify_mount_error),
+    "lsblk_json": (("lsblk",), lambda entry: "-J" in entry.args and entry.returncode == 0, _parse_lsblk_json),
+}
+
+
+def bench_parser(samples: List[RecordedCommand], parse: Callable[[RecordedCommand], Any],
+                 min_time: float = PARSER_MIN_TIME) -> Dict[str, Any]:
+    """Loop a parser over its recorded inputs for at least min_time"""
+    if not samples:
+        return {"samples": 0}
+    input_bytes = sum(len(entry.stdout) + len(entry.stderr) for entry in samples)
+    calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        for entry in samples:
+            parse(entry)
+        calls += len(samples)
+        elapsed = time.perf_counter() - start
+    return {
+        "samples": len(samples),
+        "calls": calls,
+        "per_call_us": elapsed / calls * 1e6,
+        "mb_per_s": input_bytes * (calls / len(samples)) / elapsed / 1e6,
+    }
+
+
+def bench_refresh(corpus: CommandCorpus, runs: int, speed: float, sys_root: str) -> Dict[str, Any]:
+    """Time refreshes answered from the corpus at the given replay speed"""
+    start_replay(corpus, speed)
+    try:
+        manager = DriveManager(sys_root=sys_root)
+        times = []
+        drives = []
+        for _ in range(runs):
+            corpus.rewind()
+            get_command_runner().invalidate()
+            start = time.perf_counter()
+            with _quiet():
+                drives = manager.get_all_drives()
+            times.append(time.perf_counter() - start)
+        misses = len(corpus.misses)
+    finally:
+        stop_corpus()
+    return {
+        "speed": speed,
+        "runs": runs,
+        "drives_found": len(drives),
+        "median_ms": statistics.median(times) * 1000,
+        "min_ms": min(times) * 1000,
+        "max_ms": max(times) * 1000,
+        "corpus_misses": misses,
+    }
+
+
+def replay(corpus: CommandCorpus, runs: int = 5, sys_root: str = "/sys",
+           min_time: float = PARSER_MIN_TIME) -> Dict[str, Any]:
+    """Benchmark refreshes and parsers against a corpus"""
+    parsers = {}
+    start_replay(corpus, 0.0)
+    try:
+        for name, (tools, accepts, parse) in PARSERS.items():
+            samples = [entry for tool in tools for entry in corpus.for_tool(tool) if accepts(entry)]
+            with _quiet():
+                parsers[name] = bench_parser(samples, parse, min_time)
+    finally:
+        stop_corpus()
+
+    return {
+        "version": RESULTS_VERSION,
+        "commands": len(corpus.entries),
+        "refresh": {
+            "recorded_speed": bench_refresh(corpus, runs, 1.0, sys_root),
+            "instant": bench_refresh(corpus, runs, 0.0, sys_root),
+        },
+        "parsers": parsers,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Regressions of a replay against an earlier one of the same corpus
+
+    Returns:
+        list: One line per regression, empty if there are none
+    """
+    regressions = []
+    for mode, result in current["refresh"].items():
+        before = baseline.get("refresh", {}).get(mode)
+        if before and result["median_ms"] > before["median_ms"] * (1 + tolerance):
+            regressions.append(f"refresh ({mode}): {before['median_ms']:.1f} ms -> {result['median_ms']:.1f} ms")
+    for name, result in current["parsers"].items():
+        before = baseline.get("parsers", {}).get(name, {})
+        if "per_call_us" in result and "per_call_us" in before \
+                and result["per_call_us"] > before["per_call_us"] * (1 + tolerance):
+            regressions.append(f"parser {name}: {before['per_call_us']:.1f} us -> {result['per_call_us']:.1f} us")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record tool outputs, or benchmark against a recording")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Record a refresh into a corpus")
+    record_parser.add_argument("--output", required=True, help="Corpus file to write")
+    record_parser.add_argument("--no-properties", action="store_true", help="Skip NTFS properties")
+    record_parser.add_argument("--no-gparted", action="store_true", help="Skip the GParted device list")
+    record_parser.add_argument("--sys-root", default="/sys", help="sysfs mount point (default: %(default)s)")
+
+    replay_parser = commands.add_parser("replay", help="Benchmark against a recorded corpus")
+    replay_parser.add_argument("corpus", help="Corpus file written by 'record' or --record-commands")
+    replay_parser.add_argument("--runs", type=int, default=5, help="Refreshes per replay speed")
+    replay_parser.add_argument("--sys-root", default="/sys",
+                               help="sysfs the refresh reads next to the corpus (default: %(default)s)")
+    replay_parser.add_argument("--output", help="Write the results JSON here (default: stdout)")
+    replay_parser.add_argument("--baseline", help="Results JSON of an earlier replay to compare against")
+    replay_parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                               help="Allowed relative slowdown against --baseline (default: %(default)s)")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        corpus = record(args.sys_root, not args.no_properties, not args.no_gparted)
+        if not corpus.save(args.output):
+            sys.exit(1)
+        tools = sorted({entry.tool for entry in corpus.entries})
+        print(f"Recorded {len(corpus.entries)} commands ({', '.join(tools)}) to {args.output}",
+              file=sys.stderr)
+        return
+
+    try:
+        corpus = CommandCorpus.load(args.corpus)
+    except (OSError, ValueError) as e:
+        print(f"Cannot load corpus: {e}", file=sys.stderr)
+        sys.exit(2)
+    results = replay(corpus, args.runs, args.sys_root)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION: {line}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
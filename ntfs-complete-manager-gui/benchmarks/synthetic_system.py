@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Synthetic System Module
+Fake sysfs, udev database, mountinfo and stub tools for enumeration benchmarks
+"""
+
+import json
+import os
+import shlex
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Tools DriveManager runs while enumerating, and what their stubs do
+STUB_TOOLS = ("lsblk", "udevadm", "findmnt", "smartctl", "ntfsfix", "ntfsinfo",
+              "ntfslabel", "blkid", "e2label", "sudo")
+
+# Partitions per disk; a disk and its partitions are separate devices
+PARTITIONS_PER_DISK = 3
+
+FSTYPES = ("ntfs", "ext4", "vfat", "exfat")
+
+_LAST_ARG = 'for arg; do dev=$arg; done\nname=${dev#/dev/}\n'
+
+_STUB_BODIES = {
+    "lsblk": 'case " $* " in\n  *" -J "*) exec cat "$ROOT/data/lsblk.json" ;;\nesac\n' + _LAST_ARG + (
+        '[ -f "$ROOT/data/$name.fstype" ] || exit 32\n'
+        'exec cat "$ROOT/data/$name.fstype"\n'),
+    "udevadm": _LAST_ARG + (
+        'devno=$(cat "$ROOT/sys/class/block/$name/dev" 2>/dev/null) || {\n'
+        '    echo "Unknown device \\"$dev\\": No such device" >&2; exit 4; }\n'
+        'exec sed -n "s/^E://p" "$ROOT/run/udev/data/b$devno"\n'),
+    "findmnt": _LAST_ARG + (
+        'case " $* " in *" TARGET "*) want=target ;; *) want=source ;; esac\n'
+        'exec awk -v dev="$dev" -v want="$want" \'\n'
+        '    { for (i = 7; i < NF && $i != "-"; i++); if ($(i + 2) == dev) {\n'
+        '          print (want == "target" ? $5 : dev); found = 1; exit } }\n'
+        '    END { exit !found }\' "$ROOT/proc/self/mountinfo"\n'),
+    "smartctl": _LAST_ARG + (
+        '[ -e "$ROOT/sys/block/$name" ] || {\n'
+        '    echo "Smartctl open device: $dev failed: No such device" >&2; exit 2; }\n'
+        'case " $* " in\n'
+        '  *" -H "*) echo "SMART overall-health self-assessment test result: PASSED" ;;\n'
+        '  *) echo "Temperature:                        36 Celsius" ;;\n'
+        'esac\n'),
+    "ntfsfix": (
+        'echo "Mounting volume... OK"\n'
+        'echo "Processing of \\$MFT and \\$MFTMirr completed successfully."\n'
+        'echo "NTFS volume version is 3.1."\n'),
+    "ntfsinfo": _LAST_ARG + (
+        'label=$(cat "$ROOT/data/$name.label" 2>/dev/null)\n'
+        '[ -n "$label" ] || exit 1\n'
+        'echo "Volume Name: $label"\n'),
+    "ntfslabel": _LAST_ARG + 'exec grep . "$ROOT/data/$name.label"\n',
+    "e2label": _LAST_ARG + 'exec grep . "$ROOT/data/$name.label"\n',
+    "blkid": _LAST_ARG + 'grep . "$ROOT/data/$name.label" || exit 2\n',
+    "sudo": 'exec "$@"\n',
+}
+
+
+@dataclass
+class SyntheticDevice:
+    """One fake block device"""
+    name: str
+    major: int
+    minor: int
+    size: int
+    disk: str  # parent disk, itself for a disk
+    fstype: str = ""
+    label: str = ""
+    mountpoint: str = ""
+    removable: bool = False
+    model: str = ""
+    serial: str = ""
+
+    @property
+    def is_disk(self) -> bool:
+        return self.name == self.disk
+
+
+@dataclass
+class SyntheticSystem:
+    """A generated fixture tree"""
+    root: str
+    devices: List[SyntheticDevice]
+    latency: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def bin_dir(self) -> str:
+        return os.path.join(self.root, "bin")
+
+    @property
+    def sys_root(self) -> str:
+        return os.path.join(self.root, "sys")
+
+    @property
+    def proc_root(self) -> str:
+        return os.path.join(self.root, "proc")
+
+    def path_env(self, path: Optional[str] = None) -> str:
+        """PATH with the stub tools in front"""
+        path = os.environ.get("PATH", "") if path is None else path
+        return f"{self.bin_dir}{os.pathsep}{path}"
+
+
+def _disk_name(index: int) -> str:
+    if index < 26:
+        return "sd" + chr(ord("a") + index)
+    return f"nvme{index - 26}n1"
+
+
+def _partition_name(disk: str, number: int) -> str:
+    return f"{disk}p{number}" if disk.startswith("nvme") else f"{disk}{number}"
+
+
+def make_devices(count: int) -> List[SyntheticDevice]:
+    """
+    Lay out count devices as disks with up to PARTITIONS_PER_DISK partitions each
+
+    Every third partition has no label (so label fallbacks run), every
+    other one is mounted and every fourth disk is a removable USB drive.
+    """
+    devices = []
+    disk_index = 0
+    nvme_minor = 0
+    while len(devices) < count:
+        disk = _disk_name(disk_index)
+        partitions = min(PARTITIONS_PER_DISK, count - len(devices) - 1)
+        nvme = disk.startswith("nvme")
+        major = 259 if nvme else 8
+        base_minor = nvme_minor if nvme else disk_index * 16
+        removable = disk_index % 4 == 3
+        devices.append(SyntheticDevice(
+            name=disk, major=major, minor=base_minor, size=(disk_index + 1) * 2 ** 36,
+            disk=disk, removable=removable, model=f"Bench Disk {disk_index}",
+            serial=f"BENCH{disk_index:05d}"))
+        for number in range(1, partitions + 1):
+            index = len(devices)
+            name = _partition_name(disk, number)
+            devices.append(SyntheticDevice(
+                name=name, major=major, minor=base_minor + number, size=2 ** 34, disk=disk,
+                fstype=FSTYPES[(disk_index + number - 1) % len(FSTYPES)],
+                label="" if index % 3 == 0 else f"VOL{index}",
+                mountpoint=f"/media/bench/{name}" if index % 2 else "",
+                removable=removable))
+        nvme_minor += partitions + 1 if nvme else 0
+        disk_index += 1
+    return devices
+
+
+def _write(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _lsblk_entry(device: SyntheticDevice) -> dict:
+    return {
+        "name": device.name,
+        "size": device.size,
+        "fstype": device.fstype or None,
+        "mountpoint": device.mountpoint or None,
+        "label": device.label or None,
+        "model": device.model or None,
+        "serial": device.serial or None,
+        "uuid": f"{device.minor:04X}-{device.major:04X}" if device.fstype else None,
+        "rm": "1" if device.removable and device.is_disk else "0",
+        "rota": "0",
+        "maj:min": f"{device.major}:{device.minor}",
+    }
+
+
+def build_system(root: str, count: int, latency: Optional[Dict[str, float]] = None) -> SyntheticSystem:
+    """
+    Write a fixture tree with count devices under root
+
+    Args:
+        root: Empty directory to fill
+        count: Number of block devices (disks plus partitions)
+        latency: Seconds each stub tool sleeps before answering, by tool name
+
+    Returns:
+        SyntheticSystem: Paths to point DriveManager and PATH at
+    """
+    system = SyntheticSystem(os.path.abspath(root), make_devices(count), dict(latency or {}))
+    block = os.path.join(system.sys_root, "class", "block")
+    os.makedirs(os.path.join(system.sys_root, "block"), exist_ok=True)
+
+    lsblk = []
+    mountinfo = []
+    for device in system.devices:
+        device_dir = os.path.join(block, device.name)
+        _write(os.path.join(device_dir, "dev"), f"{device.major}:{device.minor}\n")
+        _write(os.path.join(device_dir, "size"), f"{device.size // 512}\n")
+
+        udev = [f"E:DEVNAME=/dev/{device.name}", f"E:ID_BUS={'usb' if device.removable else 'ata'}",
+                "E:ID_TYPE=disk", "E:ID_MODEL=Bench_Disk", "E:ID_VENDOR=Bench",
+                f"E:ID_SERIAL_SHORT=BENCH{device.major}{device.disk}"]
+        if device.fstype:
+            udev.append(f"E:ID_FS_TYPE={device.fstype}")
+        _write(os.path.join(system.root, "run", "udev", "data", f"b{device.major}:{device.minor}"),
+               "\n".join(udev) + "\n")
+
+        _write(os.path.join(system.root, "data", f"{device.name}.fstype"), device.fstype + "\n")
+        _write(os.path.join(system.root, "data", f"{device.name}.label"), device.label)
+
+        if device.is_disk:
+            _write(os.path.join(device_dir, "removable"), "1\n" if device.removable else "0\n")
+            _write(os.path.join(device_dir, "device", "model"), device.model + "\n")
+            _write(os.path.join(device_dir, "device", "vendor"), "Bench\n")
+            _write(os.path.join(device_dir, "device", "serial"), device.serial + "\n")
+            os.symlink(os.path.join("..", "class", "block", device.name),
+                       os.path.join(system.sys_root, "block", device.name))
+            lsblk.append(dict(_lsblk_entry(device), children=[]))
+        else:
+            lsblk[-1]["children"].append(_lsblk_entry(device))
+
+        if device.mountpoint:
+            mountinfo.append(f"{100 + len(mountinfo)} 1 {device.major}:{device.minor} / {device.mountpoint} "
+                             f"rw,relatime shared:1 - {device.fstype} /dev/{device.name} rw")
+
+    _write(os.path.join(system.root, "data", "lsblk.json"), json.dumps({"blockdevices": lsblk}))
+    _write(os.path.join(system.proc_root, "self", "mountinfo"), "".join(line + "\n" for line in mountinfo))
+
+    for tool in STUB_TOOLS:
+        path = os.path.join(system.bin_dir, tool)
+        delay = system.latency.get(tool, 0.0)
+        _write(path, "#!/bin/sh\n"
+                     f"ROOT={shlex.quote(system.root)}\n"
+                     + (f"sleep {delay:g}\n" if delay > 0 else "")
+                     + _STUB_BODIES[tool])
+        os.chmod(path, 0o755)
+
+    return system
@@ -170,6 +170,20 @@ EOF
     systemctl daemon-reload
     systemctl enable ntfs-manager-log.service &> /dev/null || true
     
+    # Per-session drive daemon shared by the GUI, Nautilus extension and CLI
+    cat > /etc/systemd/user/ntfs-manager-daemon.service << EOF
+[Unit]
+Description=NTFS Manager Drive Daemon
+
+[Service]
+ExecStart=/usr/bin/python3 $APP_DIR/backend/drive_daemon.py serve
+Restart=on-failure
+
+[Install]
+WantedBy=default.target
+EOF
+    systemctl --global enable ntfs-manager-daemon.service &> /dev/null || true
+    
     print_status "System integration installed"
 }
 
@@ -253,6 +267,13 @@ uninstall() {
         print_status "System service removed"
     fi
     
+    # Remove drive daemon user service
+    if [[ -f "/etc/systemd/user/ntfs-manager-daemon.service" ]]; then
+        systemctl --global disable ntfs-manager-daemon.service &> /dev/null || true
+        rm -f /etc/systemd/user/ntfs-manager-daemon.service
+        print_status "Drive daemon service removed"
+    fi
+    
     # Ask about log directory
     echo -e "${YELLOW}Keep log directory $LOG_DIR? (y/N)${NC}"
     read -r response
@@ -4,19 +4,45 @@ NTFS Complete Manager - GUI Application
 A comprehensive NTFS drive management tool with GTK3 interface
 """
 
-import gi
-gi.require_version('Gtk', '3.0')
 import sys
 import os
-import threading
 import time
-import fcntl
-from pathlib import Path
+
+# Reference point for the startup benchmark
+STARTUP_TIME = time.monotonic()
 
 # Add backend to path
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
 
-from gi.repository import Gtk, Gio, GLib, GdkPixbuf
+# --trace-startup must be honoured before the heavy imports below so they are timed
+try:
+    from startup_trace import get_startup_trace
+except ImportError:
+    import contextlib
+    import importlib
+    
+    class StartupTrace:
+        enabled = False
+        def enable(self): pass
+        def disable(self): pass
+        def phase(self, name): return contextlib.nullcontext()
+        def import_module(self, name): return importlib.import_module(name)
+        def report(self, milestones=None): return "Startup trace not available"
+    
+    def get_startup_trace(origin=None):
+        return StartupTrace()
+
+startup_trace = get_startup_trace(STARTUP_TIME)
+if "--trace-startup" in sys.argv:
+    startup_trace.enable()
+
+import gi
+gi.require_version('Gtk', '3.0')
+import threading
+import fcntl
+from pathlib import Path
+
+from gi.repository import Gtk, Gio, GLib, GObject, GdkPixbuf
 import subprocess
 import threading
 import time
@@ -24,10 +50,14 @@ from pathlib import Path
 
 # Import backend modules with error handling
 try:
-    from drive_manager import DriveManager, DriveInfo
-    from ntfs_properties import NTFSProperties
-    from gparted_integration import GPartedManager
+    from drive_manager import DriveManager, DriveInfo, format_size
     from logger import get_logger
+    from proc_scanner import find_processes_using
+    from properties_cache import PropertiesCache, default_snapshot_path
+    from drive_snapshot import load_drive_snapshot, save_drive_snapshot
+    from tool_registry import get_tool_registry
+    from drive_daemon import connect_drive_manager, NO_DAEMON_ENV
+    from command_runner import run_command
 except ImportError as e:
     print(f"Warning: Could not import backend modules: {e}")
     print("Some features may not be available")
@@ -37,36 +67,23 @@ except ImportError as e:
         def get_all_drives(self): return []
         def refresh_drives(self): return []
         def get_drive_properties(self, drive): return {}
+        def get_generation(self, drive): return ""
         def mount_drive(self, drive): return False
         def unmount_drive(self, drive): return False
         def format_drive(self, drive, fstype, label): return False
         def repair_drive(self, drive): return False
         def add_callback(self, callback): pass
+        def get_event_metrics(self): return {}
         def start_monitoring(self): pass
         def stop_monitoring(self): pass
     
     class DriveInfo:
-        def __init__(self, name="", size="", fstype="", mountpoint="", label="", model="", vendor="", serial="", uuid="", is_removable=False, is_rotational=False, health_status="Unknown", temperature=0.0, smart_status="Unknown"):
+        def __init__(self, name="", size=0, fstype="", mountpoint="", label="", model="", vendor="", serial="", uuid="", is_removable=False, is_rotational=False, health_status="Unknown", temperature=0.0, smart_status="Unknown", major=0, minor=0):
             for key, value in locals().items():
                 setattr(self, key, value)
     
-    class NTFSProperties:
-        def __init__(self, device_path): pass
-        def get_windows_style_properties(self): return ""
-        def get_all_properties(self): return {}
-        def run_disk_check(self): return {"timestamp": "", "overall_status": "Unknown", "checks": {}}
-    
-    class GPartedManager:
-        def __init__(self): pass
-        def is_available(self): return False
-        def get_device_list(self): return []
-        def create_partition(self, *args, **kwargs): return False
-        def delete_partition(self, *args, **kwargs): return False
-        def format_partition(self, *args, **kwargs): return False
-        def resize_partition(self, *args, **kwargs): return False
-        def set_partition_flag(self, *args, **kwargs): return False
-        def get_partition_info(self, *args, **kwargs): return None
-        def apply_changes(self, *args, **kwargs): return False
+    def format_size(size):
+        return f"{size}B"
     
     class NTFSLogger:
         def __init__(self, name="ntfs_manager"): pass
@@ -86,40 +103,233 @@ except ImportError as e:
     
     def get_logger(name="ntfs_manager"):
         return NTFSLogger()
+    
+    def find_processes_using(device_path, mount_points=None, deadline=3.0):
+        raise OSError("proc scanner not available")
+    
+    class PropertiesCache:
+        def __init__(self, max_entries=64, ttl=300.0, snapshot_path=None): pass
+        def get(self, key, generation=None): return None
+        def put(self, key, value, generation=None): pass
+        def invalidate(self, key): return False
+        def load(self): return 0
+        def save(self): return False
+        def get_stats(self): return {}
+    
+    def default_snapshot_path(name):
+        return None
+    
+    def load_drive_snapshot():
+        return None
+    
+    def save_drive_snapshot(drives):
+        return False
+    
+    class ToolRegistry:
+        def is_available(self, name):
+            import shutil
+            return shutil.which(name) is not None
+    
+    def get_tool_registry():
+        return ToolRegistry()
+    
+    NO_DAEMON_ENV = "NTFS_MANAGER_NO_DAEMON"
+    
+    def connect_drive_manager(socket_path=None):
+        return DriveManager()
+    
+    def run_command(args, timeout=30, check=False, **kwargs):
+        return subprocess.run(args, capture_output=True, text=True, timeout=timeout, check=check)
+
+from gi.repository import Gtk, Gio, GLib, GObject, GdkPixbuf
+
+class LazyBackendModule:
+    """
+    Backend module imported on first attribute access
+    
+    Used for subsystems most sessions never touch (NTFS properties pull in
+    asyncio and only matter once a drive is inspected), keeping them off
+    the path to the first frame.
+    """
+    
+    def __init__(self, module_name):
+        self._module_name = module_name
+        self._module = None
+    
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = startup_trace.import_module(self._module_name)
+        return getattr(self._module, attribute)
+
+ntfs_properties = LazyBackendModule("ntfs_properties")
 
-from gi.repository import Gtk, Gio, GLib, GdkPixbuf
+class DriveDetailLoader:
+    """
+    Loads drive details on a single worker thread
+    
+    Each request supersedes the previous one: a request still waiting in the
+    queue is dropped, and the result of one already running is discarded.
+    Only the result of the latest request is applied, on the GTK main loop.
+    """
+    
+    def __init__(self, load_func, apply_func):
+        """
+        Args:
+            load_func: Called on the worker as load_func(drive_name) -> text
+            apply_func: Called on the main loop as apply_func(drive_name, text)
+        """
+        self._load_func = load_func
+        self._apply_func = apply_func
+        self._condition = threading.Condition()
+        self._pending = None  # (request_id, drive_name)
+        self._latest_id = 0
+        self._thread = threading.Thread(target=self._run, name="drive-details", daemon=True)
+        self._thread.start()
+    
+    def request(self, drive_name) -> int:
+        """Queue a load for drive_name, cancelling any earlier request"""
+        with self._condition:
+            self._latest_id += 1
+            self._pending = (self._latest_id, drive_name)
+            self._condition.notify()
+            return self._latest_id
+    
+    def cancel(self):
+        """Cancel the queued or running request without starting a new one"""
+        with self._condition:
+            self._latest_id += 1
+            self._pending = None
+    
+    def is_current(self, request_id) -> bool:
+        with self._condition:
+            return request_id == self._latest_id
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None:
+                    self._condition.wait()
+                request_id, drive_name = self._pending
+                self._pending = None
+            
+            try:
+                details_text = self._load_func(drive_name)
+            except Exception as e:
+                details_text = f"Error loading details for {drive_name}: {e}"
+            
+            if self.is_current(request_id):
+                GLib.idle_add(self._deliver, request_id, drive_name, details_text)
+    
+    def _deliver(self, request_id, drive_name, details_text):
+        # Re-check on the main loop: the selection may have moved on meanwhile
+        if self.is_current(request_id):
+            self._apply_func(drive_name, details_text)
+        return False
 
 class NTFSManager:
-    def __init__(self):
+    def __init__(self, auto_mount=True, benchmark_startup=False):
         super().__init__()
-        self.drive_manager = DriveManager()
-        self.logger = get_logger()
+        self.benchmark_startup = benchmark_startup
+        self.startup_marks = {}  # {milestone: seconds since process start}
+        with startup_trace.phase("connect_drive_manager()"):
+            # Thin client of the drive daemon when one is running
+            self.drive_manager = connect_drive_manager()
+        with startup_trace.phase("get_logger()"):
+            self.logger = get_logger()
         self.selected_drive = None
         self.drive_list_store = None
+        self.drive_rows = {}  # {device name: Gtk.TreeRowReference}
+        self.drive_row_values = {}  # {device name: row values last written}
         
         # Cache for drive list to avoid unnecessary refreshes
         self.drive_cache = {}
         self.last_refresh_time = 0
         self.refresh_cooldown = 1.0  # Debounce: min 1 second between refreshes
         
-        # Cache for NTFS properties to avoid expensive re-queries
-        self.ntfs_properties_cache = {}  # {device_path: {'properties': NTFSProperties, 'timestamp': float}}
-        self.ntfs_cache_ttl = 60.0  # 60 second TTL for NTFS properties
+        # Background refresh state (main thread only)
+        self.refresh_generation = 0  # Bumped for every enumeration started
+        self.applied_refresh_generation = 0  # Generation currently shown
+        self.refresh_in_flight = False
+        self.refresh_pending = False
+        self.refresh_deferred = False  # A debounced refresh is scheduled
+        self.refresh_rescan = False  # The next run re-enumerates instead of reading the table
+        
+        # Cache for NTFS properties to avoid expensive re-queries, kept across launches
+        self.ntfs_properties_cache = PropertiesCache(
+            max_entries=32, ttl=300.0, snapshot_path=default_snapshot_path("gui")
+        )
+        with startup_trace.phase("properties cache load"):
+            self.ntfs_properties_cache.load()
+        
+        # Drive details are loaded off the main thread; only the latest selection is shown
+        self.detail_loader = DriveDetailLoader(self.load_drive_details, self.show_drive_details)
         
         # Tool availability - check which external tools are available
-        self.available_tools = self.check_tool_availability()
+        with startup_trace.phase("tool availability"):
+            self.available_tools = self.check_tool_availability()
         
         # Setup drive event callbacks
         self.drive_manager.add_callback(self.on_drive_event)
         
-        self.setup_ui()
+        with startup_trace.phase("setup_ui()"):
+            self.setup_ui()
+        self.mark_startup("ui_built")
+        self.window.connect("draw", self.on_first_draw)
+        
+        # Paint the last known drives right away; the live scan reconciles them
+        with startup_trace.phase("drive snapshot"):
+            self.show_drive_snapshot()
+        
+        # Auto-mount internal NTFS drives once the first enumeration has landed
+        self.auto_mount_pending = auto_mount
         self.refresh_drives()
         
-        # Auto-mount internal NTFS drives on startup
-        self.auto_mount_internal_drives()
+        # Drive monitoring (udevadm) starts once the first frame is on screen
+        self.monitoring_started = False
+    
+    def mark_startup(self, milestone):
+        """Record the first time a startup milestone is reached"""
+        self.startup_marks.setdefault(milestone, round(time.monotonic() - STARTUP_TIME, 4))
+    
+    def on_first_draw(self, widget, cairo_context):
+        """Record time-to-first-paint, start deferred work, then stop listening"""
+        self.mark_startup("first_paint")
+        widget.disconnect_by_func(self.on_first_draw)
+        GLib.idle_add(self.start_deferred_subsystems)
+        return False
+    
+    def start_deferred_subsystems(self):
+        """Start work that is not needed for the first frame"""
+        if not self.monitoring_started:
+            self.monitoring_started = True
+            with startup_trace.phase("start_monitoring()"):
+                self.drive_manager.start_monitoring()
+        return False
+    
+    def print_startup_trace(self):
+        """Print the --trace-startup report"""
+        startup_trace.disable()
+        print(startup_trace.report(self.startup_marks))
+        return False
+    
+    def show_drive_snapshot(self):
+        """Render the persisted drive inventory, marked as last known"""
+        drives = load_drive_snapshot()
+        self.mark_startup("snapshot_loaded")
+        if not drives:
+            return
         
-        # Start drive monitoring
-        self.drive_manager.start_monitoring()
+        self.update_drive_list(drives, stale=True)
+        self.startup_marks["snapshot_rows"] = len(drives)
+        self.update_status(f"Showing {len(drives)} last known drives, scanning...")
+        self.logger.debug(f"Rendered drive snapshot with {len(drives)} drives")
+    
+    def finish_startup_benchmark(self):
+        """Print the startup timings as JSON and quit (--benchmark-startup)"""
+        import json
+        print(json.dumps(self.startup_marks, indent=2))
+        self.window.destroy()
+        return False
     
     def check_tool_availability(self):
         """Check which external tools are available on the system"""
@@ -133,10 +343,10 @@ class NTFSManager:
             'fuser': False
         }
         
+        registry = get_tool_registry()
         for tool in tools.keys():
             try:
-                result = subprocess.run(['which', tool], capture_output=True, text=True)
-                tools[tool] = (result.returncode == 0)
+                tools[tool] = registry.is_available(tool)
                 if tools[tool]:
                     self.logger.debug(f"Tool available: {tool}")
                 else:
@@ -260,11 +470,18 @@ class NTFSManager:
         """
         processes = []
         
-        # Try lsof first
+        # Walk /proc natively first - far cheaper than lsof on busy hosts.
+        # A scan that hit its deadline raises instead of reporting "not busy"
+        try:
+            is_busy, processes = find_processes_using(device_path)
+            return is_busy, processes
+        except Exception as e:
+            self.logger.debug(f"/proc scan failed or incomplete, falling back to lsof: {e}")
+        
+        # Try lsof as fallback
         if self.available_tools.get('lsof'):
             try:
-                result = subprocess.run(['lsof', device_path], 
-                                      capture_output=True, text=True, timeout=5)
+                result = run_command(['lsof', device_path])
                 if result.returncode == 0 and result.stdout.strip():
                     # Parse lsof output to get process names
                     for line in result.stdout.split('\n')[1:]:  # Skip header
@@ -276,11 +493,10 @@ class NTFSManager:
             except Exception as e:
                 self.logger.debug(f"lsof check failed: {e}")
         
-        # Try fuser as fallback
+        # Try fuser as last resort
         if self.available_tools.get('fuser'):
             try:
-                result = subprocess.run(['fuser', device_path], 
-                                      capture_output=True, text=True, timeout=5)
+                result = run_command(['fuser', device_path])
                 if result.returncode == 0 and result.stdout.strip():
                     return True, ['unknown process']
             except Exception as e:
@@ -323,10 +539,10 @@ class NTFSManager:
         return False, "Operation failed"
     
     def auto_mount_internal_drives(self):
-        """Auto-mount internal NTFS drives on startup"""
+        """Auto-mount internal NTFS drives on startup (runs on a worker thread)"""
         try:
             mounted_count = 0
-            for drive_name, drive_info in self.drive_manager.drives.items():
+            for drive_name, drive_info in list(self.drive_manager.drives.items()):
                 # Mount internal NTFS drives that aren't already mounted
                 # Include sda1, sdb1, nvme1n1p1 but skip nvme0n1p (system disk)
                 if (not drive_info.mountpoint and 
@@ -340,15 +556,15 @@ class NTFSManager:
                     if success:
                         mounted_count += 1
                         print(f"DEBUG: Successfully mounted {drive_name}")
-                        self.update_status(f"Auto-mounted {drive_name}")
+                        GLib.idle_add(self.update_status, f"Auto-mounted {drive_name}")
                     else:
                         print(f"DEBUG: Failed to mount {drive_name}")
                         self.logger.error(f"Failed to auto-mount {drive_name}")
                         
             # Refresh drive list to show mounted drives
             if mounted_count > 0:
-                self.refresh_drives()
-                self.update_status(f"Auto-mounted {mounted_count} internal NTFS drive(s)")
+                GLib.idle_add(self.refresh_drives, True)
+                GLib.idle_add(self.update_status, f"Auto-mounted {mounted_count} internal NTFS drive(s)")
         except Exception as e:
             print(f"DEBUG: Auto-mount error: {e}")
             self.logger.error(f"Error in auto-mount: {e}")
@@ -592,7 +808,8 @@ class NTFSManager:
     
     def create_drive_list(self):
         """Create the drive list TreeView"""
-        self.drive_list_store = Gtk.ListStore(str, str, str, str, str, str)  # Name, Size, FSType, MountPoint, Label, Status
+        # Name, Size, FSType, MountPoint, Label, Status, size in bytes (sort key for Size)
+        self.drive_list_store = Gtk.ListStore(str, str, str, str, str, str, GObject.TYPE_INT64)
         
         self.drive_treeview = Gtk.TreeView(model=self.drive_list_store)
         self.drive_treeview.set_headers_visible(True)
@@ -608,7 +825,7 @@ class NTFSManager:
         
         # Size column
         column = Gtk.TreeViewColumn("Size", renderer, text=1)
-        column.set_sort_column_id(1)
+        column.set_sort_column_id(6)
         column.set_resizable(True)
         self.drive_treeview.append_column(column)
         
@@ -649,62 +866,56 @@ class NTFSManager:
             self.clear_drive_details()
     
     def update_drive_details(self, drive_name):
-        """Update the drive details panel with caching for NTFS properties"""
+        """Show a placeholder and load the drive details on the detail worker"""
         if not drive_name:
             return
         
+        buffer = self.details_text.get_buffer()
+        buffer.set_text(f"Loading details for {drive_name}...")
+        self.detail_loader.request(drive_name)
+    
+    def show_drive_details(self, drive_name, details_text):
+        """Apply loaded drive details (main thread, latest request only)"""
+        if drive_name != self.selected_drive:
+            return
+        buffer = self.details_text.get_buffer()
+        buffer.set_text(details_text)
+    
+    def load_drive_details(self, drive_name):
+        """
+        Build the drive details text with caching for NTFS properties
+        
+        Runs on the detail worker thread, so it must not touch GTK widgets.
+        """
         try:
             # Get drive properties
             properties = self.drive_manager.get_drive_properties(drive_name)
             
             # Check if we got valid properties
             if not properties:
-                buffer = self.details_text.get_buffer()
-                buffer.set_text(f"Drive {drive_name} - No properties available")
-                return
+                return f"Drive {drive_name} - No properties available"
             
             # Get NTFS-specific properties if it's an NTFS drive
             if properties.get('fstype') == 'ntfs':
                 device_path = f"/dev/{drive_name}"
-                current_time = time.time()
-                
-                # Check cache first
-                cache_entry = self.ntfs_properties_cache.get(device_path)
-                if cache_entry:
-                    # Check if cache is still valid (within TTL)
-                    cache_age = current_time - cache_entry['timestamp']
-                    if cache_age < self.ntfs_cache_ttl:
-                        # Cache hit - use cached properties
-                        self.logger.debug(f"NTFS properties cache hit for {drive_name} (age: {cache_age:.1f}s)")
-                        ntfs_props = cache_entry['properties']
-                        try:
-                            ntfs_details = ntfs_props.get_windows_style_properties()
-                            details_text = f"NTFS Properties for {drive_name}:\n\n{ntfs_details}"
-                        except Exception as ntfs_error:
-                            # Cache entry might be stale, remove it and fallback
-                            self.logger.debug(f"Cached NTFS properties failed, removing cache entry")
-                            del self.ntfs_properties_cache[device_path]
-                            details_text = self.format_basic_properties(drive_name, properties)
-                    else:
-                        # Cache expired - remove and query fresh
-                        self.logger.debug(f"NTFS properties cache expired for {drive_name} (age: {cache_age:.1f}s)")
-                        del self.ntfs_properties_cache[device_path]
-                        cache_entry = None
+                generation = self.drive_manager.get_generation(drive_name)
                 
-                # Cache miss or expired - query fresh NTFS properties
-                if not cache_entry or cache_age >= self.ntfs_cache_ttl:
+                # Check cache first; a generation change means the drive changed since
+                ntfs_details = self.ntfs_properties_cache.get(device_path, generation)
+                if ntfs_details is not None:
+                    self.logger.debug(f"NTFS properties cache hit for {drive_name}")
+                    details_text = f"NTFS Properties for {drive_name}:\n\n{ntfs_details}"
+                else:
+                    # Cache miss, expired or stale - query fresh NTFS properties
                     try:
                         self.logger.debug(f"NTFS properties cache miss for {drive_name}, querying fresh data")
-                        ntfs_props = NTFSProperties(device_path)
+                        ntfs_props = ntfs_properties.NTFSProperties(device_path)
+                        ntfs_details = ntfs_props.get_windows_style_properties()
                         
                         # Store in cache
-                        self.ntfs_properties_cache[device_path] = {
-                            'properties': ntfs_props,
-                            'timestamp': current_time
-                        }
+                        self.ntfs_properties_cache.put(device_path, ntfs_details, generation)
                         self.logger.debug(f"Cached NTFS properties for {drive_name}")
                         
-                        ntfs_details = ntfs_props.get_windows_style_properties()
                         details_text = f"NTFS Properties for {drive_name}:\n\n{ntfs_details}"
                     except Exception as ntfs_error:
                         # Fallback to basic properties if NTFS check fails
@@ -714,20 +925,17 @@ class NTFSManager:
                 # Basic properties for non-NTFS drives
                 details_text = self.format_basic_properties(drive_name, properties)
             
-            # Update the text view
-            buffer = self.details_text.get_buffer()
-            buffer.set_text(details_text)
+            return details_text
             
         except Exception as e:
             self.logger.error(f"Error updating drive details for {drive_name}: {e}")
-            buffer = self.details_text.get_buffer()
-            buffer.set_text(f"Select a drive to view details")
+            return "Select a drive to view details"
     
     def format_basic_properties(self, drive_name: str, properties: dict) -> str:
         """Format basic drive properties"""
         lines = [
             f"Drive: {drive_name}",
-            f"Size: {properties.get('size', 'Unknown')}",
+            f"Size: {format_size(properties['size']) if 'size' in properties else 'Unknown'}",
             f"Filesystem: {properties.get('fstype', 'Unknown')}",
             f"Mount Point: {properties.get('mountpoint', 'Not mounted')}",
             f"Label: {properties.get('label', 'No label')}",
@@ -746,23 +954,89 @@ class NTFSManager:
     
     def clear_drive_details(self):
         """Clear the drive details panel"""
+        self.detail_loader.cancel()
         buffer = self.details_text.get_buffer()
         buffer.set_text("Select a drive to view details")
     
-    def refresh_drives(self, force=False):
-        """Refresh list of detected drives with debouncing"""
+    def refresh_drives(self, force=False, rescan=False):
+        """
+        Refresh list of detected drives with debouncing
+        
+        Enumeration runs on a worker thread. While a refresh is in flight,
+        further requests coalesce into a single follow-up run, and each run
+        carries a generation number so an older result never overwrites a
+        newer one. Requests right after a refresh started are deferred to
+        the end of the cooldown, never dropped.
+        
+        Only rescan (the Refresh button) makes the drive manager re-enumerate;
+        other refreshes read its drive table. With the drive daemon that
+        table is kept current by the daemon's monitor and shared by every
+        client, so a drive event does not cost an enumeration per client.
+        """
+        if rescan:
+            self.refresh_rescan = True
+        
+        # Coalesce: one refresh in flight, at most one queued behind it.
+        # Checked before the debounce so a hotplug event that arrives
+        # mid-enumeration still gets a run that can see the new drive
+        if self.refresh_in_flight:
+            self.refresh_pending = True
+            return
+        
         current_time = time.time()
         
-        # Debounce: skip if refreshed recently (unless forced)
-        if not force and (current_time - self.last_refresh_time) < self.refresh_cooldown:
-            self.logger.debug(f"Refresh debounced (last refresh {current_time - self.last_refresh_time:.1f}s ago)")
+        # Debounce: run at most once per cooldown (unless forced)
+        since_last = current_time - self.last_refresh_time
+        if not force and since_last < self.refresh_cooldown:
+            self.logger.debug(f"Refresh debounced (last refresh {since_last:.1f}s ago)")
+            if not self.refresh_deferred:
+                self.refresh_deferred = True
+                delay_ms = int((self.refresh_cooldown - since_last) * 1000) + 1
+                GLib.timeout_add(delay_ms, self.run_deferred_refresh)
             return
         
-        self.update_status("Refreshing drive list...")
         self.last_refresh_time = current_time
+        self.start_refresh_worker()
+    
+    def run_deferred_refresh(self):
+        """Timeout callback: the refresh held back by the debounce"""
+        self.refresh_deferred = False
+        self.refresh_drives(force=True)
+        return False
+    
+    def start_refresh_worker(self):
+        """Run one enumeration on a worker thread (main thread only)"""
+        self.refresh_generation += 1
+        generation = self.refresh_generation
+        self.refresh_in_flight = True
+        rescan = self.refresh_rescan
+        self.refresh_rescan = False
+        self.update_status("Refreshing drive list...")
         
-        try:
-            drives = self.drive_manager.refresh_drives()
+        def refresh_operation():
+            try:
+                if rescan:
+                    drives = self.drive_manager.refresh_drives()
+                else:
+                    drives = self.drive_manager.get_all_drives()
+                GLib.idle_add(self.apply_refresh_result, generation, drives, None)
+            except Exception as e:
+                GLib.idle_add(self.apply_refresh_result, generation, None, e)
+        
+        threading.Thread(target=refresh_operation, name="drive-refresh", daemon=True).start()
+    
+    def apply_refresh_result(self, generation, drives, error):
+        """Apply a finished refresh on the main thread, dropping stale results"""
+        self.refresh_in_flight = False
+        
+        if generation <= self.applied_refresh_generation:
+            self.logger.debug(f"Dropping stale refresh result (generation {generation})")
+        elif error is not None:
+            error_msg = self.get_user_friendly_error("refresh", str(error))
+            self.update_status(f"Error refreshing drives: {error_msg}")
+            self.logger.error(f"Error refreshing drives: {error}")
+        else:
+            self.applied_refresh_generation = generation
             
             # Update cache
             self.drive_cache = {drive.name: drive for drive in drives}
@@ -771,38 +1045,85 @@ class NTFSManager:
             self.update_status(f"Found {len(drives)} drives")
             self.logger.info(f"Refreshed drive list: {len(drives)} drives found")
             
-        except Exception as e:
-            error_msg = self.get_user_friendly_error("refresh", str(e))
-            self.update_status(f"Error refreshing drives: {error_msg}")
-            self.logger.error(f"Error refreshing drives: {e}")
+            if "live_reconciled" not in self.startup_marks:
+                self.mark_startup("live_reconciled")
+                self.startup_marks["live_rows"] = len(drives)
+                if startup_trace.enabled:
+                    GLib.idle_add(self.print_startup_trace)
+                if self.benchmark_startup:
+                    GLib.idle_add(self.finish_startup_benchmark)
+            
+            if self.auto_mount_pending:
+                self.auto_mount_pending = False
+                threading.Thread(target=self.auto_mount_internal_drives, daemon=True).start()
+        
+        # Requests that arrived while this run was in flight collapse into one more run
+        if self.refresh_pending:
+            self.refresh_pending = False
+            self.start_refresh_worker()
+        
+        return False
     
-    def update_drive_list(self, drives):
-        """Update the drive list in the GUI"""
-        self.drive_list_store.clear()
+    def get_drive_status(self, drive):
+        """Status column text for a drive"""
+        if drive.mountpoint:
+            return "Mounted"
+        
+        # Not mounted - determine if it's ready or has issues
+        if drive.health_status == "Dirty":
+            return "Unmounted (Dirty - Needs Repair)"
+        elif drive.health_status == "Error" and drive.fstype != "Unknown":
+            # Real filesystem error
+            return "Unmounted (Error)"
+        
+        # Default: All unmounted drives are hot-swappable
+        return "Hot-Swap Ready"
+    
+    def update_drive_list(self, drives, stale=False):
+        """
+        Update the drive list in the GUI with a keyed diff
+        
+        Rows are matched by device name: unchanged rows are left alone,
+        changed rows are updated in place and only new or vanished drives
+        are inserted or removed, so selection and scroll position survive.
+        
+        Args:
+            drives: Drives to show
+            stale: True for drives from the startup snapshot, not yet rescanned
+        """
+        seen = set()
         
         for drive in drives:
-            # Determine status with better UX
-            if drive.mountpoint:
-                status = "Mounted"
-            else:
-                # Not mounted - determine if it's ready or has issues
-                if drive.health_status == "Dirty":
-                    status = "Unmounted (Dirty - Needs Repair)"
-                elif drive.health_status == "Error" and drive.fstype != "Unknown":
-                    # Real filesystem error
-                    status = "Unmounted (Error)"
-                else:
-                    # Default: All unmounted drives are hot-swappable
-                    status = "Hot-Swap Ready"
-            
-            self.drive_list_store.append([
+            values = (
                 drive.name,
-                drive.size,
+                format_size(drive.size),
                 drive.fstype,
                 drive.mountpoint or "Not mounted",
                 drive.label or "No label",
-                status
-            ])
+                self.get_drive_status(drive) + (" (last known)" if stale else ""),
+                drive.size
+            )
+            seen.add(drive.name)
+            
+            row_ref = self.drive_rows.get(drive.name)
+            if row_ref is not None and row_ref.valid():
+                if self.drive_row_values.get(drive.name) != values:
+                    treeiter = self.drive_list_store.get_iter(row_ref.get_path())
+                    self.drive_list_store.set(treeiter, list(range(len(values))), list(values))
+                    self.drive_row_values[drive.name] = values
+                continue
+            
+            treeiter = self.drive_list_store.append(list(values))
+            path = self.drive_list_store.get_path(treeiter)
+            self.drive_rows[drive.name] = Gtk.TreeRowReference.new(self.drive_list_store, path)
+            self.drive_row_values[drive.name] = values
+        
+        # Remove rows for drives that are gone
+        for name in [name for name in self.drive_rows if name not in seen]:
+            row_ref = self.drive_rows.pop(name)
+            self.drive_row_values.pop(name, None)
+            if row_ref.valid():
+                self.drive_list_store.remove(self.drive_list_store.get_iter(row_ref.get_path()))
     
     def on_drive_event(self, event_type: str, drive_info: DriveInfo):
         """Handle drive events from the drive manager"""
@@ -814,9 +1135,8 @@ class NTFSManager:
         device_path = f"/dev/{drive_info.name}"
         
         # Invalidate NTFS properties cache for this drive
-        if device_path in self.ntfs_properties_cache:
+        if self.ntfs_properties_cache.invalidate(device_path):
             self.logger.debug(f"Invalidating NTFS properties cache for {drive_info.name} due to {event_type} event")
-            del self.ntfs_properties_cache[device_path]
         
         if event_type == "added":
             self.update_status(f"Drive {drive_info.name} connected")
@@ -973,7 +1293,7 @@ class NTFSManager:
 
             # Then eject the device
             device_path = f"/dev/{self.selected_drive}"
-            result = subprocess.run(["eject", device_path], capture_output=True, text=True)
+            result = run_command(["eject", device_path], timeout=None, share=False)
 
             if result.returncode == 0:
                 self.update_status(f"Drive {self.selected_drive} ejected safely")
@@ -987,7 +1307,7 @@ class NTFSManager:
 
     def on_refresh_clicked(self, button):
         """Handle refresh button click"""
-        self.refresh_drives()
+        self.refresh_drives(rescan=True)
     
     def on_properties_clicked(self, button):
         """Handle properties button click"""
@@ -1054,6 +1374,11 @@ class NTFSManager:
     def on_destroy(self, window):
         """Handle window destroy event"""
         self.drive_manager.stop_monitoring()
+        if self.applied_refresh_generation > 0 and not self.benchmark_startup:
+            save_drive_snapshot(list(self.drive_cache.values()))
+        self.ntfs_properties_cache.save()
+        self.logger.debug(f"NTFS properties cache stats: {self.ntfs_properties_cache.get_stats()}")
+        self.logger.debug(f"Drive event metrics: {self.drive_manager.get_event_metrics()}")
         self.logger.info("NTFS Manager GUI stopped")
         Gtk.main_quit()
     
@@ -1231,7 +1556,7 @@ class NTFSManager:
         # Get drive info
         drive_info = self.drive_manager.drives.get(self.selected_drive)
         if drive_info:
-            info_text = f"Size: {drive_info.size}\nModel: {drive_info.model or 'Unknown'}"
+            info_text = f"Size: {format_size(drive_info.size)}\nModel: {drive_info.model or 'Unknown'}"
             info_label = Gtk.Label(label=info_text)
             target_box.pack_start(target_label, False, False, 5)
             target_box.pack_start(info_label, False, False, 5)
@@ -1426,8 +1751,8 @@ class NTFSManager:
             # Load NTFS properties
             try:
                 device_path = f"/dev/{self.selected_drive}"
-                ntfs_props = NTFSProperties(device_path)
-                ntfs_details = ntfs_props.get_all_properties()
+                ntfs_props = ntfs_properties.NTFSProperties(device_path)
+                ntfs_details = ntfs_props.get_sections(("volume", "security"))
                 
                 # Format NTFS properties
                 ntfs_content = self.format_ntfs_properties(ntfs_details)
@@ -1455,7 +1780,7 @@ class NTFSManager:
         # Load health information
         try:
             device_path = f"/dev/{self.selected_drive}"
-            ntfs_props = NTFSProperties(device_path)
+            ntfs_props = ntfs_properties.NTFSProperties(device_path)
             health_results = ntfs_props.run_disk_check()
             health_content = self.format_health_results(health_results)
             health_buffer = health_text.get_buffer()
@@ -1618,8 +1943,50 @@ def check_single_instance():
         sys.exit(0)
 
 def main():
-    # Check for single instance
-    lock_fd = check_single_instance()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="NTFS Complete Manager")
+    parser.add_argument("--benchmark-startup", action="store_true",
+                        help="Report startup timings (time to first paint, live reconcile) as JSON and exit")
+    parser.add_argument("--trace-startup", action="store_true",
+                        help="Print an import-time and phase-time breakdown once startup completes")
+    parser.add_argument("--profile", action="store_true",
+                        help="Print per-tool and per-device timings of external commands on exit; "
+                             "uses a local drive manager, not the daemon")
+    parser.add_argument("--profile-trace", metavar="FILE",
+                        help="Write the external commands as a Chrome trace JSON timeline on exit "
+                             "(implies --profile)")
+    parser.add_argument("--record-commands", metavar="FILE",
+                        help="Record external command outputs and timings to a replayable corpus on exit "
+                             "(see benchmarks/bench_replay.py); uses a local drive manager, not the daemon")
+    args = parser.parse_args()
+    
+    # Profiling and recording modules are only imported when asked for
+    profiling = bool(args.profile or args.profile_trace)
+    if profiling:
+        try:
+            from command_profile import start_profiling, stop_profiling
+        except ImportError as e:
+            print(f"Warning: Command profiling not available: {e}")
+            profiling = False
+        else:
+            # The commands to profile must run in this process, not in the daemon
+            os.environ[NO_DAEMON_ENV] = "1"
+            start_profiling()
+    recording = bool(args.record_commands)
+    if recording:
+        try:
+            from command_corpus import start_recording, stop_corpus
+        except ImportError as e:
+            print(f"Warning: Command recording not available: {e}")
+            recording = False
+        else:
+            # Mounts and probes must run in this process to be recorded
+            os.environ[NO_DAEMON_ENV] = "1"
+            start_recording()
+    
+    # Check for single instance (a benchmark run may start next to the real app)
+    lock_fd = None if args.benchmark_startup else check_single_instance()
     
     # Set GTK application properties for proper window grouping
     # This ensures the window appears under the correct launcher icon
@@ -1631,14 +1998,28 @@ def main():
     GLib.set_prgname("ntfs-complete-manager")
     GLib.set_application_name("NTFS Complete Manager")
     
-    app = NTFSManager()
+    with startup_trace.phase("NTFSManager()"):
+        app = NTFSManager(auto_mount=not args.benchmark_startup,
+                          benchmark_startup=args.benchmark_startup)
     
     # Set window class name for proper icon binding
     app.window.set_wmclass("ntfs-complete-manager", "ntfs-complete-manager")
     
     Gtk.main()
     
+    if profiling:
+        profile = stop_profiling()
+        print(profile.report())
+        if args.profile_trace and profile.export_chrome_trace(args.profile_trace):
+            print(f"[PROFILE] Chrome trace written to {args.profile_trace}")
+    if recording:
+        corpus = stop_corpus()
+        if corpus is not None and corpus.save(args.record_commands):
+            print(f"[CORPUS] Commands recorded to {args.record_commands}")
+    
     # Cleanup lock file on exit
+    if lock_fd is None:
+        return
     try:
         fcntl.flock(lock_fd.fileno(), fcntl.LOCK_UN)
         lock_fd.close()
@@ -0,0 +1 @@
+"""NTFS Complete Manager Test Suite"""
@@ -0,0 +1,12 @@
+"""Shared pytest configuration: make the backend and benchmark modules importable"""
+
+import os
+import sys
+
+BACKEND_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+if BACKEND_PATH not in sys.path:
+    sys.path.insert(0, BACKEND_PATH)
+
+BENCHMARKS_PATH = os.path.join(os.path.dirname(BACKEND_PATH), 'benchmarks')
+if BENCHMARKS_PATH not in sys.path:
+    sys.path.insert(0, BENCHMARKS_PATH)
@@ -0,0 +1,47 @@
+"""Enumeration benchmark and synthetic system tests"""
+
+import json
+import os
+
+from bench_enumeration import bench_devices, compare
+from synthetic_system import build_system, make_devices
+
+
+def test_device_layout_scales_to_requested_count():
+    for count in (1, 5, 1000):
+        devices = make_devices(count)
+        assert len(devices) == count
+        assert len({device.name for device in devices}) == count
+    names = [device.name for device in make_devices(200)]
+    assert "sdz" in names and "nvme0n1" in names and "nvme0n1p1" in names
+
+
+def test_synthetic_system_tree(tmp_path):
+    system = build_system(str(tmp_path), 8, latency={"smartctl": 0.01})
+    assert os.path.islink(os.path.join(system.sys_root, "block", "sda"))
+    with open(os.path.join(system.sys_root, "class", "block", "sda1", "dev")) as f:
+        assert f.read().strip() == "8:1"
+    with open(os.path.join(system.root, "data", "lsblk.json")) as f:
+        disks = json.load(f)["blockdevices"]
+    assert [disk["name"] for disk in disks] == ["sda", "sdb"]
+    assert len(disks[0]["children"]) == 3
+    with open(os.path.join(system.bin_dir, "smartctl")) as f:
+        assert "sleep 0.01" in f.read()
+
+
+def test_benchmark_enumerates_every_device():
+    result = bench_devices(6, runs=1)
+    assert result["drives_found"] == 6
+    assert result["subprocesses_by_tool"]["lsblk"] >= 1
+    assert result["subprocesses"] == sum(result["subprocesses_by_tool"].values())
+    json.dumps(result)
+
+
+def test_compare_flags_slower_and_busier_refreshes():
+    def results(median, commands):
+        return {"results": [{"devices": 10, "refresh_ms": {"median": median}, "subprocesses": commands}]}
+
+    assert compare(results(110.0, 50), results(100.0, 50)) == []
+    assert len(compare(results(130.0, 50), results(100.0, 50))) == 1
+    assert len(compare(results(100.0, 51), results(100.0, 50))) == 1
+    assert compare(results(500.0, 90), {"results": []}) == []
@@ -0,0 +1,110 @@
+"""Command corpus record and replay tests"""
+
+import os
+import sys
+import time
+
+import pytest
+
+from command_corpus import CommandCorpus, CorpusMiss, RecordedCommand
+from command_runner import CORPUS_RECORD, CORPUS_REPLAY, TIMEOUT_RETURNCODE, CommandRunner
+
+
+def test_recorded_commands_replay_without_running(tmp_path):
+    tool = tmp_path / "probe-tool"
+    tool.write_text("#!/bin/sh\necho \"probed $1\"\necho warn >&2\nexit 3\n")
+    tool.chmod(0o755)
+
+    corpus = CommandCorpus()
+    runner = CommandRunner()
+    runner.use_corpus(corpus, CORPUS_RECORD)
+    recorded = runner.run([str(tool), "/dev/sdb1"])
+    assert recorded.stdout == "probed /dev/sdb1\n"
+    path = tmp_path / "corpus.json"
+    assert corpus.save(str(path))
+
+    tool.unlink()
+    runner.use_corpus(CommandCorpus.load(str(path)), CORPUS_REPLAY, speed=0.0)
+    replayed = runner.run([str(tool), "/dev/sdb1"])
+    assert (replayed.returncode, replayed.stdout, replayed.stderr) == (3, "probed /dev/sdb1\n", "warn\n")
+
+    runner.use_corpus(None)
+    with pytest.raises(FileNotFoundError):
+        runner.run([str(tool), "/dev/sdb1"])
+
+
+def test_replay_order_misses_and_timeouts():
+    corpus = CommandCorpus([
+        RecordedCommand(["smartctl", "-H", "/dev/sda"], 0, "first", "", 0.0),
+        RecordedCommand(["smartctl", "-H", "/dev/sda"], 0, "second", "", 0.0),
+        RecordedCommand(["ntfsinfo", "/dev/sda1"], 0, "slow", "", 5.0),
+    ])
+    args = ["smartctl", "-H", "/dev/sda"]
+    assert [corpus.replay(args, None, None, 0.0)[0].stdout for _ in range(3)] == ["first", "second", "second"]
+    corpus.rewind()
+    assert corpus.replay(args, None, None, 0.0)[0].stdout == "first"
+
+    result, timed_out = corpus.replay(["ntfsinfo", "/dev/sda1"], None, 1.0, 0.0)
+    assert timed_out and result.returncode == TIMEOUT_RETURNCODE
+
+    with pytest.raises(CorpusMiss):
+        corpus.replay(["lsblk", "-J"], None, None, 0.0)
+    assert corpus.misses == [["lsblk", "-J"]]
+    assert [entry.tool for entry in corpus.for_tool("smartctl")] == ["smartctl", "smartctl"]
+
+
+def test_replay_speed_scales_recorded_duration():
+    corpus = CommandCorpus([RecordedCommand(["udevadm", "info"], 0, "", "", 0.2)])
+    start = time.monotonic()
+    corpus.replay(["udevadm", "info"], None, None, 0.5)
+    assert 0.09 <= time.monotonic() - start < 0.5
+
+
+def test_refresh_replays_from_synthetic_recording(tmp_path):
+    from bench_replay import record, replay
+    from synthetic_system import build_system
+
+    system = build_system(str(tmp_path / "system"), 8)
+    original = os.environ["PATH"]
+    os.environ["PATH"] = system.path_env(original)
+    try:
+        corpus = record(system.sys_root, gparted=False)
+    finally:
+        os.environ["PATH"] = original
+
+    results = replay(corpus, runs=1, sys_root=system.sys_root, min_time=0.01)
+    assert results["refresh"]["instant"]["drives_found"] == 8
+    assert results["refresh"]["instant"]["corpus_misses"] == 0
+    assert results["parsers"]["smartctl"]["samples"] > 0
+
+
+def test_udisks_mount_errors_are_recorded_for_the_mount_error_parser():
+    from bench_replay import PARSERS
+    from command_corpus import start_recording, stop_corpus
+    from drive_manager import DriveManager, UDISKS_DBUS_TOOL
+    from udisks_client import UDisksError
+
+    class FailingUDisks:
+        def mount(self, drive_name, options="", fstype=None):
+            raise UDisksError("org.freedesktop.UDisks2.Error.Failed",
+                              "Error mounting /dev/sdz1: volume is dirty, run chkdsk /f")
+
+        def unmount(self, drive_name):
+            pass
+
+    manager = DriveManager()
+    manager.udisks = FailingUDisks()
+    corpus = start_recording()
+    try:
+        assert manager._udisks_mount("sdz1", "ro", "ntfs")[0] is False
+        assert manager._udisks_unmount("sdz1") == (True, "")
+    finally:
+        stop_corpus()
+
+    mount, unmount = corpus.for_tool(UDISKS_DBUS_TOOL)
+    assert mount.args == [UDISKS_DBUS_TOOL, "mount", "/dev/sdz1", "-o", "ro", "-t", "ntfs"]
+    assert mount.returncode == 1 and "dirty" in mount.stderr
+    assert unmount.returncode == 0
+
+    tools, accepts, _ = PARSERS["mount_error"]
+    assert [entry for tool in tools for entry in corpus.for_tool(tool) if accepts(entry)] == [mount]
@@ -0,0 +1,67 @@
+"""Command profile tests"""
+
+import json
+import sys
+
+from command_profile import CommandProfile, aggregate, percentile
+from command_runner import CommandRunner, CommandTiming
+
+
+def _timing(tool, device, started, duration, returncode=0, output_bytes=0):
+    return CommandTiming(tool, device, started, duration, returncode,
+                         output_bytes=output_bytes, thread=1)
+
+
+def test_percentiles_use_nearest_rank():
+    values = [float(value) for value in range(1, 21)]
+    assert percentile(values, 0.50) == 10.0
+    assert percentile(values, 0.95) == 19.0
+    assert percentile([3.0], 0.95) == 3.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_aggregates_per_tool_and_device():
+    timings = [
+        _timing("smartctl", "sda", 0.0, 0.4, output_bytes=100),
+        _timing("smartctl", "sdb", 0.1, 0.2, returncode=2, output_bytes=50),
+        _timing("lsblk", "", 0.0, 0.05),
+    ]
+    by_tool = aggregate(timings, "tool")
+    assert list(by_tool) == ["smartctl", "lsblk"]
+    assert by_tool["smartctl"].count == 2
+    assert by_tool["smartctl"].max == 0.4
+    assert by_tool["smartctl"].failures == 1
+    assert by_tool["smartctl"].output_bytes == 150
+
+    by_device = aggregate(timings, "device")
+    assert set(by_device) == {"sda", "sdb", "-"}
+
+    report = CommandProfile(timings).report()
+    assert "3 commands" in report and "smartctl" in report and "sdb" in report
+
+
+def test_chrome_trace_export(tmp_path):
+    profile = CommandProfile([_timing("ntfsinfo", "sdb", 10.0, 0.25),
+                              _timing("lsblk", "", 9.5, 0.01)])
+    path = tmp_path / "trace.json"
+    assert profile.export_chrome_trace(str(path))
+
+    events = json.loads(path.read_text())["traceEvents"]
+    assert [event["name"] for event in events] == ["lsblk", "ntfsinfo"]
+    assert events[0]["ts"] == 0 and events[1]["ts"] == 500000.0
+    assert events[1]["dur"] == 250000.0
+    assert events[1]["ph"] == "X" and events[1]["args"]["device"] == "sdb"
+
+
+def test_runner_keeps_every_timing_while_profiling():
+    runner = CommandRunner()
+    runner.run([sys.executable, "-c", "print('x' * 9)"])
+    runner.start_profile()
+    runner.run([sys.executable, "-c", "print('x' * 9)"])
+    runner.record(["ntfsinfo", "/dev/sdb1"], 0.0, 1, output_bytes=42)
+    timings = runner.stop_profile()
+
+    assert [timing.source for timing in timings] == ["run", "probe"]
+    assert timings[0].output_bytes == 10
+    assert timings[1].device == "sdb" and timings[1].output_bytes == 42
+    assert not runner.profiling and runner.stop_profile() == []
@@ -0,0 +1,96 @@
+"""Command runner tests"""
+
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from command_runner import CommandRunner, TIMEOUT_RETURNCODE, command_device, disk_of, tool_name
+
+PYTHON = sys.executable
+
+
+def _sleep_command(seconds, marker=""):
+    return [PYTHON, "-c", f"import time; time.sleep({seconds}); print('done{marker}')"]
+
+
+def test_names_tools_and_disks():
+    assert tool_name(["sudo", "ntfsinfo", "-m", "/dev/sdb1"]) == "ntfsinfo"
+    assert tool_name(["/usr/sbin/smartctl", "-H", "/dev/sda"]) == "smartctl"
+    assert disk_of("/dev/sdb1") == "sdb"
+    assert disk_of("/dev/nvme0n1p2") == "nvme0n1"
+    assert disk_of("/dev/mmcblk0p1") == "mmcblk0"
+    assert disk_of("/dev/nvme0n1") == "nvme0n1"
+    assert disk_of("sdb1") == ""
+    assert command_device(["smartctl", "-A", "/dev/sdc3"]) == "sdc"
+
+
+def test_timeout_is_reported_as_killed_process():
+    runner = CommandRunner()
+    result = runner.run(_sleep_command(5), timeout=0.2)
+    assert result.returncode == TIMEOUT_RETURNCODE
+    assert "timed out" in result.stderr
+
+    with pytest.raises(subprocess.CalledProcessError):
+        runner.run(_sleep_command(5), timeout=0.2, check=True)
+    assert runner.get_stats()[tool_name(_sleep_command(5))]["timeouts"] == 2
+
+
+def test_identical_commands_share_one_run():
+    runner = CommandRunner()
+    command = _sleep_command(0.3)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(runner.run(command)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert [result.stdout for result in results] == ["done\n"] * 4
+    stats = runner.get_stats()[tool_name(command)]
+    assert stats["runs"] == 1 and stats["shared"] == 3
+
+
+def test_cache_keeps_only_successful_results():
+    runner = CommandRunner()
+    ok = [PYTHON, "-c", "print('ok')"]
+    failing = [PYTHON, "-c", "import sys; sys.exit(3)"]
+
+    runner.run(ok, cache_ttl=60)
+    runner.run(ok, cache_ttl=60)
+    runner.run(failing, cache_ttl=60)
+    assert runner.run(failing, cache_ttl=60).returncode == 3
+
+    stats = runner.get_stats()[tool_name(ok)]
+    assert stats["cached"] == 1 and stats["runs"] == 3
+
+    runner.invalidate()
+    runner.run(ok, cache_ttl=60)
+    assert runner.get_stats()[tool_name(ok)]["runs"] == 4
+
+
+def test_per_device_cap_serializes_one_disk():
+    runner = CommandRunner(max_per_device=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=runner.run,
+                                args=(_sleep_command(0.3, marker=index),),
+                                kwargs={"device": "sdb"})
+               for index in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert time.monotonic() - start >= 0.9
+    assert all(timing.device == "sdb" for timing in runner.get_timings())
+
+
+def test_missing_tool_raises_like_subprocess():
+    runner = CommandRunner()
+    with pytest.raises(FileNotFoundError):
+        runner.run(["ntfs-manager-no-such-tool"])
+    with pytest.raises(FileNotFoundError):
+        runner.run(["ntfs-manager-no-such-tool"], share=False)
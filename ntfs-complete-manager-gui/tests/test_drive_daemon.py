@@ -0,0 +1,150 @@
+"""Drive daemon tests: a daemon on a temporary socket serving a stand-in manager"""
+
+import threading
+from dataclasses import replace
+
+import pytest
+
+from drive_daemon import DaemonError, DriveDaemon, DriveDaemonClient, RemoteDriveManager
+from drive_manager import DriveInfo, DriveStateTracker
+
+
+class StandInManager:
+    """Just enough of DriveManager to serve, with a counter for enumerations"""
+
+    def __init__(self, drives):
+        self.drives = {drive.name: drive for drive in drives}
+        self.state = DriveStateTracker()
+        self.enumerations = 0
+
+    def subscribe(self, callback, since=None):
+        return self.state.subscribe(callback, since)
+
+    def unsubscribe(self, token):
+        self.state.unsubscribe(token)
+
+    def notify_callbacks(self, event_type, drive_info):
+        self.state.update(drive_info, event_type, force=True)
+
+    def refresh_drives(self):
+        self.enumerations += 1
+        self.state.replace_all(list(self.drives.values()))
+        return list(self.drives.values())
+
+    def get_generation(self, drive_name):
+        return f"1::{self.drives[drive_name].mountpoint}"
+
+    def mount_drive(self, drive_name, mount_point=None, options=""):
+        drive = replace(self.drives[drive_name], mountpoint=mount_point or f"/media/{drive_name}")
+        self.drives[drive_name] = drive
+        self.notify_callbacks("mounted", drive)
+        return True
+
+    def start_monitoring(self):
+        pass
+
+    def stop_monitoring(self):
+        pass
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    manager = StandInManager([
+        DriveInfo(name="sdb", size="1T", fstype="", mountpoint="", label=""),
+        DriveInfo(name="sdb1", size="1T", fstype="ntfs", mountpoint="", label="DATA"),
+    ])
+    daemon = DriveDaemon(tmp_path / "daemon.sock", manager)
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    client = DriveDaemonClient(daemon.socket_path)
+    for _ in range(200):
+        if client.is_running():
+            break
+        threading.Event().wait(0.01)
+    yield daemon
+    daemon.shutdown()
+    thread.join(5)
+
+
+def test_clients_share_one_enumeration(daemon):
+    first = RemoteDriveManager(DriveDaemonClient(daemon.socket_path))
+    second = RemoteDriveManager(DriveDaemonClient(daemon.socket_path))
+
+    assert [drive.name for drive in first.get_all_drives()] == ["sdb", "sdb1"]
+    assert second.get_all_drives()[1].label == "DATA"
+    assert second.get_generation("sdb1") == "1::"
+    assert daemon.manager.enumerations == 1
+
+
+def test_errors_are_reported_to_the_client(daemon):
+    client = DriveDaemonClient(daemon.socket_path)
+    with pytest.raises(DaemonError, match="unknown method"):
+        client.call("erase_everything")
+    with pytest.raises(DaemonError, match="bad parameters"):
+        client.call("get_generation", wrong="sdb1")
+
+
+def test_subscribers_receive_snapshot_then_events(daemon):
+    watcher = RemoteDriveManager(DriveDaemonClient(daemon.socket_path))
+    events = []
+    mounted = threading.Event()
+
+    def on_event(event_type, drive_info):
+        events.append((event_type, drive_info.name, drive_info.mountpoint))
+        if event_type == "mounted":
+            mounted.set()
+
+    watcher.add_callback(on_event)
+    watcher.start_monitoring()
+    for _ in range(200):
+        if len(watcher.drives) == 2:
+            break
+        threading.Event().wait(0.01)
+
+    assert RemoteDriveManager(DriveDaemonClient(daemon.socket_path)).mount_drive("sdb1")
+    assert mounted.wait(5)
+    watcher.stop_monitoring()
+    assert watcher.events.flush()
+
+    assert events[:2] == [("added", "sdb", ""), ("added", "sdb1", "")]
+    assert events[-1] == ("mounted", "sdb1", "/media/sdb1")
+    assert watcher.drives["sdb1"].mountpoint == "/media/sdb1"
+    assert watcher.seq == daemon.manager.state.seq
+
+
+def test_late_client_catches_up_from_a_sequence_number(daemon):
+    client = DriveDaemonClient(daemon.socket_path)
+    start = client.call("get_changes")
+    assert start["event"] == "snapshot"
+
+    RemoteDriveManager(client).mount_drive("sdb1", "/mnt/x")
+    changes = client.call("get_changes", since=start["seq"])
+    assert changes["seq"] == start["seq"] + 1
+    assert changes["deltas"] == [{"event": "delta", "seq": start["seq"] + 1, "name": "sdb1",
+                                  "cause": "mounted", "changes": {"mountpoint": ["", "/mnt/x"]}}]
+    assert client.call("get_changes", since=start["seq"] + 1)["deltas"] == []
+
+
+def test_second_daemon_refuses_a_live_socket(daemon):
+    with pytest.raises(DaemonError, match="already listening"):
+        DriveDaemon(daemon.socket_path, daemon.manager).serve_forever()
+    assert DriveDaemonClient(daemon.socket_path).is_running()
+
+
+def test_socket_directory_is_created_private_and_existing_ones_are_left_alone(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir(mode=0o777)
+    shared.chmod(0o777)
+    DriveDaemon(shared / "daemon.sock", StandInManager([]))._prepare_socket()
+    assert shared.stat().st_mode & 0o777 == 0o777
+
+    own = tmp_path / "runtime" / "ntfs-manager"
+    DriveDaemon(own / "daemon.sock", StandInManager([]))._prepare_socket()
+    assert own.stat().st_mode & 0o777 == 0o700
+
+
+def test_unusable_socket_path_is_a_daemon_error(tmp_path):
+    (tmp_path / "file").write_text("")
+
+    with pytest.raises(DaemonError, match="cannot set up"):
+        DriveDaemon(tmp_path / "file" / "daemon.sock", StandInManager([])).serve_forever()
@@ -0,0 +1,42 @@
+"""Drive snapshot persistence tests"""
+
+import json
+
+from drive_manager import DriveInfo
+from drive_snapshot import drive_identity, load_drive_snapshot, save_drive_snapshot
+
+
+def test_round_trip_keeps_order_and_fields(tmp_path):
+    path = tmp_path / "drives.json"
+    drives = [
+        DriveInfo(name="sdb", size="1T", fstype="", mountpoint="", label="", serial="WD123"),
+        DriveInfo(name="sdb1", size="1T", fstype="ntfs", mountpoint="/media/data",
+                  label="DATA", uuid="01D9F00DCAFE0001", is_removable=True),
+    ]
+    assert save_drive_snapshot(drives, path)
+
+    restored = load_drive_snapshot(path)
+    assert [drive.name for drive in restored] == ["sdb", "sdb1"]
+    assert restored[1] == drives[1]
+    assert set(json.loads(path.read_text())["drives"]) == {
+        "serial:WD123:sdb", "uuid:01D9F00DCAFE0001"}
+
+
+def test_identity_prefers_uuid_then_serial():
+    assert drive_identity(DriveInfo("sdc1", "", "", "", "", serial="S", uuid="U")) == "uuid:U"
+    assert drive_identity(DriveInfo("sdc", "", "", "", "", serial="S")) == "serial:S:sdc"
+    assert drive_identity(DriveInfo("loop0", "", "", "", "")) == "name:loop0"
+
+
+def test_unknown_fields_and_bad_files_are_tolerated(tmp_path):
+    path = tmp_path / "drives.json"
+    path.write_text(json.dumps({"version": 1, "drives": {
+        "name:sdd": {"name": "sdd", "size": "8G", "fstype": "", "mountpoint": "",
+                     "label": "", "removed_field": 1},
+        "broken": {"size": "1G"},
+    }}))
+    assert [drive.name for drive in load_drive_snapshot(path)] == ["sdd"]
+
+    path.write_text("not json")
+    assert load_drive_snapshot(path) is None
+    assert load_drive_snapshot(tmp_path / "missing.json") is None
@@ -0,0 +1,57 @@
+"""Versioned drive table and field-level delta tests"""
+
+from drive_manager import DriveInfo, DriveStateSnapshot, DriveStateTracker
+
+
+def _drive(name, **kwargs):
+    values = dict(size="1T", fstype="ntfs", mountpoint="", label="")
+    values.update(kwargs)
+    return DriveInfo(name=name, **values)
+
+
+def test_enumeration_produces_field_level_deltas():
+    state = DriveStateTracker()
+    added = state.replace_all([_drive("sdb"), _drive("sdb1", temperature=41.0)])
+    assert [(delta.seq, delta.name, delta.event) for delta in added] == [
+        (1, "sdb", "added"), (2, "sdb1", "added")]
+
+    assert state.replace_all([_drive("sdb"), _drive("sdb1", temperature=41.0)]) == []
+
+    changed = state.replace_all([_drive("sdb1", temperature=44.0, mountpoint="/media/x")])
+    assert [str(delta) for delta in changed] == [
+        "sdb1.mountpoint: '' -> '/media/x', sdb1.temperature: 41.0 -> 44.0",
+        "sdb: removed",
+    ]
+    # Removals keep the last known details instead of a blank placeholder
+    assert changed[1].changes["size"] == (2 ** 40, None)
+    assert state.seq == 4
+
+
+def test_explicit_events_are_recorded_even_without_changes():
+    state = DriveStateTracker()
+    state.update(_drive("sdb1"))
+    assert state.update(_drive("sdb1")) is None
+    delta = state.update(_drive("sdb1"), "dirty_volume", force=True)
+    assert (delta.event, delta.changes) == ("dirty_volume", {})
+
+
+def test_subscribers_catch_up_from_history_or_get_a_snapshot():
+    state = DriveStateTracker(history=2)
+    for temperature in (40.0, 41.0, 42.0):
+        state.update(_drive("sdc", temperature=temperature))
+
+    received = []
+    state.subscribe(received.append, since=1)
+    assert [delta.seq for delta in received] == [2, 3]
+
+    late = []
+    token = state.subscribe(late.append, since=0)  # seq 1 fell out of the history
+    assert isinstance(late[0], DriveStateSnapshot)
+    assert late[0].seq == 3 and late[0].drives["sdc"]["temperature"] == 42.0
+
+    state.update(_drive("sdc", temperature=43.0))
+    state.unsubscribe(token)
+    state.update(_drive("sdc", temperature=44.0))
+    assert [item.seq for item in late] == [3, 4]
+    assert [delta.seq for delta in received] == [2, 3, 4, 5]
+    assert state.changes_since(9) is None
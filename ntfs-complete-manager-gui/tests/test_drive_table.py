@@ -0,0 +1,111 @@
+"""Drive record and copy-on-write drive table tests"""
+
+import dataclasses
+import json
+import subprocess
+import threading
+
+import pytest
+
+import drive_manager
+from drive_manager import DriveInfo, DriveManager, FsType, Health, format_size, parse_size
+
+
+def _drive(name, **kwargs):
+    values = dict(size="1T", fstype="ntfs", mountpoint="", label="")
+    values.update(kwargs)
+    return DriveInfo(name=name, **values)
+
+
+def _within(seconds, func):
+    """Run func on a thread and fail (instead of hanging) if it doesn't finish"""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(func()), daemon=True)
+    thread.start()
+    thread.join(seconds)
+    assert not thread.is_alive(), "timed out, possible deadlock"
+    return result[0]
+
+
+def _fake_lsblk(monkeypatch, manager, names):
+    output = json.dumps({"blockdevices": [{"name": name} for name in names]})
+    monkeypatch.setattr(drive_manager, "run_command", lambda args, **kwargs:
+                        subprocess.CompletedProcess(args, 0, stdout=output, stderr=""))
+    monkeypatch.setattr(manager, "_parse_device_info", lambda device: _drive(device["name"]))
+
+
+def test_drive_info_is_immutable():
+    drive = _drive("sdb1")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        drive.mountpoint = "/media/x"
+    assert dataclasses.replace(drive, mountpoint="/media/x").mountpoint == "/media/x"
+
+
+def test_drive_info_is_compact_and_numeric():
+    drive = DriveInfo("sdb1", "931.5G", "ntfs", "", "", health_status="Dirty", major=8, minor=17)
+    assert drive.size == 1000190509056
+    assert drive.fstype is FsType.NTFS and drive.fstype == "ntfs"
+    assert drive.health_status is Health.DIRTY and f"{drive.health_status}" == "Dirty"
+    assert DriveInfo("sdc1", 0, "zfs_member", "", "").fstype == "zfs_member"
+    assert not hasattr(drive, "__dict__")
+    assert sorted([_drive("a", size=2 ** 40), _drive("b", size=500 * 2 ** 30)],
+                  key=lambda d: d.size)[0].name == "b"
+
+
+def test_size_formatting_and_parsing():
+    assert [format_size(size) for size in (512, 1536, 1000204886016, 2 ** 40)] == [
+        "512B", "1.5K", "931.5G", "1T"]
+    assert parse_size(" 8G ") == 8 * 2 ** 30
+    assert parse_size("4KiB") == 4096
+    assert parse_size("bogus") == 0
+
+
+def test_updates_publish_new_versions_and_keep_old_ones():
+    manager = DriveManager()
+    manager.update_drives({"sdb": _drive("sdb"), "sdb1": _drive("sdb1")})
+    before = manager.get_drive_table()
+
+    manager.update_drives({"sdb1": None, "sdc": _drive("sdc")})
+    after = manager.get_drive_table()
+
+    assert after.version == before.version + 1
+    assert sorted(before.drives) == ["sdb", "sdb1"]
+    assert sorted(after.drives) == ["sdb", "sdc"]
+    assert manager.drives is after.drives
+    with pytest.raises(TypeError):
+        manager.drives["sdd"] = _drive("sdd")
+
+
+def test_replace_all_drops_missing_drives():
+    manager = DriveManager()
+    manager.update_drives({"sdb": _drive("sdb"), "sdb1": _drive("sdb1")})
+    manager.update_drives({"sdc": _drive("sdc")}, replace_all=True)
+    assert list(manager.drives) == ["sdc"]
+
+
+def test_update_drive_replaces_one_entry():
+    manager = DriveManager()
+    manager.update_drives({"sdb1": _drive("sdb1")})
+    old = manager.drives
+
+    drive = _within(5, lambda: manager._update_drive("sdb1", mountpoint="/media/x"))
+    assert drive.mountpoint == "/media/x"
+    assert manager.drives["sdb1"] is drive
+    assert old["sdb1"].mountpoint == ""
+    assert manager._update_drive("sdz", mountpoint="/media/z") is None
+
+
+def test_refresh_reports_each_change_once(monkeypatch):
+    manager = DriveManager()
+    events = []
+    manager.add_callback(lambda event, drive: events.append((event, drive.name)))
+
+    _fake_lsblk(monkeypatch, manager, ["sdb", "sdc"])
+    _within(5, manager.refresh_drives)
+    _within(5, manager.refresh_drives)
+    _fake_lsblk(monkeypatch, manager, ["sdb"])
+    _within(5, manager.refresh_drives)
+
+    assert manager.events.flush()
+    assert events == [("added", "sdb"), ("added", "sdc"), ("removed", "sdc")]
+    assert list(manager.drives) == ["sdb"]
@@ -0,0 +1,89 @@
+"""Drive event bus tests"""
+
+import threading
+import time
+
+import pytest
+
+from drive_manager import (DriveInfo, EventBus, POLICY_DROP_NEWEST, POLICY_DROP_OLDEST,
+                           POLICY_MERGE)
+
+
+def _drive(name, mountpoint=""):
+    return DriveInfo(name=name, size="", fstype="ntfs", mountpoint=mountpoint, label="")
+
+
+def _blocked_subscriber(bus, policy, max_queue=3):
+    """Subscriber stuck in its first callback until the returned event is set"""
+    release = threading.Event()
+    started = threading.Event()
+    received = []
+
+    def callback(event_type, drive_info):
+        started.set()
+        release.wait(5)
+        received.append((event_type, drive_info.name, drive_info.mountpoint))
+
+    bus.subscribe(callback, name="slow", policy=policy, max_queue=max_queue)
+    bus.publish("added", _drive("sda"))
+    assert started.wait(5)
+    return release, received
+
+
+def test_slow_subscriber_does_not_block_publisher_or_others():
+    bus = EventBus()
+    release, _ = _blocked_subscriber(bus, POLICY_MERGE)
+    fast = []
+    bus.subscribe(lambda event_type, drive_info: fast.append(event_type), name="fast")
+
+    start = time.monotonic()
+    bus.publish("mounted", _drive("sdb1"))
+    assert time.monotonic() - start < 0.5
+
+    for _ in range(200):
+        if fast:
+            break
+        time.sleep(0.01)
+    assert fast == ["mounted"]
+
+    metrics = bus.get_metrics()
+    slow = next(stats for name, stats in metrics.items() if name.startswith("slow"))
+    assert slow["depth"] == 1 and slow["delivered"] == 0
+    release.set()
+    assert bus.flush()
+    bus.close()
+
+
+def test_merge_coalesces_repeated_events_without_reordering():
+    bus = EventBus()
+    release, received = _blocked_subscriber(bus, POLICY_MERGE)
+    bus.publish("changed", _drive("sdb1", "/a"))
+    bus.publish("changed", _drive("sdb1", "/b"))  # merged into the queued one
+    bus.publish("unmounted", _drive("sdb1"))
+    bus.publish("mounted", _drive("sdb1", "/c"))  # not merged: would jump the unmount
+    release.set()
+    assert bus.flush()
+
+    assert received[1:] == [("changed", "sdb1", "/b"), ("unmounted", "sdb1", ""),
+                            ("mounted", "sdb1", "/c")]
+    stats = next(iter(bus.get_metrics().values()))
+    assert (stats["merged"], stats["dropped"], stats["delivered"]) == (1, 0, 4)
+    assert stats["max_latency"] >= stats["avg_latency"] > 0
+    bus.close()
+
+
+@pytest.mark.parametrize("policy,expected", [
+    (POLICY_DROP_OLDEST, ["sdc", "sdd", "sde"]),
+    (POLICY_DROP_NEWEST, ["sdb", "sdc", "sdd"]),
+])
+def test_full_queue_drops_by_policy(policy, expected):
+    bus = EventBus()
+    release, received = _blocked_subscriber(bus, policy)
+    for name in ("sdb", "sdc", "sdd", "sde"):
+        bus.publish("added", _drive(name))
+    release.set()
+    assert bus.flush()
+
+    assert [name for _, name, _ in received[1:]] == expected
+    assert next(iter(bus.get_metrics().values()))["dropped"] == 1
+    bus.close()
@@ -0,0 +1,49 @@
+"""Mount point index tests"""
+
+import os
+
+from drive_manager import DriveInfo
+from mount_index import MountIndex
+
+
+def _drive(name, mountpoint):
+    return DriveInfo(name=name, size="", fstype="ntfs", mountpoint=mountpoint, label="")
+
+
+def test_longest_prefix_on_component_boundaries():
+    data = _drive("sdb1", "/mnt/data")
+    nested = _drive("sdc1", "/mnt/data/archive")
+    index = MountIndex([data, nested, _drive("sdd1", "")])
+
+    assert index.lookup("/mnt/data") is data
+    assert index.lookup("/mnt/data/docs/a.txt") is data
+    assert index.lookup("/mnt/data/archive/2020/b.txt") is nested
+    assert index.lookup("/mnt/data2/file") is None
+    assert index.lookup("/mnt") is None
+    assert index.lookup("relative/path") is None
+    assert index.by_name["sdd1"].mountpoint == ""
+
+
+def test_root_mount_and_trailing_slashes():
+    root = _drive("sda2", "/")
+    media = _drive("sdb1", "/media/user/USB DRIVE/")
+    index = MountIndex([root, media])
+
+    assert index.lookup("/home/user") is root
+    assert index.lookup("/media/user/USB DRIVE/photo.jpg") is media
+    assert index.lookup("/media/user/USB") is root
+
+
+def test_device_map_only_holds_real_mounts_of_selected_types(tmp_path):
+    # Nothing is mounted on these directories, so they share their parent's st_dev
+    stale = tmp_path / "stale"
+    stale.mkdir()
+    index = MountIndex([_drive("sdb1", str(stale))], device_fstypes=("ntfs",))
+    assert index.devices == {}
+    assert index.lookup(str(stale / "file")).name == "sdb1"
+
+    root = DriveInfo(name="sda2", size="", fstype="ext4", mountpoint="/", label="")
+    st_dev = os.stat("/").st_dev
+    assert MountIndex([root]).lookup_device(st_dev) is root
+    assert MountIndex([root], device_fstypes=("ntfs",)).lookup_device(st_dev) is None
+    assert st_dev in MountIndex([root], device_fstypes=("ntfs",)).known_devices
@@ -0,0 +1,127 @@
+"""Mount option tuner tests (no real NTFS volume required)"""
+
+import subprocess
+
+import drive_manager
+from drive_manager import DriveManager
+from mount_tuner import (MountOptionTuner, MountProfile, MountProfileStore,
+                         run_micro_benchmark)
+
+# What UDisks2 accepts by default (mount_options.conf): well-known types only,
+# and per type the generic allow= list plus the type's own allowlist
+UDISKS_GENERIC_ALLOW = {"exec", "noexec", "nodev", "nosuid", "atime", "noatime", "nodiratime",
+                        "relatime", "strictatime", "lazytime", "ro", "rw", "sync", "dirsync",
+                        "noload", "acl", "nosymfollow"}
+UDISKS_ALLOW = {
+    "ntfs": {"umask", "dmask", "fmask", "locale", "norecover", "ignore_case", "windows_names",
+             "compression", "nocompression", "big_writes", "nls", "nohidden", "sys_immutable",
+             "sparse", "showmeta", "prealloc"},
+    "ntfs3": {"umask", "dmask", "fmask", "iocharset", "discard", "nodiscard", "sparse", "nosparse",
+              "hidden", "nohidden", "sys_immutable", "nosys_immutable", "showmeta", "noshowmeta",
+              "prealloc", "noprealloc", "hide_dot_files", "nohide_dot_files", "windows_names",
+              "nocase", "case"},
+}
+
+
+class FakeDriveManager:
+    """Just enough of DriveManager for the tuner, mounting onto a tmp dir"""
+
+    def __init__(self, mount_root, available=("ntfs3", "ntfs-3g")):
+        self.mount_root = mount_root
+        self.available = available
+        self.mounted = []
+        self.mount_profiles = None
+
+    def _get_filesystem_type(self, device_path):
+        return "ntfs"
+
+    def _get_mount_point(self, device_path):
+        return ""
+
+    def _get_filesystem_uuid(self, drive_name):
+        return "01D9F00DCAFE0001"
+
+    def _is_ntfs_driver_available(self, driver):
+        return driver in self.available
+
+    def _udisks_mount(self, drive_name, options="", fstype=None):
+        if fstype not in UDISKS_ALLOW:
+            return False, "", (f"Requested filesystem type `{fstype}' is neither well-known "
+                               "nor in /proc/filesystems nor in /etc/filesystems")
+        for option in filter(None, options.split(",")):
+            if option not in UDISKS_GENERIC_ALLOW | UDISKS_ALLOW[fstype]:
+                return False, "", f"Mount option `{option}' is not allowed"
+        self.mounted.append((fstype, options))
+        return True, str(self.mount_root), ""
+
+    def _udisks_unmount(self, drive_name):
+        return True, ""
+
+
+def test_micro_benchmark_reports_throughput(tmp_path):
+    figures = run_micro_benchmark(str(tmp_path), size_mb=1, file_count=5)
+
+    assert figures["write_mb_s"] > 0
+    assert figures["read_mb_s"] > 0
+    assert figures["metadata_ops_s"] > 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_profile_store_round_trip(tmp_path):
+    store = MountProfileStore(tmp_path / "profiles.json")
+    store.save(MountProfile(uuid="ABCD", driver="ntfs3", options="prealloc", score=1.5))
+
+    reloaded = MountProfileStore(tmp_path / "profiles.json")
+    profile = reloaded.get("ABCD")
+
+    assert (profile.driver, profile.options, profile.score) == ("ntfs3", "prealloc", 1.5)
+    assert reloaded.get("missing") is None
+    assert reloaded.remove("ABCD") and reloaded.get("ABCD") is None
+    assert MountProfileStore(tmp_path / "profiles.json").get("ABCD") is None
+    assert not (tmp_path / "profiles.tmp").exists()
+
+
+def test_tune_measures_available_candidates_and_persists_winner(tmp_path):
+    mount_root = tmp_path / "mnt"
+    mount_root.mkdir()
+    store = MountProfileStore(tmp_path / "profiles.json")
+    manager = FakeDriveManager(mount_root)
+
+    profile = MountOptionTuner(manager, store).tune("sdb1", size_mb=1, file_count=5)
+
+    assert profile is not None
+    assert {fstype for fstype, _ in manager.mounted} == {"ntfs3", "ntfs"}
+    assert len(profile.results) == 6
+    assert not any(result["error"] for result in profile.results)
+    assert profile.driver in ("ntfs3", "ntfs-3g")
+    assert store.get("01D9F00DCAFE0001").options == profile.options
+
+
+def test_drivers_udisks_cannot_select_are_skipped(tmp_path):
+    manager = FakeDriveManager(tmp_path, available=("ntfs3", "lowntfs-3g", "ntfs-3g"))
+    tuner = MountOptionTuner(manager, MountProfileStore(tmp_path / "profiles.json"))
+
+    candidates = tuner.get_candidates(["lowntfs-3g", "ntfs-3g"])
+
+    assert candidates and {driver for driver, _ in candidates} == {"ntfs-3g"}
+
+
+def test_ntfs3_detected_from_proc_filesystems_then_modinfo(tmp_path, monkeypatch):
+    proc_filesystems = tmp_path / "filesystems"
+    commands = []
+
+    def fake_run_command(args, **kwargs):
+        commands.append(args)
+        return subprocess.CompletedProcess(args, 1, "", "modinfo: ERROR: Module ntfs3 not found.")
+
+    monkeypatch.setattr(drive_manager, "PROC_FILESYSTEMS", str(proc_filesystems))
+    monkeypatch.setattr(drive_manager, "run_command", fake_run_command)
+    manager = DriveManager.__new__(DriveManager)
+
+    proc_filesystems.write_text("nodev\tsysfs\n\text4\n\tntfs3\n")
+    assert manager._is_ntfs_driver_available("ntfs3")
+    assert commands == []
+
+    proc_filesystems.write_text("nodev\tsysfs\n\text4\n")
+    assert not manager._is_ntfs_driver_available("ntfs3")
+    assert commands == [["modinfo", "-F", "name", "ntfs3"]]
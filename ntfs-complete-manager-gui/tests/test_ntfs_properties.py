@@ -0,0 +1,140 @@
+"""NTFSProperties probe tests, run against stub tools on PATH"""
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from ntfs_properties import NTFSProperties
+
+NTFSINFO_OUTPUT = """Volume Name: DATA
+Volume Serial Number: 01D9F00DCAFE0001
+Cluster Size: 4096
+Volume Size: 1024 MB
+Free Space: 256 MB
+"""
+
+SMART_OUTPUT = """SMART overall-health self-assessment test result: PASSED
+  5 Reallocated_Sector_Ct   0x0033   100   100   010    Pre-fail  Always       -       3
+  9 Power_On_Hours          0x0032   099   099   000    Old_age   Always       -       1234
+"""
+
+
+def write_tool(bin_dir, name, script):
+    path = bin_dir / name
+    path.write_text("#!/bin/sh\n" + script)
+    path.chmod(0o755)
+
+
+@pytest.fixture
+def stub_path(tmp_path, monkeypatch):
+    """PATH holding only the stub tools, plus /bin for sh and sleep"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", f"{bin_dir}:/bin:/usr/bin")
+    return bin_dir
+
+
+def install_tools(bin_dir, delay="0"):
+    write_tool(bin_dir, "ntfsinfo", f"sleep {delay}\ncat <<'OUT'\n{NTFSINFO_OUTPUT}OUT\n")
+    write_tool(bin_dir, "smartctl", f"sleep {delay}\ncat <<'OUT'\n{SMART_OUTPUT}OUT\n")
+    write_tool(bin_dir, "ntfsfix", f"sleep {delay}\necho 'Volume is Dirty' >&2\nexit 0\n")
+    write_tool(bin_dir, "findmnt", f"sleep {delay}\nexit 1\n")
+    write_tool(bin_dir, "df", f"sleep {delay}\nexit 1\n")
+    write_tool(bin_dir, "stat", f"sleep {delay}\necho 'root:disk:660'\n")
+    write_tool(bin_dir, "getfacl", f"sleep {delay}\nprintf 'user::rw-\\ngroup::rw-\\nother::---\\n'\n")
+    write_tool(bin_dir, "lsblk", f"sleep {delay}\n"
+               "case \"$*\" in *MODEL*) echo 'Disk SN123 ACME 1G 0 1';; *) echo 'ntfs';; esac\n")
+
+
+def test_all_properties_parsed(stub_path):
+    install_tools(stub_path)
+    properties = NTFSProperties("/dev/sdz1").get_all_properties()
+
+    assert properties["volume"]["name"] == "DATA"
+    assert properties["volume"]["total_size"] == "1.00 GB"
+    assert properties["volume"]["usage_percentage"] == 75.0
+    assert properties["security"]["owner"] == "root"
+    assert len(properties["security"]["acl_entries"]) == 3
+    assert properties["security"]["encryption_status"] == "Not Encrypted"
+    assert properties["health"]["dirty_bit"] is True
+    assert properties["health"]["smart_status"] == "PASSED"
+    assert properties["health"]["reallocated_sectors"] == 3
+    assert properties["device"]["serial"] == "SN123"
+    assert properties["device"]["removable"] is True
+    assert "probe_errors" not in properties
+
+
+def test_probes_run_concurrently(stub_path):
+    install_tools(stub_path, delay="0.4")
+    start = time.monotonic()
+    NTFSProperties("/dev/sdz1").get_all_properties()
+    # Nine probes of 0.4s each would take 3.6s back to back
+    assert time.monotonic() - start < 2.0
+
+
+def test_partial_results_on_timeout_and_missing_tool(stub_path):
+    install_tools(stub_path)
+    write_tool(stub_path, "smartctl", "exec sleep 5\n")
+    os.unlink(stub_path / "getfacl")
+
+    ntfs_props = NTFSProperties("/dev/sdz1")
+    properties = asyncio.run(ntfs_props.get_all_properties_async(timeout=0.5))
+
+    assert properties["volume"]["name"] == "DATA"
+    assert properties["health"]["smart_status"] == "Unknown"
+    assert properties["security"]["acl_entries"] == []
+    assert "timed out" in properties["probe_errors"]["smartctl"]
+    assert "getfacl" in properties["probe_errors"]
+
+
+def test_sync_wrapper_inside_running_loop(stub_path):
+    install_tools(stub_path)
+
+    async def caller():
+        return NTFSProperties("/dev/sdz1").get_all_properties()
+
+    assert asyncio.run(caller())["volume"]["serial"] == "01D9F00DCAFE0001"
+
+
+def test_sections_are_computed_lazily_and_memoized(stub_path, tmp_path):
+    install_tools(stub_path)
+    calls = tmp_path / "ntfsinfo-calls"
+    write_tool(stub_path, "ntfsinfo", f"echo x >> {calls}\ncat <<'OUT'\n{NTFSINFO_OUTPUT}OUT\n")
+    os.unlink(stub_path / "smartctl")
+
+    ntfs_props = NTFSProperties("/dev/sdz1")
+    volume = ntfs_props.get_sections(["volume"])
+    assert set(volume) == {"volume"}
+    ntfs_props.get_sections(["volume", "device"])
+    assert calls.read_text().count("x") == 1
+
+    ntfs_props.invalidate("volume")
+    ntfs_props.get_sections(["volume"])
+    assert calls.read_text().count("x") == 2
+
+
+def test_section_recomputed_when_ttl_expires(stub_path, monkeypatch):
+    import ntfs_properties
+
+    install_tools(stub_path)
+    monkeypatch.setitem(ntfs_properties.SECTION_TTLS, "device", 0.0)
+    ntfs_props = NTFSProperties("/dev/sdz1")
+    assert ntfs_props.get_sections(["device"])["device"]["model"] == "Disk"
+
+    write_tool(stub_path, "lsblk", "echo 'Other SN9 ACME 1G 0 0'\n")
+    assert ntfs_props.get_sections(["device"])["device"]["model"] == "Other"
+
+
+def test_unknown_section_rejected():
+    with pytest.raises(ValueError):
+        NTFSProperties("/dev/sdz1").get_sections(["bogus"])
+
+
+def test_disk_check_runs_only_requested_checks(stub_path):
+    install_tools(stub_path)
+    results = NTFSProperties("/dev/sdz1").run_disk_check(["filesystem"])
+    assert list(results["checks"]) == ["filesystem"]
+    assert results["checks"]["filesystem"]["dirty_bit"] is True
+    assert results["overall_status"] == "Passed"
@@ -0,0 +1,61 @@
+"""/proc open-handle scanner tests"""
+
+import os
+
+import pytest
+
+from proc_scanner import (ScanIncomplete, _unescape_mountinfo, find_processes_using,
+                          get_mount_points, scan_open_handles)
+
+
+def test_finds_open_fd_on_filesystem(tmp_path):
+    target = tmp_path / "busy.txt"
+    with open(target, "w") as handle:
+        handle.write("busy")
+        handle.flush()
+
+        result = scan_open_handles("/nonexistent-device", mount_points=[str(tmp_path)])
+
+    ours = [h for h in result.handles if h.pid == os.getpid() and h.kind == "fd"]
+    assert any(h.path == str(target) for h in ours)
+    assert ours[0].command
+    assert result.scanned_pids == result.total_pids > 0
+    assert not result.timed_out
+
+
+def test_finds_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    result = scan_open_handles("/nonexistent-device", mount_points=[str(tmp_path)])
+
+    assert any(h.pid == os.getpid() and h.kind == "cwd" for h in result.handles)
+
+
+def test_unknown_device_is_not_busy():
+    is_busy, processes = find_processes_using("/nonexistent-device", mount_points=[])
+
+    assert (is_busy, processes) == (False, [])
+
+
+def test_deadline_returns_partial_result(tmp_path):
+    result = scan_open_handles("/nonexistent-device", mount_points=[str(tmp_path)], deadline=0)
+
+    assert result.timed_out
+    assert result.scanned_pids < result.total_pids
+
+
+def test_timed_out_scan_is_not_reported_idle(tmp_path):
+    # Nothing is holding tmp_path, but a zero deadline can't prove that
+    with pytest.raises(ScanIncomplete):
+        find_processes_using("/nonexistent-device", mount_points=[str(tmp_path)], deadline=0)
+
+
+def test_mountinfo_parsing(tmp_path):
+    (tmp_path / "self").mkdir()
+    (tmp_path / "self" / "mountinfo").write_text(
+        "36 35 8:17 / /media/user/My\\040Disk rw,relatime shared:1 - ntfs3 /dev/sdb1 rw\n"
+        "37 35 8:18 / /mnt/other rw - ext4 /dev/sdb2 rw\n"
+    )
+
+    assert get_mount_points("/dev/sdb1", proc_root=str(tmp_path)) == ["/media/user/My Disk"]
+    assert _unescape_mountinfo("a\\011b") == "a\tb"
@@ -0,0 +1,99 @@
+"""Properties cache tests"""
+
+import json
+import time
+
+from properties_cache import PropertiesCache
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = PropertiesCache(max_entries=2)
+    cache.put("/dev/sda1", "a")
+    cache.put("/dev/sdb1", "b")
+    assert cache.get("/dev/sda1") == "a"
+    cache.put("/dev/sdc1", "c")
+
+    assert "/dev/sdb1" not in cache
+    assert cache.get("/dev/sda1") == "a"
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_generation_change_is_a_miss():
+    cache = PropertiesCache()
+    cache.put("/dev/sdb1", {"volume": {}}, generation="1:UUID:/media/a")
+
+    assert cache.get("/dev/sdb1", "1:UUID:/media/a") == {"volume": {}}
+    assert cache.get("/dev/sdb1", "2:UUID:") is None
+    assert "/dev/sdb1" not in cache
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_expired_entries_are_dropped(monkeypatch):
+    cache = PropertiesCache(ttl=10.0)
+    cache.put("/dev/sdb1", "x")
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 11)
+    assert cache.get("/dev/sdb1") is None
+
+
+def test_get_or_compute_only_computes_on_miss():
+    cache = PropertiesCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_compute("k", compute, "g1") == "value"
+    assert cache.get_or_compute("k", compute, "g1") == "value"
+    assert cache.get_or_compute("k", compute, "g2") == "value"
+    assert len(calls) == 2
+
+
+def test_snapshot_round_trip_skips_unserializable(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = PropertiesCache(snapshot_path=path)
+    cache.put("/dev/sdb1", {"volume": {"name": "DATA"}}, "0:UUID:")
+    cache.put("/dev/sdc1", object(), "0::")
+    assert cache.save()
+    assert len(json.loads(path.read_text())["entries"]) == 1
+
+    restored = PropertiesCache(snapshot_path=path)
+    assert restored.load() == 1
+    # The event counter restarted; only UUID and mount point have to match
+    assert restored.get("/dev/sdb1", "3:UUID:") == {"volume": {"name": "DATA"}}
+    assert restored.get("/dev/sdb1", "4:UUID:") is None
+
+
+def test_restored_entry_with_other_mount_is_a_miss(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = PropertiesCache(snapshot_path=path)
+    cache.put("/dev/sdb1", "props", "7:UUID:/media/a")
+    assert cache.save()
+    assert json.loads(path.read_text())["entries"][0]["generation"] == "UUID:/media/a"
+
+    restored = PropertiesCache(snapshot_path=path)
+    restored.load()
+    assert restored.get("/dev/sdb1", "7:UUID:/media/b") is None
+
+
+def test_schedule_save_coalesces(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = PropertiesCache(snapshot_path=path)
+    cache.put("/dev/sdb1", "a")
+    cache.schedule_save(delay=0.05)
+    cache.put("/dev/sdc1", "b")
+    cache.schedule_save(delay=0.05)
+    assert not path.exists()
+
+    time.sleep(0.5)
+    assert len(json.loads(path.read_text())["entries"]) == 2
+
+
+def test_load_ignores_corrupt_snapshot(tmp_path):
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+    assert PropertiesCache(snapshot_path=path).load() == 0
@@ -0,0 +1,33 @@
+"""Startup trace tests"""
+
+import sys
+
+from startup_trace import StartupTrace
+
+
+def test_records_first_time_imports_and_phases():
+    sys.modules.pop("colorsys", None)
+    trace = StartupTrace()
+    trace.enable()
+    try:
+        with trace.phase("work"):
+            import colorsys  # noqa: F401
+            import os  # noqa: F401  (already loaded, not recorded)
+    finally:
+        trace.disable()
+
+    names = [name for name, _, _ in trace.imports]
+    assert "colorsys" in names
+    assert "os" not in names
+    assert [phase[0] for phase in trace.phases] == ["work"]
+
+    report = trace.report({"first_paint": 0.25, "live_rows": 3}, budget=0.5)
+    assert "colorsys" in report
+    assert "within budget" in report
+
+
+def test_disabled_trace_records_nothing():
+    trace = StartupTrace()
+    with trace.phase("work"):
+        trace.import_module("json")
+    assert trace.phases == [] and trace.imports == []
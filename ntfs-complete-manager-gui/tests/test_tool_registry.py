@@ -0,0 +1,59 @@
+"""Tool registry tests"""
+
+import os
+
+from tool_registry import ToolRegistry
+
+
+def write_tool(directory, name, script="#!/bin/sh\necho 'tool 1.2.3'\n"):
+    path = directory / name
+    path.write_text(script)
+    path.chmod(0o755)
+    return path
+
+
+def test_resolves_first_match_on_path(tmp_path):
+    first, second = tmp_path / "a", tmp_path / "b"
+    first.mkdir()
+    second.mkdir()
+    write_tool(second, "ntfsfix")
+    (first / "ntfsfix").write_text("not executable")
+
+    registry = ToolRegistry(f"{first}:{second}")
+    assert registry.which("ntfsfix") == str(second / "ntfsfix")
+    assert not registry.is_available("gparted")
+
+
+def test_version_and_features_cached_until_mtime_changes(tmp_path):
+    tool = write_tool(tmp_path, "smartctl")
+    registry = ToolRegistry(str(tmp_path))
+    probes = []
+
+    assert registry.get_version("smartctl") == "tool 1.2.3"
+    assert registry.has_feature("smartctl", "json", lambda info: probes.append(1) or True)
+    assert registry.has_feature("smartctl", "json", lambda info: probes.append(1) or True)
+    assert len(probes) == 1
+
+    tool.write_text("#!/bin/sh\necho 'tool 2.0'\n")
+    os.utime(tool, (1, 1))
+    assert registry.get_version("smartctl") == "tool 2.0"
+    assert registry.has_feature("smartctl", "json", lambda info: probes.append(1) or False) is False
+    assert len(probes) == 2
+
+
+def test_missing_tool_found_after_install(tmp_path):
+    registry = ToolRegistry(str(tmp_path))
+    assert not registry.is_available("lowntfs-3g")
+
+    write_tool(tmp_path, "lowntfs-3g")
+    os.utime(tmp_path, (os.stat(tmp_path).st_atime, os.stat(tmp_path).st_mtime + 10))
+    assert registry.is_available("lowntfs-3g")
+
+
+def test_removed_tool_is_forgotten(tmp_path):
+    tool = write_tool(tmp_path, "gparted")
+    registry = ToolRegistry(str(tmp_path))
+    assert registry.is_available("gparted")
+
+    tool.unlink()
+    assert not registry.is_available("gparted")
@@ -0,0 +1,208 @@
+"""
+UDisks2 client tests
+
+Runs against a private dbus-daemon with a stand-in org.freedesktop.UDisks2
+service, so no real disks or system bus are needed.
+"""
+
+import shutil
+import subprocess
+import threading
+
+import pytest
+
+Gio = pytest.importorskip("gi.repository.Gio")
+from gi.repository import GLib
+
+from udisks_client import UDisksClient, UDisksError, block_object_path
+from drive_manager import DriveManager, DriveInfo
+
+FILESYSTEM_XML = """
+<node>
+  <interface name="org.freedesktop.UDisks2.Filesystem">
+    <method name="Mount">
+      <arg name="options" type="a{sv}" direction="in"/>
+      <arg name="mount_path" type="s" direction="out"/>
+    </method>
+    <method name="Unmount">
+      <arg name="options" type="a{sv}" direction="in"/>
+    </method>
+    <property name="MountPoints" type="aay" access="read"/>
+  </interface>
+</node>
+"""
+
+
+class StandInUDisks:
+    """Minimal UDisks2 stand-in exporting block devices on a private bus"""
+
+    def __init__(self, address, devices):
+        self.address = address
+        self.devices = devices  # {name: {"mounted": str, "mount_error": (name, msg)}}
+        self.calls = []
+        self._ready = threading.Event()
+        self._loop = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        assert self._ready.wait(10), "stand-in UDisks2 service did not start"
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.quit()
+        self._thread.join(5)
+
+    def _run(self):
+        context = GLib.MainContext.new()
+        context.push_thread_default()
+        connection = Gio.DBusConnection.new_for_address_sync(
+            self.address,
+            Gio.DBusConnectionFlags.AUTHENTICATION_CLIENT |
+            Gio.DBusConnectionFlags.MESSAGE_BUS_CONNECTION,
+            None, None
+        )
+        interface = Gio.DBusNodeInfo.new_for_xml(FILESYSTEM_XML).interfaces[0]
+        for name in self.devices:
+            connection.register_object(
+                block_object_path(name), interface,
+                self._make_method_handler(name), self._make_property_handler(name), None
+            )
+        connection.call_sync(
+            "org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus",
+            "RequestName", GLib.Variant("(su)", ("org.freedesktop.UDisks2", 0)),
+            None, Gio.DBusCallFlags.NONE, -1, None
+        )
+        self._loop = GLib.MainLoop.new(context, False)
+        self._ready.set()
+        self._loop.run()
+        connection.close_sync(None)
+        context.pop_thread_default()
+
+    def _make_method_handler(self, name):
+        def handler(connection, sender, path, interface, method, params, invocation):
+            options = params.unpack()[0]
+            self.calls.append((name, method, options))
+            device = self.devices[name]
+            error = device.get(f"{method.lower()}_error")
+            if error:
+                invocation.return_dbus_error(*error)
+            elif method == "Mount":
+                device["mounted"] = f"/media/test/{name}"
+                invocation.return_value(GLib.Variant("(s)", (device["mounted"],)))
+            else:
+                device["mounted"] = ""
+                invocation.return_value(None)
+        return handler
+
+    def _make_property_handler(self, name):
+        def handler(connection, sender, path, interface, prop):
+            mounted = self.devices[name].get("mounted")
+            points = [mounted.encode() + b"\x00"] if mounted else []
+            return GLib.Variant("aay", points)
+        return handler
+
+
+@pytest.fixture
+def private_bus():
+    """Start a throwaway session-style dbus-daemon and yield its address"""
+    if not shutil.which("dbus-daemon"):
+        pytest.skip("dbus-daemon not installed")
+    process = subprocess.Popen(
+        ["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+        stdout=subprocess.PIPE, text=True
+    )
+    address = process.stdout.readline().strip()
+    yield address
+    process.terminate()
+    process.wait(5)
+
+
+@pytest.fixture
+def udisks_service(private_bus):
+    service = StandInUDisks(private_bus, {
+        "sdb1": {},
+        "sdc1": {"mount_error": ("org.freedesktop.UDisks2.Error.Failed",
+                                 "Error mounting /dev/sdc1: volume is dirty")},
+        "sdd1": {"unmount_error": ("org.freedesktop.UDisks2.Error.DeviceBusy",
+                                   "target is busy")},
+    })
+    service.start()
+    yield service
+    service.stop()
+
+
+def test_block_object_path_escaping():
+    assert block_object_path("sda1") == "/org/freedesktop/UDisks2/block_devices/sda1"
+    assert block_object_path("dm-0") == "/org/freedesktop/UDisks2/block_devices/dm_2d0"
+
+
+def test_mount_returns_path_and_sends_typed_options(udisks_service):
+    client = UDisksClient(bus_address=udisks_service.address)
+
+    mount_path = client.mount("sdb1", "nofail,windows_names", fstype="ntfs3")
+
+    assert mount_path == "/media/test/sdb1"
+    name, method, options = udisks_service.calls[-1]
+    assert (name, method) == ("sdb1", "Mount")
+    assert options == {"options": "nofail,windows_names", "fstype": "ntfs3"}
+    assert client.get_mount_points("sdb1") == ["/media/test/sdb1"]
+
+
+def test_connection_is_reused_across_calls(udisks_service):
+    client = UDisksClient(bus_address=udisks_service.address)
+
+    client.mount("sdb1")
+    connection = client._connection
+    client.unmount("sdb1")
+    client.mount("sdb1")
+
+    assert client._connection is connection
+    assert [call[1] for call in udisks_service.calls] == ["Mount", "Unmount", "Mount"]
+
+
+def test_errors_are_structured(udisks_service):
+    client = UDisksClient(bus_address=udisks_service.address)
+
+    with pytest.raises(UDisksError) as mount_error:
+        client.mount("sdc1")
+    assert mount_error.value.error_name == "org.freedesktop.UDisks2.Error.Failed"
+    assert "dirty" in mount_error.value.message
+
+    with pytest.raises(UDisksError) as unmount_error:
+        client.unmount("sdd1", force=True)
+    assert unmount_error.value.short_name == "DeviceBusy"
+    assert udisks_service.calls[-1][2] == {"force": True}
+
+
+def test_unknown_device_raises(udisks_service):
+    client = UDisksClient(bus_address=udisks_service.address)
+
+    with pytest.raises(UDisksError):
+        client.mount("sdz9")
+
+
+def test_drive_manager_mount_and_unmount_over_dbus(udisks_service):
+    manager = DriveManager()
+    manager.udisks = UDisksClient(bus_address=udisks_service.address)
+    manager.update_drives({"sdb1": DriveInfo("sdb1", "1G", "ext4", "", "")})
+    events = []
+    manager.add_callback(lambda event, drive: events.append((event, drive.mountpoint)))
+
+    success, mount_path, error = manager._udisks_mount("sdb1", "nofail")
+    assert (success, mount_path, error) == (True, "/media/test/sdb1", "")
+    manager._record_mount("sdb1", mount_path)
+
+    assert manager.unmount_drive("sdb1")
+    assert manager.events.flush()
+    assert events == [("mounted", "/media/test/sdb1"), ("unmounted", "")]
+
+
+def test_drive_manager_reports_dirty_mount_error(udisks_service):
+    manager = DriveManager()
+    manager.udisks = UDisksClient(bus_address=udisks_service.address)
+
+    success, mount_path, error = manager._udisks_mount("sdc1", "nofail")
+
+    assert not success and mount_path == ""
+    assert manager._is_dirty_volume_error(error)
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Drive Daemon Client Module
+Connects the standalone GUI to the drive daemon that ships with
+ntfs-complete-manager-gui (backend/drive_daemon.py, protocol version 3).
+This tree has no daemon of its own; without one running, frontends fall
+back to a local DriveManager.
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from dataclasses import asdict, fields
+from pathlib import Path
+from types import MappingProxyType
+
+from drive_manager import DriveManager, DriveInfo
+
+PROTOCOL_VERSION = 3
+CALL_TIMEOUT = 30.0
+CONNECT_TIMEOUT = 1.0
+RECONNECT_DELAY = 2.0
+
+# Set to any value to make frontends use a local DriveManager instead
+NO_DAEMON_ENV = "NTFS_MANAGER_NO_DAEMON"
+
+
+def default_socket_path() -> Path:
+    """Per-user socket, in $XDG_RUNTIME_DIR when the session has one"""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return Path(runtime_dir) / "ntfs-manager" / "daemon.sock"
+    return Path.home() / ".cache/ntfs-manager/daemon.sock"
+
+
+def size_text(size: int) -> str:
+    """The daemon sends sizes in bytes; this tree shows lsblk-style text ('931.5G')"""
+    value = float(size)
+    for unit in "BKMGTP":
+        if value < 1024 or unit == "P":
+            break
+        value /= 1024
+    if unit == "B":
+        return f"{size}B"
+    return f"{value:.1f}".rstrip("0").rstrip(".") + unit
+
+
+def drive_from_dict(data: Dict[str, Any]) -> DriveInfo:
+    """Rebuild a DriveInfo, ignoring fields this version does not know"""
+    known_fields = {field.name for field in fields(DriveInfo)}
+    values = {key: value for key, value in data.items() if key in known_fields}
+    if isinstance(values.get("size"), int):
+        values["size"] = size_text(values["size"])
+    return DriveInfo(**values)
+
+
+class DaemonError(Exception):
+    """The daemon is unreachable or reported an error"""
+
+
+class DriveDaemonClient:
+    """Low-level client: one connection per call, plus a streaming subscription"""
+
+    def __init__(self, socket_path: Optional[Path] = None, timeout: float = CALL_TIMEOUT):
+        self.socket_path = Path(socket_path) if socket_path else default_socket_path()
+        self.timeout = timeout
+        self._next_id = 0
+        self._id_lock = threading.Lock()
+
+    def _connect(self, timeout: Optional[float]) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(min(CONNECT_TIMEOUT, timeout) if timeout else CONNECT_TIMEOUT)
+            sock.connect(str(self.socket_path))
+            sock.settimeout(timeout)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def _request_line(self, method: str, params: Dict[str, Any]) -> bytes:
+        with self._id_lock:
+            self._next_id += 1
+            request_id = self._next_id
+        return (json.dumps({"id": request_id, "method": method, "params": params}) + "\n").encode()
+
+    def call(self, method: str, timeout: Optional[float] = -1, **params) -> Any:
+        """
+        Run one request on the daemon
+
+        Args:
+            method: A daemon method, e.g. 'get_drives' or 'mount_drive'
+            timeout: Seconds to wait for the answer; None waits forever, -1 uses self.timeout
+            **params: Method parameters
+
+        Returns:
+            The method's result
+
+        Raises:
+            DaemonError: If the daemon is unreachable or the method failed
+        """
+        if timeout == -1:
+            timeout = self.timeout
+        try:
+            with self._connect(timeout) as sock:
+                sock.sendall(self._request_line(method, params))
+                with sock.makefile('r') as reader:
+                    line = reader.readline()
+        except OSError as e:
+            raise DaemonError(f"drive daemon unavailable: {e}") from e
+
+        if not line:
+            raise DaemonError("drive daemon closed the connection")
+        try:
+            response = json.loads(line)
+        except ValueError as e:
+            raise DaemonError(f"invalid response from drive daemon: {e}") from e
+        if response.get("error"):
+            raise DaemonError(response["error"])
+        return response.get("result")
+
+    def is_running(self) -> bool:
+        """Check if a compatible daemon answers on the socket"""
+        if not self.socket_path.exists():
+            return False
+        try:
+            info = self.call("ping", timeout=CONNECT_TIMEOUT)
+        except DaemonError:
+            return False
+        return isinstance(info, dict) and info.get("version") == PROTOCOL_VERSION
+
+    def subscribe(self, on_message: Callable[[Dict[str, Any]], None],
+                  on_connected: Optional[Callable[[socket.socket], None]] = None,
+                  since: Optional[int] = None):
+        """
+        Stream drive table messages to on_message until the connection ends
+
+        Args:
+            on_message: Called with a snapshot (or the deltas after since), then each delta
+            on_connected: Called with the socket, e.g. to keep it for closing
+            since: Last sequence number already seen, to catch up without a snapshot
+
+        Raises:
+            DaemonError: If the daemon is unreachable or the stream breaks
+        """
+        try:
+            with self._connect(None) as sock:
+                if on_connected:
+                    on_connected(sock)
+                sock.sendall(self._request_line("subscribe", {"since": since}))
+                with sock.makefile('r') as reader:
+                    for line in reader:
+                        on_message(json.loads(line))
+        except (OSError, ValueError) as e:
+            raise DaemonError(f"drive daemon subscription ended: {e}") from e
+
+
+class RemoteDriveManager:
+    """
+    DriveManager stand-in that delegates to the drive daemon
+
+    Keeps a local drives table, filled by get_all_drives() and kept current
+    by the daemon's delta stream once monitoring starts, and calls the
+    registered callbacks with the event behind each delta. After a lost
+    connection it resubscribes from the last sequence number it applied.
+    Like DriveManager.drives, the table is a read-only mapping that is
+    replaced, never modified, when a message arrives.
+    """
+
+    def __init__(self, client: DriveDaemonClient):
+        self.client = client
+        self.drives = MappingProxyType({})
+        self.seq = None  # last drive table version applied from the stream
+        self.monitoring = False
+        self.callbacks = []
+        self._subscription = None
+
+    def add_callback(self, callback):
+        """Add callback for drive events"""
+        self.callbacks.append(callback)
+
+    def notify_callbacks(self, event_type: str, drive_info: DriveInfo):
+        """Notify all registered callbacks"""
+        for callback in self.callbacks:
+            try:
+                callback(event_type, drive_info)
+            except Exception as e:
+                print(f"Callback error: {e}")
+
+    def _set_drives(self, drives: List[DriveInfo]):
+        self.drives = MappingProxyType({drive.name: drive for drive in drives})
+
+    def get_all_drives(self) -> List[DriveInfo]:
+        """Get the daemon's current drive list"""
+        try:
+            drives = [drive_from_dict(data) for data in self.client.call("get_drives")]
+        except DaemonError as e:
+            print(f"[DAEMON] Error getting drive list: {e}")
+            return []
+        self._set_drives(drives)
+        return drives
+
+    def refresh_drives(self) -> List[DriveInfo]:
+        """Have the daemon re-enumerate drives"""
+        drives = [drive_from_dict(data) for data in self.client.call("refresh_drives")]
+        self._set_drives(drives)
+        return drives
+
+    def get_generation(self, drive_name: str) -> str:
+        try:
+            return self.client.call("get_generation", drive_name=drive_name)
+        except DaemonError:
+            return ""
+
+    def get_drive_properties(self, drive_name: str) -> Dict:
+        try:
+            return self.client.call("get_drive_properties", drive_name=drive_name)
+        except DaemonError as e:
+            print(f"[DAEMON] Error getting properties of {drive_name}: {e}")
+            return {}
+
+    def _operation(self, method: str, **params) -> bool:
+        # Mounts may wait on a PolicyKit prompt, formats and repairs on the disk
+        try:
+            return bool(self.client.call(method, timeout=None, **params))
+        except DaemonError as e:
+            print(f"[DAEMON] {method} {params.get('drive_name', '')} failed: {e}")
+            return False
+
+    def mount_drive(self, drive_name: str, mount_point: str = None, options: str = "") -> bool:
+        return self._operation("mount_drive", drive_name=drive_name,
+                               mount_point=mount_point, options=options)
+
+    def unmount_drive(self, drive_name: str) -> bool:
+        return self._operation("unmount_drive", drive_name=drive_name)
+
+    def format_drive(self, drive_name: str, fstype: str, label: str = "") -> bool:
+        return self._operation("format_drive", drive_name=drive_name, fstype=fstype, label=label)
+
+    def repair_drive(self, drive_name: str) -> bool:
+        return self._operation("repair_drive", drive_name=drive_name)
+
+    def start_monitoring(self):
+        """Follow the daemon's event stream on a background thread"""
+        if self.monitoring:
+            return
+        self.monitoring = True
+        self.monitor_thread = threading.Thread(target=self._monitor_daemon_events, daemon=True)
+        self.monitor_thread.start()
+
+    def stop_monitoring(self):
+        """Stop following the event stream"""
+        self.monitoring = False
+        if self._subscription is not None:
+            try:
+                self._subscription.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _monitor_daemon_events(self):
+        while self.monitoring:
+            try:
+                self.client.subscribe(self._handle_message, self._set_subscription, self.seq)
+            except DaemonError as e:
+                if self.monitoring:
+                    print(f"[DAEMON] {e}; reconnecting")
+            if self.monitoring:
+                time.sleep(RECONNECT_DELAY)
+
+    def _set_subscription(self, sock: socket.socket):
+        self._subscription = sock
+
+    def _handle_message(self, message: Dict[str, Any]):
+        event_type = message.get("event")
+        if event_type == "heartbeat":
+            return
+
+        if event_type == "snapshot":
+            # Initial state or a resync: report what changed since our table
+            drives = [drive_from_dict(data) for data in message.get("drives", [])]
+            old_drives = self.drives
+            self._set_drives(drives)
+            self.seq = message.get("seq")
+            for drive in drives:
+                old_drive = old_drives.get(drive.name)
+                if old_drive is None:
+                    self.notify_callbacks("added", drive)
+                elif old_drive != drive:
+                    self.notify_callbacks("changed", drive)
+            for name, drive in old_drives.items():
+                if name not in self.drives:
+                    self.notify_callbacks("removed", drive)
+            return
+
+        if event_type == "delta":
+            self.seq = message.get("seq")
+            name = message.get("name", "")
+            changes = message.get("changes", {})
+            cause = message.get("cause", "changed")
+            if cause == "removed":
+                # Deltas for removals carry the last known fields as old values
+                drive = drive_from_dict({key: old for key, (old, new) in changes.items()})
+                drives = dict(self.drives)
+                drives.pop(name, None)
+                self.drives = MappingProxyType(drives)
+            else:
+                fields_now = asdict(self.drives[name]) if name in self.drives else {}
+                fields_now.update({key: new for key, (old, new) in changes.items()})
+                try:
+                    drive = drive_from_dict(fields_now)
+                except TypeError:
+                    return  # partial delta for a drive we never saw; the next snapshot fixes it
+                self.drives = MappingProxyType({**self.drives, name: drive})
+            self.notify_callbacks(cause, drive)
+
+
+def connect_drive_manager(socket_path: Optional[Path] = None):
+    """
+    Get the drive manager a frontend should use
+
+    Returns:
+        RemoteDriveManager if a drive daemon is running (and NTFS_MANAGER_NO_DAEMON
+        is unset), otherwise a local DriveManager
+    """
+    if not os.environ.get(NO_DAEMON_ENV):
+        client = DriveDaemonClient(socket_path)
+        if client.is_running():
+            print(f"[DAEMON] Using drive daemon at {client.socket_path}")
+            return RemoteDriveManager(client)
+    return DriveManager()
+
+
+def print_state_message(message: Dict[str, Any]):
+    """Print one subscription message, e.g. '[42] sdb1.mountpoint: '' -> '/media/x'"""
+    if message.get("event") == "snapshot":
+        print(f"[{message['seq']}] snapshot of {len(message['drives'])} drives")
+    elif message.get("event") == "delta":
+        changes = ", ".join(f"{message['name']}.{key}: {old!r} -> {new!r}"
+                            for key, (old, new) in message["changes"].items())
+        print(f"[{message['seq']}] {message['cause']}: {changes or message['name']}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NTFS Manager drive daemon client")
+    parser.add_argument("command", nargs="?", default="status", choices=("status", "list", "watch"),
+                        help="show daemon status (default), list drives or watch changes")
+    parser.add_argument("--socket", type=Path, default=None,
+                        help=f"socket path (default: {default_socket_path()})")
+    args = parser.parse_args()
+
+    client = DriveDaemonClient(args.socket)
+    try:
+        if args.command == "status":
+            info = client.call("ping")
+            print(f"Drive daemon running (pid {info['pid']}, {info['subscribers']} subscribers, "
+                  f"drive table version {info['seq']})")
+        elif args.command == "watch":
+            client.subscribe(print_state_message)
+        else:
+            for data in client.call("get_drives"):
+                print(f"{data['name']:<12} {size_text(data['size']):>8}  {data['fstype'] or '-':<8} {data['mountpoint']}")
+    except DaemonError as e:
+        print(f"[DAEMON] {e}")
+        return 1
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
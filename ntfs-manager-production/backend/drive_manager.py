@@ -13,6 +13,8 @@ from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+from proc_scanner import ScanIncomplete, find_processes_using, get_mount_points
+
 @dataclass
 class DriveInfo:
     """Data class for drive information"""
@@ -488,39 +490,38 @@ class DriveManager:
     
     def _check_drive_usage(self, device_path: str) -> Tuple[bool, List[str]]:
         """Check if drive is currently in use and by which processes"""
+        # Mount state comes straight from mountinfo instead of findmnt
+        mount_points = get_mount_points(device_path)
+        if not mount_points:
+            return False, []
+        
+        # Device is mounted, find processes using it with a single /proc walk
         try:
+            _, processes_using = find_processes_using(device_path, mount_points)
+        except ScanIncomplete as e:
+            print(f"/proc scan of {device_path} incomplete ({e}), falling back to lsof")
+            processes_using = self._lsof_processes(mount_points)
+        except OSError as e:
+            print(f"Error scanning processes using {device_path}: {e}")
             processes_using = []
             
-            # Check if device is mounted
-            mount_result = subprocess.run(
-                ["findmnt", "-n", "-o", "SOURCE", device_path],
-                capture_output=True, text=True, check=True
-            )
-            
-            if mount_result.returncode == 0:
-                # Device is mounted, find processes using it
-                device_name = os.path.basename(device_path)
-                
-                # Check lsof for processes using the device
-                lsof_result = subprocess.run(
-                    ["lsof", "+D", device_path],
-                    capture_output=True, text=True, check=True
-                )
-                
-                if lsof_result.returncode == 0:
-                    for line in lsof_result.stdout.splitlines():
-                        if line.strip() and not line.startswith("COMMAND"):
-                            parts = line.split()
-                            if len(parts) >= 2:
-                                process_name = parts[0]
-                                processes_using.append(process_name)
-                                
-                return True, processes_using
-            else:
-                return False, []
-                
-        except subprocess.CalledProcessError:
-            return False, []
+        return True, processes_using
+    
+    def _lsof_processes(self, mount_points: List[str]) -> List[str]:
+        """Commands with files open on the given mount points, according to lsof"""
+        processes_using = []
+        for mount_point in mount_points:
+            try:
+                result = subprocess.run(["lsof", "-w", mount_point],
+                                        capture_output=True, text=True, timeout=10)
+            except (OSError, subprocess.TimeoutExpired) as e:
+                print(f"Error running lsof on {mount_point}: {e}")
+                continue
+            for line in result.stdout.splitlines()[1:]:  # Skip header
+                parts = line.split()
+                if parts and parts[0] not in processes_using:
+                    processes_using.append(parts[0])
+        return processes_using
     
     def safe_eject_drive(self, drive_name: str) -> bool:
         """Safely eject a hot-swappable drive"""
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Open Handle Scanner Module
+Finds processes holding a block device or its filesystem open by walking /proc
+"""
+
+import os
+import re
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Optional, Set, Tuple
+from dataclasses import dataclass, field
+
+PROC_ROOT = "/proc"
+DEFAULT_DEADLINE = 3.0
+DEFAULT_WORKERS = 8
+PIDS_PER_BATCH = 64
+
+
+class ScanIncomplete(OSError):
+    """The scan hit its deadline before finding a user; the device may still be busy"""
+
+
+@dataclass
+class OpenHandle:
+    """A single reference from a process to the scanned device"""
+    pid: int
+    command: str
+    path: str
+    kind: str  # 'fd', 'cwd', 'root' or 'map'
+
+
+@dataclass
+class ScanResult:
+    """Result of a /proc scan"""
+    handles: List[OpenHandle] = field(default_factory=list)
+    scanned_pids: int = 0
+    total_pids: int = 0
+    timed_out: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def is_busy(self) -> bool:
+        return bool(self.handles)
+
+    def processes(self) -> List[Tuple[int, str]]:
+        """Unique (pid, command) pairs in scan order"""
+        seen = {}
+        for handle in self.handles:
+            seen.setdefault(handle.pid, handle.command)
+        return list(seen.items())
+
+
+def _unescape_mountinfo(value: str) -> str:
+    """Decode the octal escapes used in /proc/*/mountinfo ('\\040' -> ' ')"""
+    return re.sub(r"\\([0-7]{3})", lambda match: chr(int(match.group(1), 8)), value)
+
+
+def get_mount_points(device_path: str, proc_root: str = PROC_ROOT) -> List[str]:
+    """Get all mount points of a device by reading /proc/self/mountinfo"""
+    mount_points = []
+    try:
+        real_device = os.path.realpath(device_path)
+        with open(os.path.join(proc_root, "self", "mountinfo"), 'r') as f:
+            for line in f:
+                # Format: id parent major:minor root mountpoint opts ... - fstype source superopts
+                fields = line.split()
+                if "-" not in fields:
+                    continue
+                separator = fields.index("-")
+                if separator + 2 >= len(fields):
+                    continue
+                source = _unescape_mountinfo(fields[separator + 2])
+                if source in (device_path, real_device):
+                    mount_points.append(_unescape_mountinfo(fields[4]))
+    except OSError:
+        pass
+    return mount_points
+
+
+def _resolve_target_devices(device_path: str, mount_points: List[str]) -> Tuple[Optional[int], Set[int]]:
+    """
+    Work out which device numbers identify the target
+
+    Returns:
+        (rdev, devs): rdev of the block device node (matches direct opens of
+        the device) and the set of st_dev values of files on its filesystem
+        (the kernel dev for ntfs3, an anonymous dev for FUSE mounts)
+    """
+    rdev = None
+    devs = set()
+    try:
+        device_stat = os.stat(device_path)
+        if stat.S_ISBLK(device_stat.st_mode):
+            rdev = device_stat.st_rdev
+            devs.add(rdev)
+    except OSError:
+        pass
+
+    for mount_point in mount_points:
+        try:
+            devs.add(os.stat(mount_point).st_dev)
+        except OSError:
+            continue
+
+    return rdev, devs
+
+
+def _read_command(pid_dir: str) -> str:
+    try:
+        with open(os.path.join(pid_dir, "comm"), 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
+
+def _scan_pid(proc_root: str, pid: int, rdev: Optional[int], devs: Set[int]) -> List[OpenHandle]:
+    """Collect handles of one process that point at the target device"""
+    pid_dir = os.path.join(proc_root, str(pid))
+    matches = []
+
+    def matches_target(file_stat) -> bool:
+        if rdev is not None and stat.S_ISBLK(file_stat.st_mode) and file_stat.st_rdev == rdev:
+            return True
+        return file_stat.st_dev in devs
+
+    # Open file descriptors
+    try:
+        with os.scandir(os.path.join(pid_dir, "fd")) as entries:
+            for entry in entries:
+                try:
+                    if matches_target(os.stat(entry.path)):
+                        matches.append(("fd", os.readlink(entry.path)))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+    # Working directory and root
+    for kind in ("cwd", "root"):
+        link = os.path.join(pid_dir, kind)
+        try:
+            if os.stat(link).st_dev in devs:
+                matches.append((kind, os.readlink(link)))
+        except OSError:
+            continue
+
+    # Memory-mapped files (executables, libraries, mmap'd data)
+    try:
+        seen_paths = set()
+        with open(os.path.join(pid_dir, "maps"), 'r') as f:
+            for line in f:
+                # Format: address perms offset major:minor inode [path]
+                fields = line.split(None, 5)
+                if len(fields) < 6 or fields[4] == "0":
+                    continue
+                major, _, minor = fields[3].partition(":")
+                try:
+                    map_dev = os.makedev(int(major, 16), int(minor, 16))
+                except ValueError:
+                    continue
+                path = fields[5].strip()
+                if map_dev in devs and path not in seen_paths:
+                    seen_paths.add(path)
+                    matches.append(("map", path))
+    except OSError:
+        pass
+
+    if not matches:
+        return []
+
+    command = _read_command(pid_dir)
+    return [OpenHandle(pid=pid, command=command, path=path, kind=kind) for kind, path in matches]
+
+
+def _scan_batch(proc_root: str, pids: List[int], rdev: Optional[int], devs: Set[int]) -> List[OpenHandle]:
+    handles = []
+    for pid in pids:
+        handles.extend(_scan_pid(proc_root, pid, rdev, devs))
+    return handles
+
+
+def scan_open_handles(device_path: str, mount_points: Optional[List[str]] = None,
+                      deadline: float = DEFAULT_DEADLINE, max_workers: int = DEFAULT_WORKERS,
+                      proc_root: str = PROC_ROOT) -> ScanResult:
+    """
+    Find every process with a handle on a device or its mounted filesystem
+
+    Walks /proc once, matching st_dev/st_rdev of fds, cwd, root and mapped
+    files against the device. Work is spread over a thread pool and stops
+    at the deadline, in which case the partial result has timed_out set.
+
+    Args:
+        device_path: Block device path (e.g., '/dev/sdb1')
+        mount_points: Mount points of the device (read from mountinfo if None)
+        deadline: Overall time budget in seconds
+        max_workers: Thread pool size
+        proc_root: procfs location
+
+    Returns:
+        ScanResult: Matching handles and scan statistics
+    """
+    start = time.monotonic()
+    if mount_points is None:
+        mount_points = get_mount_points(device_path, proc_root)
+
+    result = ScanResult()
+    rdev, devs = _resolve_target_devices(device_path, mount_points)
+    if rdev is None and not devs:
+        result.elapsed = time.monotonic() - start
+        return result
+
+    try:
+        with os.scandir(proc_root) as entries:
+            pids = [int(entry.name) for entry in entries if entry.name.isdigit()]
+    except OSError:
+        result.elapsed = time.monotonic() - start
+        return result
+
+    result.total_pids = len(pids)
+    batches = [pids[i:i + PIDS_PER_BATCH] for i in range(0, len(pids), PIDS_PER_BATCH)]
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="proc-scan")
+    try:
+        pending = {executor.submit(_scan_batch, proc_root, batch, rdev, devs): len(batch)
+                   for batch in batches}
+        while pending:
+            remaining = deadline - (time.monotonic() - start)
+            if remaining <= 0:
+                result.timed_out = True
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                result.scanned_pids += pending.pop(future)
+                result.handles.extend(future.result())
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    result.handles.sort(key=lambda handle: handle.pid)
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+def find_processes_using(device_path: str, mount_points: Optional[List[str]] = None,
+                         deadline: float = DEFAULT_DEADLINE) -> Tuple[bool, List[str]]:
+    """
+    Check if a device is busy
+
+    A scan cut short by the deadline still proves a device busy if it found
+    a user, but can't prove it idle.
+
+    Returns:
+        Tuple[bool, List[str]]: (is_busy, ["command (pid)", ...])
+
+    Raises:
+        ScanIncomplete: If the deadline passed before any user was found
+    """
+    result = scan_open_handles(device_path, mount_points, deadline)
+    if result.timed_out and not result.is_busy:
+        raise ScanIncomplete(f"scanned {result.scanned_pids} of {result.total_pids} processes "
+                             f"in {result.elapsed:.1f}s")
+    processes = [f"{command or 'unknown'} ({pid})" for pid, command in result.processes()]
+    return result.is_busy, processes
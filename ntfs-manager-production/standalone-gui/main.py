@@ -27,6 +27,7 @@ try:
     from ntfs_properties import NTFSProperties
     from gparted_integration import GPartedManager
     from logger import get_logger
+    from drive_daemon import connect_drive_manager
 except ImportError as e:
     print(f"Warning: Could not import backend modules: {e}")
     print("Some features may not be available")
@@ -85,13 +86,17 @@ except ImportError as e:
     
     def get_logger(name="ntfs_manager"):
         return NTFSLogger()
+    
+    def connect_drive_manager(socket_path=None):
+        return DriveManager()
 
 from gi.repository import Gtk, Gio, GLib, GdkPixbuf
 
 class NTFSManager:
     def __init__(self):
         super().__init__()
-        self.drive_manager = DriveManager()
+        # Thin client of the drive daemon when one is running
+        self.drive_manager = connect_drive_manager()
         self.logger = get_logger()
         self.selected_drive = None
         self.drive_list_store = None
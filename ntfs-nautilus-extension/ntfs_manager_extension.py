@@ -9,6 +9,7 @@ import sys
 import subprocess
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Dict, Any
 
@@ -29,9 +30,13 @@ except (ImportError, ValueError):
 
 # Import backend modules
 try:
-    from drive_manager import DriveManager, DriveInfo
+    from drive_manager import DriveManager, DriveInfo, format_size
     from ntfs_properties import NTFSProperties
     from logger import get_logger
+    from properties_cache import PropertiesCache, default_snapshot_path
+    from mount_index import MountIndex
+    from drive_daemon import connect_drive_manager
+    from command_runner import run_command
     BACKEND_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: Backend modules not available: {e}")
@@ -42,6 +47,7 @@ except ImportError as e:
         def __init__(self): pass
         def get_all_drives(self): return []
         def get_drive_properties(self, drive): return {}
+        def get_generation(self, drive): return ""
         def mount_drive(self, drive): return False
         def unmount_drive(self, drive): return False
         def format_drive(self, drive, fstype, label): return False
@@ -51,13 +57,20 @@ except ImportError as e:
         def stop_monitoring(self): pass
     
     class DriveInfo:
-        def __init__(self, name="", size="", fstype="", mountpoint="", label="", model="", vendor="", serial="", uuid="", is_removable=False, is_rotational=False, health_status="Unknown", temperature=0.0, smart_status="Unknown"):
+        def __init__(self, name="", size=0, fstype="", mountpoint="", label="", model="", vendor="", serial="", uuid="", is_removable=False, is_rotational=False, health_status="Unknown", temperature=0.0, smart_status="Unknown", major=0, minor=0):
             for key, value in locals().items():
                 setattr(self, key, value)
     
+    def format_size(size):
+        return f"{size}B"
+    
+    def run_command(args, timeout=30, check=False, **kwargs):
+        return subprocess.run(args, capture_output=True, text=True, timeout=timeout, check=check)
+    
     class NTFSProperties:
         def __init__(self, device_path): pass
         def get_all_properties(self): return {}
+        def get_sections(self, sections): return {}
         def get_windows_style_properties(self): return ""
         def run_disk_check(self): return {"timestamp": "", "overall_status": "Unknown", "checks": {}}
     
@@ -69,6 +82,15 @@ except ImportError as e:
             def operation(self, op, device, status, details=None): pass
         return DummyLogger()
 
+# Filesystems that get health/filesystem columns and emblems
+MANAGED_FSTYPES = ('ntfs',)
+
+# Drive cache age (seconds) after which a background refresh is started
+CACHE_MAX_AGE = 30
+
+# Longest an asynchronous file info update waits for a cache refresh
+FILE_INFO_WAIT = 10.0
+
 class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.ColumnProvider, Nautilus.InfoProvider):
     """Main NTFS Manager extension class"""
     
@@ -78,36 +100,104 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
             return
             
         super().__init__()
-        self.drive_manager = DriveManager()
+        # Thin client of the drive daemon when one is running
+        self.drive_manager = connect_drive_manager()
         self.logger = get_logger()
         self.drive_cache = {}
+        self.mount_index = MountIndex()
         self.last_update = 0
+        self._refresh_lock = threading.Lock()
+        self._refresh_done = threading.Condition(self._refresh_lock)
+        self._refresh_running = False
+        self._refresh_pending = False
+        
+        # Asynchronous update_file_info_full requests: {handle: cancelled event}
+        self._info_updates = {}
+        self._info_updates_lock = threading.Lock()
+        self._info_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ntfs-file-info")
+        
+        # NTFS properties shown in the properties dialog, kept across Nautilus restarts
+        self.properties_cache = PropertiesCache(
+            max_entries=32, ttl=300.0, snapshot_path=default_snapshot_path("nautilus")
+        )
+        self.properties_cache.load()
         
-        # Start drive monitoring
+        # Start drive monitoring; every drive event triggers a cache refresh
+        self.drive_manager.add_callback(self.on_drive_event)
         self.drive_manager.start_monitoring()
         self.logger.info("NTFS Manager Nautilus Extension initialized")
         
-        # Initial drive scan
-        self.refresh_drive_cache()
+        # Initial drive scan, off Nautilus's main thread
+        self.schedule_cache_refresh()
     
     def refresh_drive_cache(self):
-        """Refresh the drive information cache"""
+        """Refresh the drive information cache (blocking; see schedule_cache_refresh)"""
         try:
             drives = self.drive_manager.get_all_drives()
+            mount_index = MountIndex(drives, device_fstypes=MANAGED_FSTYPES)
+            # Swap in complete objects so lookups on other threads never see a partial cache
             self.drive_cache = {drive.name: drive for drive in drives}
+            self.mount_index = mount_index
             self.last_update = time.time()
             self.logger.debug(f"Drive cache refreshed: {len(drives)} drives")
         except Exception as e:
             self.logger.error(f"Error refreshing drive cache: {e}")
     
+    def schedule_cache_refresh(self):
+        """
+        Refresh the drive cache on a worker thread
+        
+        Never blocks the caller: menus and emblems keep using the current
+        cache until the new one is swapped in. Requests made while a refresh
+        is running are coalesced into a single follow-up refresh.
+        """
+        with self._refresh_lock:
+            if self._refresh_running:
+                self._refresh_pending = True
+                return
+            self._refresh_running = True
+        
+        threading.Thread(target=self._cache_refresh_worker, daemon=True).start()
+    
+    def _cache_refresh_worker(self):
+        """Run refreshes until no more were requested"""
+        while True:
+            self.refresh_drive_cache()
+            with self._refresh_lock:
+                if not self._refresh_pending:
+                    self._refresh_running = False
+                    self._refresh_done.notify_all()
+                    return
+                self._refresh_pending = False
+    
+    def refresh_in_progress(self) -> bool:
+        """True while a cache refresh is running or queued"""
+        with self._refresh_lock:
+            return self._refresh_running
+    
+    def refresh_if_stale(self):
+        """Start a background refresh if the cache is older than CACHE_MAX_AGE"""
+        if time.time() - self.last_update > CACHE_MAX_AGE:
+            self.schedule_cache_refresh()
+    
+    def wait_for_cache_refresh(self, timeout: float) -> bool:
+        """Block until no refresh is running; only for worker threads"""
+        with self._refresh_lock:
+            return self._refresh_done.wait_for(lambda: not self._refresh_running, timeout)
+    
+    def on_drive_event(self, event_type: str, drive_info: DriveInfo):
+        """Drive added, removed, mounted or unmounted"""
+        self.logger.debug(f"Drive event {event_type} for {drive_info.name}, refreshing cache")
+        self.schedule_cache_refresh()
+    
     def get_file_items(self, window, files):
         """Get menu items for selected files"""
         if not NAUTILUS_AVAILABLE or not BACKEND_AVAILABLE:
             return []
         
-        # Refresh cache if it's old (more than 30 seconds)
-        if time.time() - self.last_update > 30:
-            self.refresh_drive_cache()
+        # Events keep the cache current; an old one is still served while
+        # a background refresh catches up
+        self.refresh_if_stale()
         
         items = []
         
@@ -134,25 +224,38 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
             # Check if it's a block device
             if file_path.startswith('/dev/'):
                 drive_name = os.path.basename(file_path)
-                return self.drive_cache.get(drive_name)
-            
-            # Check if it's a mount point
-            for drive in self.drive_cache.values():
-                if drive.mountpoint and file_path.startswith(drive.mountpoint):
-                    return drive
+                return self.mount_index.by_name.get(drive_name)
             
-            # Check if it's in /media or /mnt (common mount locations)
-            if file_path.startswith('/media/') or file_path.startswith('/mnt/'):
-                # Try to find the corresponding drive
-                for drive in self.drive_cache.values():
-                    if drive.mountpoint and file_path.startswith(drive.mountpoint):
-                        return drive
+            # Longest mount point containing the file
+            return self.mount_index.lookup(file_path)
             
         except Exception as e:
             self.logger.error(f"Error getting drive for file: {e}")
         
         return None
     
+    def get_managed_drive_for_file(self, file_info) -> Optional[DriveInfo]:
+        """
+        Get the managed NTFS drive holding a file, by device number
+        
+        Nautilus asks about every file it shows, so files on other
+        filesystems are rejected with one lstat and one dict lookup.
+        """
+        if not self.mount_index.devices or file_info.get_uri_scheme() != 'file':
+            return None
+        return self.get_managed_drive_for_path(file_info.get_location().get_path())
+    
+    def get_managed_drive_for_path(self, file_path: Optional[str]) -> Optional[DriveInfo]:
+        """Path variant of get_managed_drive_for_file; safe to call from any thread"""
+        devices = self.mount_index.devices
+        if not devices or not file_path:
+            return None
+        
+        try:
+            return devices.get(os.lstat(file_path).st_dev)
+        except OSError:
+            return None
+    
     def create_drive_menu_items(self, file_info, drive_info: DriveInfo) -> List[Nautilus.MenuItem]:
         """Create context menu items for a drive"""
         items = []
@@ -248,7 +351,7 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
                 if success:
                     self.show_notification("Drive Mounted", f"{drive_info.name} mounted successfully")
                     self.logger.operation("mount", drive_info.name, "success")
-                    self.refresh_drive_cache()
+                    self.schedule_cache_refresh()
                 else:
                     self.show_error_dialog("Mount Failed", f"Failed to mount {drive_info.name}")
                     self.logger.operation("mount", drive_info.name, "failed")
@@ -267,7 +370,7 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
                 if success:
                     self.show_notification("Drive Unmounted", f"{drive_info.name} unmounted successfully")
                     self.logger.operation("unmount", drive_info.name, "success")
-                    self.refresh_drive_cache()
+                    self.schedule_cache_refresh()
                 else:
                     self.show_error_dialog("Unmount Failed", f"Failed to unmount {drive_info.name}")
                     self.logger.operation("unmount", drive_info.name, "failed")
@@ -319,7 +422,7 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
                     if success:
                         self.show_notification("Drive Repaired", f"{drive_info.name} repaired successfully")
                         self.logger.operation("repair", drive_info.name, "success")
-                        self.refresh_drive_cache()
+                        self.schedule_cache_refresh()
                     else:
                         self.show_error_dialog("Repair Failed", f"Failed to repair {drive_info.name}")
                         self.logger.operation("repair", drive_info.name, "failed")
@@ -343,12 +446,12 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
                 
                 # Then eject
                 device_path = f"/dev/{drive_info.name}"
-                result = subprocess.run(["eject", device_path], capture_output=True, text=True)
+                result = run_command(["eject", device_path], timeout=None, share=False)
                 
                 if result.returncode == 0:
                     self.show_notification("Drive Ejected", f"{drive_info.name} ejected safely")
                     self.logger.operation("eject", drive_info.name, "success")
-                    self.refresh_drive_cache()
+                    self.schedule_cache_refresh()
                 else:
                     self.show_error_dialog("Eject Failed", f"Failed to eject {drive_info.name}")
                     self.logger.operation("eject", drive_info.name, "failed")
@@ -400,8 +503,13 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
                 # Load NTFS properties if applicable
                 if drive_info.fstype == 'ntfs':
                     device_path = f"/dev/{drive_info.name}"
-                    ntfs_props = NTFSProperties(device_path)
-                    ntfs_details = ntfs_props.get_all_properties()
+                    generation = self.drive_manager.get_generation(drive_info.name)
+                    ntfs_details = self.properties_cache.get(device_path, generation)
+                    if ntfs_details is None:
+                        ntfs_props = NTFSProperties(device_path)
+                        ntfs_details = ntfs_props.get_sections(("volume", "security", "health"))
+                        self.properties_cache.put(device_path, ntfs_details, generation)
+                        self.properties_cache.schedule_save()
                     ntfs_content = self.format_ntfs_properties(ntfs_details)
                     
                     GLib.idle_add(lambda: ntfs_text.get_buffer().set_text(ntfs_content))
@@ -489,7 +597,7 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
                     if success:
                         self.show_notification("Drive Formatted", f"{drive_info.name} formatted successfully")
                         self.logger.operation("format", drive_info.name, "success", {"filesystem": fstype, "label": label})
-                        self.refresh_drive_cache()
+                        self.schedule_cache_refresh()
                     else:
                         self.show_error_dialog("Format Failed", f"Failed to format {drive_info.name}")
                         self.logger.operation("format", drive_info.name, "failed", {"filesystem": fstype, "label": label})
@@ -505,7 +613,7 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
         """Format basic drive properties"""
         lines = [
             f"Drive: {drive_info.name}",
-            f"Size: {drive_info.size}",
+            f"Size: {format_size(drive_info.size)}",
             f"Filesystem: {drive_info.fstype}",
             f"Mount Point: {drive_info.mountpoint or 'Not mounted'}",
             f"Label: {drive_info.label or 'No label'}",
@@ -583,13 +691,13 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
     def show_notification(self, title: str, message: str):
         """Show desktop notification"""
         try:
-            subprocess.run([
+            run_command([
                 'notify-send',
                 f'NTFS Manager: {title}',
                 message,
                 '--icon=drive-harddisk',
                 '--expire-time=5000'
-            ], check=True)
+            ], check=True, share=False)
         except (subprocess.CalledProcessError, FileNotFoundError):
             # Fallback to console if notify-send not available
             print(f"NTFS Manager: {title} - {message}")
@@ -632,25 +740,106 @@ class NTFSManagerExtension(GObject.GObject, Nautilus.MenuProvider, Nautilus.Colu
         if not NAUTILUS_AVAILABLE or not BACKEND_AVAILABLE:
             return Nautilus.OperationResult.COMPLETE
         
+        drive_info = self.get_managed_drive_for_file(file_info)
+        if drive_info is not None:
+            self.apply_file_info(file_info, drive_info)
+        
+        return Nautilus.OperationResult.COMPLETE
+    
+    def update_file_info_full(self, provider, handle, closure, file_info):
+        """
+        Update file information, asynchronously only when the cache can't answer yet
+        
+        The file's st_dev is checked against the drive cache first, which
+        settles files on managed drives and on any other filesystem the
+        cache knows about with one lstat. Only a device the cache has never
+        seen, while a refresh that may add it is running, is resolved on a
+        worker once the refresh has finished; Nautilus is then told through
+        info_provider_update_complete_invoke, unless cancel_update came first.
+        """
+        if not NAUTILUS_AVAILABLE or not BACKEND_AVAILABLE:
+            return Nautilus.OperationResult.COMPLETE
+        
+        if file_info.get_uri_scheme() != 'file':
+            return Nautilus.OperationResult.COMPLETE
+        file_path = file_info.get_location().get_path()
+        if not file_path:
+            return Nautilus.OperationResult.COMPLETE
+        
         try:
-            drive_info = self.get_drive_for_file(file_info)
-            if drive_info:
-                # Add custom attributes
-                file_info.add_string_attribute('health_status', drive_info.health_status)
-                file_info.add_string_attribute('filesystem', drive_info.fstype)
-                
-                # Add emblem based on status
-                if drive_info.health_status == "Dirty":
-                    file_info.add_emblem('important')
-                elif drive_info.health_status == "Error":
-                    file_info.add_emblem('error')
-                elif drive_info.mountpoint:
-                    file_info.add_emblem('mounted')
+            st_dev = os.lstat(file_path).st_dev
+        except OSError:
+            return Nautilus.OperationResult.COMPLETE
+        
+        mount_index = self.mount_index
+        drive_info = mount_index.devices.get(st_dev)
+        if drive_info is not None:
+            self.apply_file_info(file_info, drive_info)
+            return Nautilus.OperationResult.COMPLETE
+        
+        self.refresh_if_stale()
+        if st_dev in mount_index.known_devices or not self.refresh_in_progress():
+            return Nautilus.OperationResult.COMPLETE
         
+        cancelled = threading.Event()
+        with self._info_updates_lock:
+            self._info_updates[handle] = cancelled
+        self._info_executor.submit(self._resolve_file_info, provider, handle, closure,
+                                   file_info, file_path, cancelled)
+        return Nautilus.OperationResult.IN_PROGRESS
+    
+    def cancel_update(self, provider, handle):
+        """Nautilus no longer wants the result of an update_file_info_full call"""
+        with self._info_updates_lock:
+            cancelled = self._info_updates.pop(handle, None)
+        if cancelled is not None:
+            cancelled.set()
+    
+    def _resolve_file_info(self, provider, handle, closure, file_info, file_path: str,
+                           cancelled: threading.Event):
+        """Worker: look the file up in the refreshed cache, then finish on the main loop"""
+        drive_info = None
+        try:
+            self.wait_for_cache_refresh(FILE_INFO_WAIT)
+            if not cancelled.is_set():
+                drive_info = self.get_managed_drive_for_path(file_path)
         except Exception as e:
-            self.logger.error(f"Error updating file info: {e}")
+            self.logger.error(f"Error resolving file info for {file_path}: {e}")
+        GLib.idle_add(self._complete_file_info, provider, handle, closure,
+                      file_info, drive_info, cancelled)
+    
+    def _complete_file_info(self, provider, handle, closure, file_info,
+                            drive_info: Optional[DriveInfo], cancelled: threading.Event):
+        """Main loop: apply the result and report completion"""
+        with self._info_updates_lock:
+            if self._info_updates.get(handle) is cancelled:
+                del self._info_updates[handle]
+        
+        if not cancelled.is_set():
+            if drive_info is not None:
+                self.apply_file_info(file_info, drive_info)
+            Nautilus.info_provider_update_complete_invoke(
+                closure, provider, handle, Nautilus.OperationResult.COMPLETE
+            )
+        return False
+    
+    def apply_file_info(self, file_info, drive_info: DriveInfo):
+        """Set the extension's columns and emblem on a file of a managed drive"""
+        try:
+            # Add custom attributes
+            file_info.add_string_attribute('health_status', drive_info.health_status)
+            file_info.add_string_attribute('filesystem', drive_info.fstype)
+            
+            # Add emblem based on status
+            if drive_info.health_status == "Dirty":
+                file_info.add_emblem('important')
+            elif drive_info.health_status == "Error":
+                file_info.add_emblem('error')
+            elif drive_info.mountpoint:
+                file_info.add_emblem('mounted')
         
-        return Nautilus.OperationResult.COMPLETE
+        except Exception as e:
+            self.logger.error(f"Error updating file info: {e}")
 
 # Extension entry point
 if NAUTILUS_AVAILABLE and BACKEND_AVAILABLE: